@@ -47,6 +47,7 @@ from .export.seut_ot_export_materials           import SEUT_OT_ExportMaterials
 from .export.seut_ot_copy_export_options        import SEUT_OT_CopyExportOptions
 from .importing.seut_ot_import                  import SEUT_OT_Import
 from .importing.seut_ot_import_complete         import SEUT_OT_ImportComplete
+from .importing.seut_ot_import_mwm              import SEUT_OT_ImportMWM
 from .importing.seut_ot_fix_positioning         import SEUT_OT_FixPositioning
 from .importing.seut_ot_structure_conversion    import SEUT_OT_StructureConversion
 from .importing.seut_ot_import_materials        import SEUT_OT_Import_Materials
@@ -57,6 +58,7 @@ from .materials.seut_ot_remap_materials         import SEUT_OT_RemapMaterials
 from .materials.seut_ot_create_material         import SEUT_OT_MatCreate
 from .materials.seut_ot_texture_conversion      import SEUT_OT_ConvertTextures
 from .materials.seut_ot_texture_conversion      import SEUT_OT_MassConvertTextures
+from .materials.seut_ot_texture_atlas           import SEUT_OT_BuildTextureAtlas
 from .particles.seut_particle_settings          import SEUT_ParticlePropertyKeys
 from .particles.seut_particle_settings          import SEUT_ParticlePropertyValue2D
 from .particles.seut_particle_settings          import SEUT_ParticleProperty
@@ -94,17 +96,22 @@ from .seut_pt_toolbar                   import SEUT_PT_Panel_BoundingBox
 from .seut_pt_toolbar                   import SEUT_PT_Panel_Mirroring
 from .seut_pt_toolbar                   import SEUT_PT_Panel_Mountpoints
 from .seut_pt_toolbar                   import SEUT_PT_Panel_IconRender
+from .seut_pt_toolbar                   import SEUT_PT_Panel_Statistics
 from .seut_pt_toolbar                   import SEUT_PT_Panel_Export
 from .seut_pt_toolbar                   import SEUT_PT_Panel_Import
 from .seut_asset                        import SEUT_Asset
 from .seut_asset                        import SEUT_PT_Panel_Asset
-from .seut_bbox                         import SEUT_OT_BBox
-from .seut_mountpoints                  import SEUT_OT_AddMountpointArea
+from .seut_bbox                         import SEUT_OT_BBoxAutoFit
+from .seut_overlays                     import register_overlays, unregister_overlays
+from .seut_mountpoints                  import SEUT_OT_AddMountpointArea, SEUT_OT_GenerateMountpointAreas
+from .seut_collision                    import SEUT_OT_GenerateConvexCollision, SEUT_OT_FitCollisionPrimitives
+from .seut_lods                         import SEUT_OT_GenerateLODs, SEUT_OT_AdviseLODDistances, SEUT_OT_CullHiddenFaces
+from .seut_statistics                   import SEUT_OT_ExportStatistics, SEUT_OT_AnalyzeTextureBudget, SEUT_OT_AuditModAssets, statistics_handler, statistics_cache
 from .seut_collections                  import SEUT_Collection
 from .seut_collections                  import SEUT_OT_RecreateCollections
 from .seut_collections                  import SEUT_OT_CreateCollection
 from .seut_ot_simple_navigation         import SEUT_OT_SimpleNavigation
-from .seut_icon_render                  import SEUT_OT_IconRenderPreview
+from .seut_icon_render                  import SEUT_OT_IconRenderPreview, SEUT_OT_IconRenderBatch
 from .seut_icon_render                  import SEUT_OT_CopyRenderOptions
 from .seut_scene                        import SEUT_MountpointAreas
 from .seut_scene                        import SEUT_Scene
@@ -125,6 +132,7 @@ classes = (
     SEUT_PT_Panel_Mirroring,
     SEUT_PT_Panel_Mountpoints,
     SEUT_PT_Panel_IconRender,
+    SEUT_PT_Panel_Statistics,
     SEUT_PT_Panel_Export,
     SEUT_PT_Panel_Import,
     SEUT_PT_Panel_Particle,
@@ -160,14 +168,25 @@ classes = (
     SEUT_OT_ExportMaterials,
     SEUT_OT_Import,
     SEUT_OT_ImportComplete,
+    SEUT_OT_ImportMWM,
     SEUT_OT_StructureConversion,
     SEUT_OT_Import_Materials,
     SEUT_OT_FixPositioning,
     SEUT_OT_RemapMaterials,
     SEUT_OT_ConvertBonesToBlenderFormat,
     SEUT_OT_ConvertBonesToSEFormat,
-    SEUT_OT_BBox,
+    SEUT_OT_BBoxAutoFit,
     SEUT_OT_AddMountpointArea,
+    SEUT_OT_GenerateMountpointAreas,
+    SEUT_OT_GenerateConvexCollision,
+    SEUT_OT_FitCollisionPrimitives,
+    SEUT_OT_GenerateLODs,
+    SEUT_OT_AdviseLODDistances,
+    SEUT_OT_CullHiddenFaces,
+    SEUT_OT_BuildTextureAtlas,
+    SEUT_OT_ExportStatistics,
+    SEUT_OT_AnalyzeTextureBudget,
+    SEUT_OT_AuditModAssets,
     SEUT_OT_RecreateCollections,
     SEUT_OT_CreateCollection,
     SEUT_OT_SimpleNavigation,
@@ -176,6 +195,7 @@ classes = (
     SEUT_OT_MassConvertTextures,
     SEUT_Materials,
     SEUT_OT_IconRenderPreview,
+    SEUT_OT_IconRenderBatch,
     SEUT_OT_CopyRenderOptions,
     SEUT_ParticlePropertyKeys,
     SEUT_ParticlePropertyValue2D,
@@ -213,6 +233,9 @@ def register():
     bpy.types.WindowManager.seut = PointerProperty(type=SEUT_WindowManager)
 
     bpy.app.handlers.load_post.append(load_handler)
+    bpy.app.handlers.depsgraph_update_post.append(statistics_handler)
+
+    register_overlays()
 
     from .seut_bau import bau_register
     bpy.app.timers.register(bau_register)
@@ -238,6 +261,9 @@ def unregister():
     del bpy.types.WindowManager.seut
 
     bpy.app.handlers.load_post.remove(load_handler)
+    bpy.app.handlers.depsgraph_update_post.remove(statistics_handler)
+
+    unregister_overlays()
 
     unload_icons()
 
@@ -258,6 +284,8 @@ def menu_draw(self, context):
 
 @persistent
 def load_handler(dummy):
+
+    statistics_cache.clear()
     
     try:
         init_relocate_matlibs()
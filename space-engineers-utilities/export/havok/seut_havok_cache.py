@@ -0,0 +1,91 @@
+import os
+import hashlib
+import numpy as np
+
+from .seut_havok_hkt            import get_rigid_body_settings
+from ..seut_export_staging      import get_staging_root, link_or_copy
+from ...utils.seut_mesh_utils   import get_matrix_array
+from ...seut_errors             import get_abs_path
+
+
+# Bump this whenever a change to the export would produce a different HKT from the same collision.
+cache_version = 1
+
+
+def get_hkt_cache_dir() -> str:
+    """Returns the folder HKTs are cached in. It lives next to the staging directories, but persists between exports"""
+
+    path = os.path.join(get_staging_root(), 'SEUT_HKT_Cache')
+    os.makedirs(path, exist_ok=True)
+
+    return path
+
+
+def get_object_hash(obj) -> bytes:
+    """Hashes everything about a collision object that ends up in its HKT"""
+
+    h = hashlib.sha1()
+    h.update(obj.type.encode())
+    h.update(get_matrix_array(obj.matrix_world).tobytes())
+
+    if obj.type == 'MESH':
+        mesh = obj.data
+
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+        h.update(co.tobytes())
+
+        loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('loop_total', loop_totals)
+        h.update(loop_totals.tobytes())
+
+        vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', vertex_indices)
+        h.update(vertex_indices.tobytes())
+
+        h.update(str(sorted(get_rigid_body_settings(obj).items())).encode())
+
+    return h.digest()
+
+
+def get_collision_hash(scene, objects, havok_options: str, havok_path: str) -> str:
+    """Returns a key that only changes if the HKT built from the given objects would. The order of the objects does not matter"""
+
+    h = hashlib.sha1()
+    h.update(str(cache_version).encode())
+    h.update(scene.seut.sceneType.encode())
+    h.update(str(scene.seut.export_rescaleFactor).encode())
+    h.update(havok_options.encode())
+
+    # A different version of the Havok tools may create different HKTs.
+    havok_path = get_abs_path(havok_path)
+    if os.path.isfile(havok_path):
+        h.update(f"{havok_path}{os.path.getmtime(havok_path)}".encode())
+
+    for digest in sorted(get_object_hash(obj) for obj in objects):
+        h.update(digest)
+
+    return h.hexdigest()
+
+
+def restore_cached_hkt(collision_hash: str, hkt_file: str) -> bool:
+    """Places the cached HKT for a hash at the given path. Returns False if there is none"""
+
+    cached_file = os.path.join(get_hkt_cache_dir(), f"{collision_hash}.hkt")
+    if not os.path.isfile(cached_file):
+        return False
+
+    link_or_copy(cached_file, hkt_file)
+    return True
+
+
+def cache_hkt(collision_hash: str, hkt_file: str):
+    """Adds a freshly built HKT to the cache"""
+
+    if not os.path.isfile(hkt_file) or os.path.getsize(hkt_file) == 0:
+        return
+
+    cached_file = os.path.join(get_hkt_cache_dir(), f"{collision_hash}.hkt")
+    temp_file = f"{cached_file}.{os.getpid()}"
+    link_or_copy(hkt_file, temp_file)
+    os.replace(temp_file, cached_file)
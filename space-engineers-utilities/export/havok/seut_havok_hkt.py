@@ -3,15 +3,49 @@ import os
 import tempfile
 
 from ..seut_export_utils        import ExportSettings
+from ..seut_custom_fbx_exporter import havok_properties
 from ...utils.called_tool_type  import ToolType
 from ...utils.seut_xml_utils    import update_subelement, format_entry
 from ...seut_errors             import seut_report
 
 
+# These match the defaults of a rigid body added through Blender's UI.
+default_rigid_body = {
+    'collision_shape': 'CONVEX_HULL',
+    'mass': 1.0,
+    'friction': 0.5,
+    'restitution': 0.0
+}
+
+
+def get_rigid_body_settings(obj) -> dict:
+    """Returns the Havok-relevant rigid body settings of an object, or the defaults if it has no rigid body."""
+
+    if obj.rigid_body is None:
+        settings = dict(default_rigid_body)
+    else:
+        settings = {attr: getattr(obj.rigid_body, attr) for attr in default_rigid_body}
+
+    if obj.seut.collision_shape != 'DEFAULT':
+        settings['collision_shape'] = obj.seut.collision_shape
+
+    return settings
+
+
+def prepare_collision(objects):
+    """Prepares the Havok properties of collision objects for the FBX export, without adding rigid bodies to them."""
+
+    havok_properties.clear()
+
+    for obj in objects:
+        if obj.type == 'MESH':
+            havok_properties[obj.name] = get_rigid_body_settings(obj)
+
+
 def convert_fbx_to_fbxi_hkt(context, settings: ExportSettings, source: str, target: str):
     """Converts the FBX created by export to FBXImporter FBX for HKT creation."""
 
-    settings.callTool(
+    return settings.callTool(
         context,
         [settings.fbximporter, source, target],
         ToolType(1),
@@ -23,8 +57,9 @@ def convert_fbxi_hkt_to_hkt(self, context, settings: ExportSettings, source: str
     """Converts the HKT created by FBXImporter to the final HKT."""
     
     havok_options = get_hko_content(adjustments)
+    result = False
 
-    hko = tempfile.NamedTemporaryFile(mode='wt', prefix='space_engineers_', suffix=".hko", delete=False) # wt mode is write plus text mode.	
+    hko = tempfile.NamedTemporaryFile(mode='wt', prefix='space_engineers_', suffix=".hko", dir=os.path.dirname(target), delete=False) # wt mode is write plus text mode.	
     try:
         with hko.file as tempfile_to_process:
             tempfile_to_process.write(havok_options)
@@ -46,6 +81,8 @@ def convert_fbxi_hkt_to_hkt(self, context, settings: ExportSettings, source: str
         if context.scene.seut.export_deleteLooseFiles:
             os.remove(hko.name)
 
+    return result
+
 
 def get_hko_content(adjustments: dict = None) -> str:
     """Returns the content of the default HKO file."""
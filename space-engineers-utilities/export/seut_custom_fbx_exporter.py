@@ -4,6 +4,8 @@ import threading
 
 from collections            import OrderedDict
 
+from .seut_mesh_optimization import get_optimized_mesh
+
 # STOLLIE: This clones the specification from Blenders source code for its FBX Exporter so we can add some custom properties.
 def _clone_fbx_module():
     import sys
@@ -64,6 +66,9 @@ HAVOK_SHAPE_NAMES = {
     'CONE': 'Hull', # not supported by Havok
 }
 
+# Havok properties of the collision objects currently being exported, per object name. Filled by prepare_collision().
+havok_properties = {}
+
 # HARAG: No easy way to extend, so copied from export_fbx_bin.py and modified.
 def fbx_data_object_elements(root, ob_obj, scene_data):
     
@@ -162,13 +167,17 @@ def fbx_data_object_elements(root, ob_obj, scene_data):
             # HARAG: TODO SE supports mutliple highlight shapes via <objectSPECIFICATION1>;<objectSPECIFICATION2>;...
             _fbx.elem_props_template_set(tmpl, props, "p_string", b"highlight", str(se_custom_property_highlight))
 
-    if obj_type == b"Mesh" and ob_obj.bdata.rigid_body:
-        rbo = ob_obj.bdata.rigid_body
-        shapeType = HAVOK_SHAPE_NAMES[rbo.collision_shape] or rbo.collision_shape
+    if obj_type == b"Mesh" and (ob_obj.bdata.name in havok_properties or ob_obj.bdata.rigid_body):
+        rbo = havok_properties.get(ob_obj.bdata.name)
+        if rbo is None:
+            rbo = ob_obj.bdata.rigid_body
+            rbo = {'collision_shape': rbo.collision_shape, 'mass': rbo.mass, 'friction': rbo.friction, 'restitution': rbo.restitution}
+
+        shapeType = HAVOK_SHAPE_NAMES.get(rbo['collision_shape'], rbo['collision_shape'])
         _fbx.elem_props_template_set(tmpl, props, "p_string", b"hkTypeRigidBody", "hkRigidBody")
-        _fbx.elem_props_template_set(tmpl, props, "p_double", b"mass", rbo.mass)
-        _fbx.elem_props_template_set(tmpl, props, "p_double", b"friction", rbo.friction)
-        _fbx.elem_props_template_set(tmpl, props, "p_double", b"restitution", rbo.restitution)
+        _fbx.elem_props_template_set(tmpl, props, "p_double", b"mass", rbo['mass'])
+        _fbx.elem_props_template_set(tmpl, props, "p_double", b"friction", rbo['friction'])
+        _fbx.elem_props_template_set(tmpl, props, "p_double", b"restitution", rbo['restitution'])
         _fbx.elem_props_template_set(tmpl, props, "p_string", b"hkTypeShape", "hkShape")
         _fbx.elem_props_template_set(tmpl, props, "p_string", b"shapeType", shapeType)
 
@@ -179,6 +188,43 @@ def fbx_data_object_elements(root, ob_obj, scene_data):
 # STOLLIE: Assign the blender defined and custom properties above to the copied function from the loaded specification by calling the above function.
 _fbx.fbx_data_object_elements = fbx_data_object_elements
 
+# Whether meshes are reordered for the vertex cache while writing, and the resulting ACMR per mesh. Set by export_fbx().
+mesh_optimization = {
+    'enabled': False,
+    'results': {}
+}
+
+_original_fbx_data_mesh_elements = _fbx.fbx_data_mesh_elements
+
+# Writes an optimized copy of the mesh instead of the mesh itself, so the scene data stays untouched.
+def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
+
+    me_key, me, free = scene_data.data_meshes[me_obj]
+    bdata = me_obj.bdata
+    skinned = bdata.parent is not None and bdata.parent.type == 'ARMATURE' or any(mod.type == 'ARMATURE' for mod in bdata.modifiers)
+
+    if not mesh_optimization['enabled'] or me_key in done_meshes or skinned:
+        return _original_fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes)
+
+    optimized, before, after = get_optimized_mesh(me)
+    if optimized is None:
+        return _original_fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes)
+
+    mesh_optimization['results'][me_obj.name] = (before, after)
+    material_indices = scene_data.mesh_material_indices.get(me)
+
+    scene_data.data_meshes[me_obj] = (me_key, optimized, free)
+    if material_indices is not None:
+        scene_data.mesh_material_indices[optimized] = material_indices
+    try:
+        _original_fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes)
+    finally:
+        scene_data.data_meshes[me_obj] = (me_key, me, free)
+        scene_data.mesh_material_indices.pop(optimized, None)
+        bpy.data.meshes.remove(optimized)
+
+_fbx.fbx_data_mesh_elements = fbx_data_mesh_elements
+
 # HARAG: Export these two functions as our own so that clients of this module don't have to depend on 
 # HARAG: the cloned fbx_experimental.export_fbx_bin module
 save_single = _fbx.save_single
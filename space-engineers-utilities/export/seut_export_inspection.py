@@ -0,0 +1,104 @@
+import bpy
+import os
+import time
+import numpy as np
+
+from .seut_export_utils             import get_col_filename, model_materials
+from .seut_export_mwm               import get_dummy_name, get_lod_references
+from ..utils.seut_mwm_inspector     import inspect_mwm
+from ..seut_bbox                    import get_grid_size
+from ..seut_collections             import get_collections
+from ..seut_errors                  import seut_report, check_collection, get_abs_path
+
+
+def get_export_half_extents(scene):
+    """Returns the half extents of the bounding box in SE space for the grid size currently being exported, None if there is none"""
+
+    if scene.seut.sceneType != 'mainScene' or 0 in (scene.seut.bBox_X, scene.seut.bBox_Y, scene.seut.bBox_Z):
+        return None
+
+    # During export, gridScale is set to the grid size being exported. The bounding box is still defined in blocks of the original one,
+    # which only differs if the geometry is being rescaled.
+    grid_scale = scene.seut.gridScale
+    if scene.seut.export_rescaleFactor != 1.0:
+        grid_scale = 'small' if grid_scale == 'large' else 'large'
+
+    size = get_grid_size(grid_scale) * scene.seut.export_rescaleFactor / 2
+
+    # SE's Y axis is Blender's Z axis and vice versa.
+    return (scene.seut.bBox_X * size, scene.seut.bBox_Z * size, scene.seut.bBox_Y * size)
+
+
+def get_export_manifest(context, collection, path: str) -> dict:
+    """Returns what the MWM of a collection is expected to contain, based on the data it was exported from"""
+
+    scene = context.scene
+    depsgraph = context.evaluated_depsgraph_get()
+
+    used_materials = set()
+    triangles = 0
+    dummies = []
+
+    for obj in collection.objects:
+        if obj.type == 'MESH':
+            obj_eval = obj.evaluated_get(depsgraph)
+            mesh = obj_eval.to_mesh()
+            mesh.calc_loop_triangles()
+            triangles += len(mesh.loop_triangles)
+
+            indices = np.empty(len(mesh.polygons), dtype=np.int32)
+            mesh.polygons.foreach_get('material_index', indices)
+            for idx in np.unique(indices).tolist():
+                if idx < len(obj.material_slots) and obj.material_slots[idx].material is not None:
+                    used_materials.add(obj.material_slots[idx].material.name)
+
+            obj_eval.to_mesh_clear()
+
+        elif obj.type == 'EMPTY':
+            dummies.append(get_dummy_name(obj))
+
+    # The MWM contains the materials of the XML its faces use. Without an XML from this export, all materials of its faces are expected.
+    xml_materials = model_materials.get((path, get_col_filename(collection)))
+    materials = used_materials if xml_materials is None else used_materials & xml_materials
+
+    return {
+        'lods': get_lod_references(scene, collection, path),
+        'materials': materials,
+        'triangles': triangles,
+        'dummies': dummies,
+        'half_extents': get_export_half_extents(scene)
+    }
+
+
+def inspect_export(self, context):
+    """Reads back the MWMs of the current export and reports everything that does not match what was exported into them"""
+
+    scene = context.scene
+    collections = get_collections(scene)
+    path = get_abs_path(scene.seut.export_exportPath)
+    start = time.time()
+
+    cols = []
+    for col_type in ['main', 'bs', 'lod']:
+        if col_type in collections and collections[col_type] is not None:
+            cols += [col for col in collections[col_type] if check_collection(self, context, scene, col, True) == {'CONTINUE'}]
+
+    issue_count = 0
+    for col in cols:
+        filename = f"{get_col_filename(col)}.mwm"
+        mwm_file = os.path.join(path, filename)
+
+        if not os.path.isfile(mwm_file):
+            issues = ["File was not created."]
+        else:
+            issues = inspect_mwm(mwm_file, get_export_manifest(context, col, path))
+
+        for issue in issues:
+            seut_report(self, context, 'WARNING', False, 'W018', filename, issue)
+        issue_count += len(issues)
+
+    seut_report(self, context, 'INFO', False, 'I028', len(cols), round(time.time() - start, 3), issue_count)
+    if issue_count > 0:
+        seut_report(self, context, 'WARNING', True, 'W024', issue_count, len(cols))
+
+    return {'FINISHED'} if issue_count == 0 else {'CANCELLED'}
@@ -0,0 +1,107 @@
+import bpy
+import bmesh
+import numpy as np
+
+from ..utils.seut_mesh_utils    import get_matrix_array
+
+
+def get_used_materials(obj, mesh) -> set:
+    """Returns the materials an object's faces actually use. Every one of them is a separate draw call ingame"""
+
+    indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', indices)
+
+    return set(get_slot_material(obj, idx) for idx in np.unique(indices).tolist())
+
+
+def get_slot_material(obj, idx: int):
+    if idx < len(obj.material_slots):
+        return obj.material_slots[idx].material
+    return None
+
+
+def get_mergeable_objects(collection) -> list:
+    """Returns the mesh objects of a collection that can be merged without affecting empties, highlights or deformation"""
+
+    highlights = set()
+    for empty in collection.objects:
+        if empty.type == 'EMPTY':
+            for entry in empty.seut.highlight_objects:
+                if entry.obj is not None:
+                    highlights.add(entry.obj)
+
+    objects = []
+    for obj in collection.objects:
+        if obj.type != 'MESH' or obj in highlights or len(obj.children) > 0:
+            continue
+        if obj.find_armature() is not None or obj.matrix_world.is_negative:
+            continue
+        objects.append(obj)
+
+    return objects
+
+
+def create_merged_object(collection, objects: list, depsgraph):
+    """Merges the evaluated meshes of objects into a single temporary object linked to the collection, with one material slot per material.
+    Returns the object and the number of draw calls of the sources and of the merged object"""
+
+    bm = bmesh.new()
+    materials = []
+    normals = []
+    draw_calls = 0
+
+    for obj in objects:
+        mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+        draw_calls += len(get_used_materials(obj, mesh))
+
+        # Every source keeps its own shading, so its normals are carried over as custom normals.
+        mesh.calc_normals_split()
+        loop_normals = np.empty(len(mesh.loops) * 3, dtype=np.float64)
+        mesh.loops.foreach_get('normal', loop_normals)
+        matrix = get_matrix_array(obj.matrix_world)
+        loop_normals = loop_normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])
+        normals.append(loop_normals / np.maximum(np.linalg.norm(loop_normals, axis=1), 1e-12)[:, None])
+
+        mesh.transform(obj.matrix_world)
+
+        # Layers are merged by name.
+        for idx, layer in enumerate(mesh.uv_layers):
+            layer.name = f"UVMap{idx}"
+
+        remap = []
+        for idx in range(max(1, len(obj.material_slots))):
+            material = get_slot_material(obj, idx)
+            if material not in materials:
+                materials.append(material)
+            remap.append(materials.index(material))
+
+        first = len(bm.faces)
+        bm.from_mesh(mesh)
+        bm.faces.ensure_lookup_table()
+        for face in bm.faces[first:]:
+            face.material_index = remap[face.material_index] if face.material_index < len(remap) else remap[0]
+
+        bpy.data.meshes.remove(mesh)
+
+    merged_mesh = bpy.data.meshes.new(f"{collection.name} Merged")
+    bm.to_mesh(merged_mesh)
+    bm.free()
+
+    for material in materials:
+        merged_mesh.materials.append(material)
+
+    merged_mesh.use_auto_smooth = True
+    merged_mesh.normals_split_custom_set(np.concatenate(normals).tolist())
+
+    merged = bpy.data.objects.new(f"{collection.name} Merged", merged_mesh)
+    collection.objects.link(merged)
+
+    return merged, draw_calls, len(get_used_materials(merged, merged_mesh))
+
+
+def remove_merged_object(merged):
+    """Removes a temporary merged object and its mesh"""
+
+    mesh = merged.data
+    bpy.data.objects.remove(merged, do_unlink=True)
+    bpy.data.meshes.remove(mesh)
@@ -0,0 +1,348 @@
+import bpy
+import bmesh
+import os
+import re
+import numpy as np
+
+from mathutils                      import Matrix
+from bpy_extras.io_utils            import axis_conversion
+
+from .seut_export_utils             import get_col_filename, get_subpart_reference, correct_for_export_type, export_materials_of_model, get_texture_path
+from ..utils.seut_mesh_utils        import get_matrix_array
+from ..utils.seut_mwm_format        import write_mwm
+from ..seut_collections             import get_collections, get_rev_ref_cols
+from .seut_export_staging           import get_staging_path
+from ..seut_errors                  import seut_report, get_abs_path
+from ..seut_utils                   import create_relative_path
+
+
+# Meshes extracted for the native writer, kept for the duration of an export so each grid size only needs to rescale them.
+mesh_cache = {}
+
+texture_types = {
+    'CM': 'ColorMetalTexture',
+    'NG': 'NormalGlossTexture',
+    'ADD': 'AddMapsTexture',
+    'ALPHAMASK': 'AlphamaskTexture'
+}
+
+
+def use_native_backend(scene) -> bool:
+    """Returns whether a scene is exported with the native MWM writer. Characters always go through MwmBuilder, as the writer does not support armatures"""
+
+    return scene.seut.export_backend == 'native' and scene.seut.sceneType in ['mainScene', 'subpart']
+
+
+def get_axis_matrix(scene) -> Matrix:
+    """Returns the rotation converting Blender's axes into SE's, matching the axes export_to_fbxfile() passes to the FBX exporter"""
+
+    axis_forward = 'Z'
+    if scene.seut.sceneType == 'subpart':
+        axis_forward = '-Z'
+
+    return axis_conversion(to_forward=axis_forward, to_up='Y').to_4x4()
+
+
+def get_export_matrix(scene) -> Matrix:
+    """Returns the matrix converting Blender space into SE space, including the rescale factor of the grid size being exported"""
+
+    return Matrix.Scale(scene.seut.export_rescaleFactor, 4) @ get_axis_matrix(scene)
+
+
+def get_loop_data(obj, depsgraph, matrix):
+    """Returns the per-loop vertex data and the triangles of the evaluated mesh of an object, transformed into SE space"""
+
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+
+    # Tangents can only be calculated for triangles and quads, so n-gons of the temporary mesh are triangulated first.
+    if any(poly.loop_total > 4 for poly in mesh.polygons):
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        bmesh.ops.triangulate(bm, faces=[face for face in bm.faces if len(face.verts) > 4])
+        bm.to_mesh(mesh)
+        bm.free()
+
+    mesh.calc_loop_triangles()
+
+    loop_count = len(mesh.loops)
+    uv_layer = mesh.uv_layers.active
+
+    if uv_layer is not None:
+        mesh.calc_tangents(uvmap=uv_layer.name)
+    else:
+        mesh.calc_normals_split()
+
+    vertex_indices = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', vertex_indices)
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+
+    normals = np.empty(loop_count * 3, dtype=np.float32)
+    mesh.loops.foreach_get('normal', normals)
+    tangents = np.zeros(loop_count * 3, dtype=np.float32)
+    binormals = np.zeros(loop_count * 3, dtype=np.float32)
+    uvs = np.zeros(loop_count * 2, dtype=np.float32)
+
+    if uv_layer is not None:
+        mesh.loops.foreach_get('tangent', tangents)
+        mesh.loops.foreach_get('bitangent', binormals)
+        uv_layer.data.foreach_get('uv', uvs)
+
+    tri_loops = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('loops', tri_loops)
+    tri_materials = np.empty(len(mesh.loop_triangles), dtype=np.int32)
+    mesh.loop_triangles.foreach_get('material_index', tri_materials)
+
+    obj_eval.to_mesh_clear()
+
+    m = get_matrix_array(matrix @ obj.matrix_world)
+    rotation = m[:3, :3]
+    normal_matrix = np.linalg.inv(rotation).T
+
+    positions = co.reshape(-1, 3)[vertex_indices] @ rotation.T + m[:3, 3]
+    normals = normalize(normals.reshape(-1, 3) @ normal_matrix.T)
+    tangents = normalize(tangents.reshape(-1, 3) @ rotation.T)
+    binormals = normalize(binormals.reshape(-1, 3) @ rotation.T)
+
+    tri_loops = tri_loops.reshape(-1, 3)
+
+    # Negative scaling mirrors the geometry, which turns the triangles inside out unless their winding order is reversed.
+    if np.linalg.det(rotation) < 0:
+        tri_loops = tri_loops[:, ::-1]
+
+    attributes = np.hstack((positions, normals, tangents, binormals, uvs.reshape(-1, 2))).astype(np.float32)
+
+    return attributes, tri_loops, tri_materials
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    length = np.linalg.norm(vectors, axis=1)
+    length[length == 0] = 1.0
+
+    return vectors / length[:, None]
+
+
+def get_material_part(self, context, material, suffix) -> dict:
+    """Returns the material descriptor of a mesh part, with the same texture entries export_xml() writes into the XML.
+    Materials referenced by MaterialRef have no suffix and use the textures of their nodes as they are"""
+
+    part = {
+        'material': material.name,
+        'technique': material.seut.technique,
+        'textures': {}
+    }
+
+    if material.node_tree is None or material.seut.technique in ['HOLO', 'GLASS']:
+        return part
+
+    for node in material.node_tree.nodes:
+        if node.type == 'TEX_IMAGE' and node.name in texture_types and node.image is not None:
+            if suffix is not None:
+                texture_path = get_texture_path(self, context, material.name, node.image, node.name, suffix)
+            else:
+                rel_path = create_relative_path(node.image.filepath, "Textures")
+                texture_path = os.path.splitext(rel_path)[0] + ".dds" if rel_path else None
+
+            if texture_path is not None:
+                part['textures'][texture_types[node.name]] = texture_path
+
+    return part
+
+
+def get_mesh_model(self, context, collection, matrix) -> dict:
+    """Merges the evaluated meshes of a collection into deduplicated vertex streams and one index buffer per material"""
+
+    depsgraph = context.evaluated_depsgraph_get()
+
+    all_attributes = []
+    all_triangles = []
+    all_materials = []
+    materials = {}
+    offset = 0
+
+    for obj in collection.objects:
+        if obj.type != 'MESH':
+            continue
+
+        attributes, tri_loops, tri_materials = get_loop_data(obj, depsgraph, matrix)
+
+        slot_materials = [slot.material for slot in obj.material_slots]
+        mapping = np.full(max(len(slot_materials), 1), -1, dtype=np.int32)
+        for idx, mat in enumerate(slot_materials):
+            if mat is None:
+                continue
+            if mat.name not in materials:
+                materials[mat.name] = (len(materials), mat)
+            mapping[idx] = materials[mat.name][0]
+
+        tri_materials = mapping[np.clip(tri_materials, 0, len(mapping) - 1)]
+        if np.any(tri_materials < 0):
+            seut_report(self, context, 'WARNING', True, 'W017', obj.name)
+
+        all_attributes.append(attributes)
+        all_triangles.append(tri_loops + offset)
+        all_materials.append(tri_materials)
+        offset += len(attributes)
+
+    if len(all_attributes) < 1:
+        attributes = np.empty((0, 14), dtype=np.float32)
+        triangles = np.empty((0, 3), dtype=np.int32)
+        tri_materials = np.empty(0, dtype=np.int32)
+    else:
+        attributes = np.concatenate(all_attributes)
+        triangles = np.concatenate(all_triangles)
+        tri_materials = np.concatenate(all_materials)
+
+    # Loops sharing all attributes become a single vertex.
+    vertices, inverse = np.unique(attributes, axis=0, return_inverse=True)
+    triangles = inverse.reshape(-1)[triangles].astype(np.int32)
+
+    parts = []
+    for idx, mat in sorted(materials.values(), key=lambda m: m[0]):
+        indices = triangles[tri_materials == idx].reshape(-1)
+        if len(indices) > 0:
+            parts.append({'material': mat.name, 'indices': indices})
+
+    return {
+        'positions': vertices[:, 0:3],
+        'normals': vertices[:, 3:6],
+        'tangents': vertices[:, 6:9],
+        'binormals': vertices[:, 9:12],
+        'uvs': vertices[:, 12:14],
+        'parts': parts
+    }
+
+
+def clear_mesh_cache():
+    mesh_cache.clear()
+
+
+def get_scaled_mesh_model(self, context, collection) -> dict:
+    """Returns the mesh model of a collection for the grid size currently being exported. The geometry is only extracted once per export"""
+
+    scene = context.scene
+
+    if collection.name not in mesh_cache:
+        mesh_cache[collection.name] = get_mesh_model(self, context, collection, get_axis_matrix(scene))
+
+    model = dict(mesh_cache[collection.name])
+    model['positions'] = model['positions'] * scene.seut.export_rescaleFactor
+
+    return model
+
+
+def get_dummy_name(empty) -> str:
+    """Returns the name of an empty without the numbering export_fbx() removes before export"""
+
+    if re.search("\.[0-9]{3}", empty.name[-4:]) != None and not empty.seut.linked:
+        return empty.name[:-4]
+
+    return empty.name
+
+
+def get_dummies(self, context, collection, matrix) -> list:
+    """Returns the dummies of a collection with the same names and custom data export_fbx() writes into the FBX"""
+
+    scene = context.scene
+    collections = get_collections(scene)
+    matrix_inv = matrix.to_3x3().normalized().to_4x4().inverted()
+
+    dummies = []
+    for empty in collection.objects:
+        if empty.type != 'EMPTY':
+            continue
+
+        data = {}
+        for key in empty.keys():
+            if key.startswith('_') or key == 'seut':
+                continue
+            if isinstance(empty[key], (str, int, float)):
+                data[key] = empty[key]
+
+        world = empty.matrix_world.copy()
+        if 'highlight' in empty:
+            data['highlight'] = ";".join(entry.obj.name for entry in empty.seut.highlight_objects if entry.obj is not None)
+            # The FBX path doubles highlight empties to work around the FBX exporter, so the same is done here to produce identical dummies.
+            world = world @ Matrix.Scale(2.0, 4)
+
+        elif 'file' in empty and empty.seut.linkedScene is not None:
+            data['file'] = correct_for_export_type(scene, get_subpart_reference(empty, collections))
+
+        se_matrix = matrix @ world @ matrix_inv
+
+        dummies.append({
+            'name': get_dummy_name(empty),
+            'matrix': [value for row in se_matrix.transposed() for value in row],
+            'data': data
+        })
+
+    return dummies
+
+
+def get_lod_references(scene, collection, path: str) -> list:
+    """Returns the LODs of a collection with the same distances and model paths export_xml() writes into the XML"""
+
+    collections = get_collections(scene)
+
+    lods = []
+    if collection.seut.col_type in ['main', 'bs'] and 'lod' in collections and collections['lod'] is not None:
+        for col in get_rev_ref_cols(collections, collection, 'lod'):
+            if len(col.objects) > 0:
+                lods.append({
+                    'distance': float(col.seut.lod_distance),
+                    'model': create_relative_path(os.path.join(path, get_col_filename(col)), "Models")
+                })
+
+    return lods
+
+
+def get_havok_data(scene, collection, path: str) -> bytes:
+    """Returns the content of the HKT belonging to a collection. Build Stages without their own HKT reuse the one of the main collection"""
+
+    if collection.seut.col_type not in ['main', 'bs']:
+        return b''
+
+    for filename in [get_col_filename(collection), scene.seut.subtypeId]:
+        hkt_file = os.path.join(path, f"{filename}.hkt")
+        if os.path.isfile(hkt_file):
+            with open(hkt_file, 'rb') as f:
+                return f.read()
+
+    return b''
+
+
+def export_native_mwm(self, context, collection) -> dict:
+    """Writes the MWM of a collection directly, without going through FBX and MwmBuilder"""
+
+    scene = context.scene
+    path = get_abs_path(scene.seut.export_exportPath)
+    matrix = get_export_matrix(scene)
+
+    print("\n------------------------------ Writing MWM of Collection '" + collection.name + "'.")
+
+    model = get_scaled_mesh_model(self, context, collection)
+
+    # Textures are converted and referenced the same way as for MwmBuilder, including the reduced resolution variants of LOD-only materials.
+    materials = export_materials_of_model(self, context, collection)
+    parts = []
+    for part in model['parts']:
+        material = bpy.data.materials[part['material']]
+        parts.append(dict(get_material_part(self, context, material, materials.get(material)), indices=part['indices']))
+    model['parts'] = parts
+    model['dummies'] = get_dummies(self, context, collection, matrix)
+    model['havok'] = get_havok_data(scene, collection, get_staging_path(scene))
+    model['rescale_factor'] = 1.0
+
+    model['lods'] = get_lod_references(scene, collection, path)
+
+    mwm_file = os.path.join(get_staging_path(scene), f"{get_col_filename(collection)}.mwm")
+    try:
+        write_mwm(mwm_file, model)
+    except EnvironmentError as error:
+        seut_report(self, context, 'ERROR', True, 'E049', mwm_file, error)
+        return {'CANCELLED'}
+
+    print("------------------------------ Finished writing MWM of Collection '" + collection.name + "'.\n")
+
+    return {'FINISHED'}
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+
+from ..seut_errors  import seut_report, get_abs_path
+from ..seut_utils   import get_preferences
+
+
+# Staging directories of the running export, per export path of a grid size.
+staging_dirs = {}
+
+
+def get_staging_root() -> str:
+    """Returns the folder staging directories are created in. Pointing this to a RAM disk (tmpfs) keeps intermediate files off the disk"""
+
+    preferences = get_preferences()
+    staging_path = get_abs_path(preferences.staging_path) if preferences.staging_path != "" else ""
+
+    if staging_path != "" and os.path.isdir(staging_path):
+        return staging_path
+
+    return tempfile.gettempdir()
+
+
+def begin_staging(scene) -> str:
+    """Creates the staging directory for the export path the scene is currently set to"""
+
+    path = get_abs_path(scene.seut.export_exportPath)
+
+    if path not in staging_dirs:
+        staging_dirs[path] = tempfile.mkdtemp(prefix=f"SEUT_{scene.seut.subtypeId}_", dir=get_staging_root())
+
+    return staging_dirs[path]
+
+
+def get_staging_path(scene) -> str:
+    """Returns the folder intermediate files of the current export are written to. Outside of an export this is the export path itself"""
+
+    path = get_abs_path(scene.seut.export_exportPath)
+
+    return staging_dirs.get(path, path)
+
+
+def is_staging(scene) -> bool:
+    return get_abs_path(scene.seut.export_exportPath) in staging_dirs
+
+
+def link_or_copy(source: str, target: str):
+    """Hardlinks a file, falling back to copying it where the filesystem does not support hardlinks"""
+
+    if os.path.exists(target):
+        os.remove(target)
+
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def publish_file(source: str, target_dir: str):
+    """Moves a file into a folder so it only ever appears there complete. Across filesystems it is copied next to its target first"""
+
+    target = os.path.join(target_dir, os.path.basename(source))
+
+    try:
+        os.replace(source, target)
+    except OSError:
+        temp_target = target + ".seut-tmp"
+        shutil.copyfile(source, temp_target)
+        os.replace(temp_target, target)
+        os.remove(source)
+
+
+def end_staging(self, context, publish: bool = True):
+    """Moves the MWMs of all staging directories into their export paths and removes the intermediate files, unless they are to be kept"""
+
+    scene = context.scene
+
+    for path, staging_dir in staging_dirs.items():
+        if publish:
+            os.makedirs(path, exist_ok=True)
+            try:
+                for f in os.listdir(staging_dir):
+                    if os.path.splitext(f)[1] == '.mwm':
+                        publish_file(os.path.join(staging_dir, f), path)
+            except EnvironmentError as error:
+                seut_report(self, context, 'ERROR', False, 'E052', path, error)
+
+        if scene.seut.export_deleteLooseFiles:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        else:
+            seut_report(self, context, 'INFO', False, 'I030', scene.name, staging_dir)
+
+    if scene.seut.export_deleteLooseFiles and len(staging_dirs) > 0:
+        seut_report(self, context, 'INFO', True, 'I007', scene.name)
+
+    staging_dirs.clear()
@@ -7,31 +7,35 @@ from ..seut_errors                              import *
 from ..seut_utils                               import check_vanilla_texture, create_relative_path
 
 
-def export_material_textures(self, context, material):
-    """Checks if source file is newer than converted file, if so, exports to DDS."""
+# Suffixes of the reduced resolution texture variants, by how much they are scaled down.
+texture_suffixes = {
+    1: "",
+    2: "_half",
+    4: "_quarter"
+}
+
+
+def export_material_textures(self, context, material, divisor: int = 1):
+    """Checks if source file is newer than converted file, if so, exports to DDS. A divisor above 1 exports a variant scaled down by it."""
 
     scene = context.scene
     nodes = material.node_tree.nodes
     textures = {}
+    sizes = {}
 
     if material.node_tree is None or material.node_tree.nodes is None:
         return {'CANCELLED'}
 
-    if 'CM' in nodes and nodes['CM'].image is not None and os.path.exists(get_abs_path(nodes['CM'].image.filepath)):
-        textures['cm'] = get_abs_path(nodes['CM'].image.filepath)
-
-    if 'ADD' in nodes and nodes['ADD'].image is not None and os.path.exists(get_abs_path(nodes['ADD'].image.filepath)):
-        textures['add'] = get_abs_path(nodes['ADD'].image.filepath)
-
-    if 'NG' in nodes and nodes['NG'].image is not None and os.path.exists(get_abs_path(nodes['NG'].image.filepath)):
-        textures['ng'] = get_abs_path(nodes['NG'].image.filepath)
-        
-    if 'ALPHAMASK' in nodes and nodes['ALPHAMASK'].image is not None and os.path.exists(get_abs_path(nodes['ALPHAMASK'].image.filepath)):
-        textures['alphamask'] = get_abs_path(nodes['ALPHAMASK'].image.filepath)
+    for node_name, preset in [('CM', 'cm'), ('ADD', 'add'), ('NG', 'ng'), ('ALPHAMASK', 'alphamask')]:
+        if node_name in nodes and nodes[node_name].image is not None and os.path.exists(get_abs_path(nodes[node_name].image.filepath)):
+            textures[preset] = get_abs_path(nodes[node_name].image.filepath)
+            sizes[preset] = nodes[node_name].image.size
 
     if len(textures) <= 0:
         return {'CANCELLED'}
 
+    suffix = get_texture_suffix(divisor)
+
     for preset, source in textures.items():
 
         # Skip if texture is a vanilla texture and thus does not need to be converted.
@@ -40,30 +44,66 @@ def export_material_textures(self, context, material):
 
         if create_relative_path(source, 'Textures'):
             target = os.path.join(get_abs_path(scene.seut.mod_path), create_relative_path(source, 'Textures'))
-            target_file = os.path.splitext(target)[0] + '.dds'
+            target_file = os.path.splitext(target)[0] + suffix + '.dds'
             target_dir = os.path.dirname(target)
 
+            settings = []
+            if divisor > 1:
+                if sizes[preset][0] == 0 or sizes[preset][1] == 0:
+                    continue
+                width = max(4, sizes[preset][0] // divisor)
+                height = max(4, sizes[preset][1] // divisor)
+                settings = ['-w', str(width), '-h', str(height), '-sx', suffix]
+
             if not os.path.exists(target_file):
                 os.makedirs(target_dir, exist_ok=True)
-                output = convert_texture(source, target_dir, preset)
+                output = convert_texture(source, target_dir, preset, settings)
                 try:
                     os.rename(target_file, os.path.splitext(target_file)[0] + '.dds')
                 except:
                     pass
 
             elif os.path.getmtime(source) > os.path.getmtime(target_file):
-                output = convert_texture(source, target_dir, preset)
+                output = convert_texture(source, target_dir, preset, settings)
                 try:
                     os.rename(target_file, os.path.splitext(target_file)[0] + '.dds')
                 except:
                     pass
             
             else:
-                return {'FINISHED'}
+                continue
 
             if output[0] == 0:
-                seut_report(self, context, 'INFO', False, 'I002', preset, material.name)
+                seut_report(self, context, 'INFO', False, 'I002', preset + suffix, material.name)
             else:
-                seut_report(self, context, 'ERROR', False, 'E046', preset, material.name, output[1])
+                seut_report(self, context, 'ERROR', False, 'E046', preset + suffix, material.name, output[1])
+
+    return {'FINISHED'}
+
+
+def get_texture_suffix(divisor: int) -> str:
+    return texture_suffixes.get(divisor, "")
+
+
+def get_lod_texture_divisor(scene, collections: dict, material) -> int:
+    """Returns by how much the textures of a material are scaled down in LODs. This depends on the first LOD using it, materials also used by Main or Build Stages keep their full resolution."""
+
+    if not scene.seut.export_lod_textures:
+        return 1
+
+    first_lod = None
+    for col_type in ['main', 'bs', 'lod']:
+        if col_type not in collections or collections[col_type] is None:
+            continue
+
+        for col in collections[col_type]:
+            if not any(slot.material == material for obj in col.objects if obj.type == 'MESH' for slot in obj.material_slots):
+                continue
+            if col_type != 'lod':
+                return 1
+            first_lod = col.seut.type_index if first_lod is None else min(first_lod, col.seut.type_index)
+
+    if first_lod is None or first_lod < scene.seut.export_lod_textures_start:
+        return 1
 
-    return {'FINISHED'}
\ No newline at end of file
+    return 2 ** min(2, first_lod - scene.seut.export_lod_textures_start + 1)
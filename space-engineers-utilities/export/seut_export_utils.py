@@ -14,10 +14,13 @@ from bpy_extras.io_utils                    import axis_conversion, ExportHelper
 from ..utils.seut_tool_utils                import get_tool_dir
 from ..seut_collections                     import get_collections, get_rev_ref_cols
 from ..seut_utils                           import *
-from ..seut_errors                          import seut_report, get_abs_path
-from .seut_custom_fbx_exporter              import save_single
+from ..seut_errors                          import seut_report, get_abs_path, report_issues
+from .seut_custom_fbx_exporter              import save_single, mesh_optimization
 from .seut_export_transparent_mat           import export_transparent_mat
-from .seut_export_texture                   import export_material_textures
+from .seut_export_texture                   import export_material_textures, get_lod_texture_divisor, get_texture_suffix
+from .seut_export_staging                   import get_staging_path
+from .seut_export_merge                     import get_mergeable_objects, create_merged_object, remove_merged_object
+from .seut_export_validation                import get_empty_issues
 
 
 def export_xml(self, context, collection) -> str:
@@ -45,6 +48,42 @@ def export_xml(self, context, collection) -> str:
     path = get_abs_path(scene.seut.export_exportPath)
 
     # Write local materials as material entries into XML, write library materials as matrefs into XML
+    for mat, suffix in export_materials_of_model(self, context, collection).items():
+        if suffix is not None:
+            create_mat_entry(self, context, model, mat, suffix)
+        else:
+            matRef = ET.SubElement(model, 'MaterialRef')
+            matRef.set('Name', mat.name)
+
+    # Write LOD references into the XML, if applicable
+    if collection.seut.col_type in ['main', 'bs'] and 'lod' in collections:
+        if not collections['lod'] is None:
+            cols = get_rev_ref_cols(collections, collection, 'lod')
+            for col in cols:
+                if len(col.objects) > 0:
+                    create_lod_entry(model, col.seut.lod_distance, path, get_col_filename(col))
+        
+    # Create file with subtypename + collection name and write string to it
+    xml_formatted = format_xml(self, context, model)
+
+    path = os.path.join(get_staging_path(scene), f"{get_col_filename(collection)}.xml")
+    exported_xml = open(path, "w")
+    exported_xml.write(xml_formatted)
+
+    return {'FINISHED'}
+
+
+# Names of the materials written into the model of every collection, per export path and filename, so the exported MWMs can be checked against them.
+model_materials = {}
+
+
+def export_materials_of_model(self, context, collection) -> dict:
+    """Exports the textures of all materials the model of a collection refers to. Returns the texture suffix of every material that gets its own entry, None for the ones referenced by MaterialRef"""
+
+    scene = context.scene
+    collections = get_collections(scene)
+
+    materials = {}
     for mat in bpy.data.materials:
 
         if mat == None:
@@ -81,31 +120,21 @@ def export_xml(self, context, collection) -> str:
                         break
             
         if is_unique:
-            create_mat_entry(self, context, model, mat)
+            # Materials only used by LODs refer to smaller variants of their textures.
+            divisor = get_lod_texture_divisor(scene, collections, mat) if collection.seut.col_type == 'lod' else 1
+            materials[mat] = get_texture_suffix(divisor)
             if mat.asset_data is None or (mat.asset_data is not None and not mat.asset_data.seut.is_vanilla):
                 export_material_textures(self, context, mat)
+                if divisor > 1:
+                    export_material_textures(self, context, mat, divisor)
             if mat.seut.technique in ['GLASS', 'HOLO', 'SHIELD'] and scene.seut.export_sbc_type in ['update', 'new']:
                 export_transparent_mat(self, context, mat.name)
         else:
-            matRef = ET.SubElement(model, 'MaterialRef')
-            matRef.set('Name', mat.name)
-
-    # Write LOD references into the XML, if applicable
-    if collection.seut.col_type in ['main', 'bs'] and 'lod' in collections:
-        if not collections['lod'] is None:
-            cols = get_rev_ref_cols(collections, collection, 'lod')
-            for col in cols:
-                if len(col.objects) > 0:
-                    create_lod_entry(model, col.seut.lod_distance, path, get_col_filename(col))
-        
-    # Create file with subtypename + collection name and write string to it
-    xml_formatted = format_xml(self, context, model)
+            materials[mat] = None
 
-    path = os.path.join(path, f"{get_col_filename(collection)}.xml")
-    exported_xml = open(path, "w")
-    exported_xml.write(xml_formatted)
+    model_materials[(get_abs_path(scene.seut.export_exportPath), get_col_filename(collection))] = set(mat.name for mat in materials)
 
-    return {'FINISHED'}
+    return materials
 
 
 def get_col_filename(collection: object) -> str:
@@ -137,19 +166,28 @@ def add_subelement(parent, name: str, value):
     param.text = str(value)
 
 
-def create_texture_entry(self, context, mat_entry, mat_name: str, images: dict, tex_type: str, tex_name: str, tex_name_long: str):
+def create_texture_entry(self, context, mat_entry, mat_name: str, images: dict, tex_type: str, tex_name: str, tex_name_long: str, suffix: str = ""):
     """Creates a texture entry for a texture type into the XML tree"""
     
-    rel_path = create_relative_path(images[tex_type].filepath, "Textures")
+    texture_path = get_texture_path(self, context, mat_name, images[tex_type], tex_name, suffix)
+    
+    if texture_path is not None:
+        add_subelement(mat_entry, tex_name_long, texture_path)
+
+
+def get_texture_path(self, context, mat_name: str, image, tex_name: str, suffix: str = "") -> str:
+    """Returns the path of the DDS of an image relative to the game's content, as the model refers to it. Returns None if the image is not within a Textures folder"""
+
+    rel_path = create_relative_path(image.filepath, "Textures")
     
     if not rel_path:
         seut_report(self, context, 'ERROR', False, 'E007', tex_name, mat_name)
-        return
-    else:
-        add_subelement(mat_entry, tex_name_long, os.path.splitext(rel_path)[0] + ".dds")
+        return None
     
-    if not is_valid_resolution(images[tex_type].size[0]) or not is_valid_resolution(images[tex_type].size[1]):
-        seut_report(self, context, 'WARNING', True, 'W004', tex_name, mat_name, f"{images[tex_type].size[0]}x{images[tex_type].size[1]}")
+    if not is_valid_resolution(image.size[0]) or not is_valid_resolution(image.size[1]):
+        seut_report(self, context, 'WARNING', True, 'W004', tex_name, mat_name, f"{image.size[0]}x{image.size[1]}")
+
+    return os.path.splitext(rel_path)[0] + suffix + ".dds"
 
 
 def is_valid_resolution(number: int) -> bool:
@@ -161,8 +199,8 @@ def is_valid_resolution(number: int) -> bool:
     return math.log(number, 2).is_integer()
 
 
-def create_mat_entry(self, context, tree, mat):
-    """Creates a material entry in the given tree for a given material"""
+def create_mat_entry(self, context, tree, mat, suffix: str = ""):
+    """Creates a material entry in the given tree for a given material. The suffix selects a reduced resolution variant of its textures"""
 
     mat_entry = ET.SubElement(tree, 'Material')
     mat_entry.set('Name', mat.name)
@@ -201,13 +239,13 @@ def create_mat_entry(self, context, tree, mat):
     else:
         if mat.seut.technique not in ['HOLO', 'GLASS']:
             if not images['cm'] == None:
-                create_texture_entry(self, context, mat_entry, mat.name, images, 'cm', 'CM', 'ColorMetalTexture')
+                create_texture_entry(self, context, mat_entry, mat.name, images, 'cm', 'CM', 'ColorMetalTexture', suffix)
             if not images['ng'] == None:
-                create_texture_entry(self, context, mat_entry, mat.name, images, 'ng', 'NG', 'NormalGlossTexture')
+                create_texture_entry(self, context, mat_entry, mat.name, images, 'ng', 'NG', 'NormalGlossTexture', suffix)
             if not images['add'] == None:
-                create_texture_entry(self, context, mat_entry, mat.name, images, 'add', 'ADD', 'AddMapsTexture')
+                create_texture_entry(self, context, mat_entry, mat.name, images, 'add', 'ADD', 'AddMapsTexture', suffix)
             if not images['am'] == None:
-                create_texture_entry(self, context, mat_entry, mat.name, images, 'am', 'ALPHAMASK', 'AlphamaskTexture')
+                create_texture_entry(self, context, mat_entry, mat.name, images, 'am', 'ALPHAMASK', 'AlphamaskTexture', suffix)
 
 
 def create_lod_entry(tree, distance: int, path: str, filename: str):
@@ -242,7 +280,7 @@ def export_fbx(self, context, collection) -> str:
     depsgraph = context.evaluated_depsgraph_get()
     settings = ExportSettings(scene, depsgraph)
 
-    path = get_abs_path(scene.seut.export_exportPath)
+    path = get_staging_path(scene)
     
     # Export exports the active layer_collection so the collection's layer_collection needs to be set as the active one
     try:
@@ -270,11 +308,8 @@ def export_fbx(self, context, collection) -> str:
                 else:
                     empty.name = empty.name[:-4]
 
-            # Check parenting
-            if empty.parent is None and not empty.seut.linked:
-                seut_report(self, context, 'WARNING', True, 'W005', empty.name, collection.name)
-            elif empty.parent.parent is not None:
-                seut_report(self, context, 'WARNING', True, 'W006', empty.name, empty.parent.name, collection.name)
+            # Check parenting and references
+            report_issues(self, context, get_empty_issues(scene, empty, collection))
 
             # Additional parenting checks
             rescale = False
@@ -286,9 +321,6 @@ def export_fbx(self, context, collection) -> str:
                     highlights = ""
                     for entry in empty.seut.highlight_objects:
                         if not empty is None and not entry.obj is None:
-                            if empty.parent is not None and entry.obj.parent is not None and empty.parent != entry.obj.parent:
-                                seut_report(self, context, 'WARNING', True, 'W007', empty.name, entry.obj.name)
-
                             if highlights == "":
                                 highlights = entry.obj.name
                             else:
@@ -297,10 +329,6 @@ def export_fbx(self, context, collection) -> str:
                     empty['highlight'] = highlights
             
             elif 'file' in empty and empty.seut.linkedScene is not None:
-                linked_scene = empty.seut.linkedScene
-                if linked_scene.seut.export_largeGrid != scene.seut.export_largeGrid or linked_scene.seut.export_smallGrid != scene.seut.export_smallGrid:
-                    seut_report(self, context, 'WARNING', True, 'W001', linked_scene.name, scene.name)
-
                 # Remove subpart instances
                 reference = get_subpart_reference(empty, collections)
                 reference = correct_for_export_type(scene, reference)
@@ -320,9 +348,22 @@ def export_fbx(self, context, collection) -> str:
             prepare_mat_for_export(self, context, mat)
 
     # Export the collection to FBX
+    # Objects sharing materials are merged into one temporary object, so every material is only drawn once.
+    objects = list(collection.objects)
+    merged = None
+    if scene.seut.export_merge_objects and collection.seut.col_type in ['lod', 'bs']:
+        sources = get_mergeable_objects(collection)
+        if len(sources) > 1:
+            merged, draw_calls_before, draw_calls_after = create_merged_object(collection, sources, depsgraph)
+            context.view_layer.update()
+            objects = [obj for obj in collection.objects if obj not in sources]
+            seut_report(self, context, 'INFO', False, 'I039', collection.name, draw_calls_before, draw_calls_after)
+
     path = os.path.join(path, f"{get_col_filename(collection)}.fbx")
+    mesh_optimization['enabled'] = scene.seut.export_optimize_meshes and scene.seut.sceneType in ['mainScene', 'subpart']
+    mesh_optimization['results'].clear()
     try:
-        export_to_fbxfile(settings, scene, path, collection.objects, ishavokfbxfile=False)
+        export_to_fbxfile(settings, scene, path, objects, ishavokfbxfile=False)
 
     except RuntimeError as error:
         seut_report(self, context, 'ERROR', False, 'E017')
@@ -330,6 +371,15 @@ def export_fbx(self, context, collection) -> str:
     except KeyError as error:
         seut_report(self, context, 'ERROR', True, 'E038', error)
 
+    finally:
+        mesh_optimization['enabled'] = False
+        if merged is not None:
+            remove_merged_object(merged)
+
+    for name, (before, after) in mesh_optimization['results'].items():
+        seut_report(self, context, 'INFO', False, 'I037', name, round(before, 3), round(after, 3))
+    mesh_optimization['results'].clear()
+
     # Revert materials back to original form
     for mat in bpy.data.materials:
         if mat is not None and mat.node_tree is not None:
@@ -551,6 +601,10 @@ def write_to_log(logfile, content, cmdline=None, cwd=None, loglines=[]):
         log.write(content)
 
 
+# File names of FBXs within tool output, without the folders they are in.
+fbx_file_name = re.compile(r'([^\\/\r\n"\'<>|:*?]+\.fbx)', re.IGNORECASE)
+
+
 class ExportSettings:
     def __init__(self, scene, depsgraph, mwmDir=None):
         self.scene = scene # ObjectSource.getObjects() uses .utils.scene() instead
@@ -590,37 +644,47 @@ class ExportSettings:
             if logtextInspector is not None:
                 logtextInspector(out)
 
-            out_str = out.decode("utf-8")
-            if out_str.find(": ERROR:") != -1:
-                if out_str.find("Assimp.AssimpException: Error loading unmanaged library from path: Assimp32.dll") != -1:
-                    seut_report(self, context, 'ERROR', False, 'E039')
-                    return False
-                    
-                elif out_str.find("System.ArgumentOutOfRangeException: Index was out of range. Must be non-negative and less than the size of the collection.") != -1:
-                    temp_string = out_str[out_str.find("\\Models\\") + len("\\Models\\"):]
-                    temp_string = temp_string[:temp_string.find(".fbx")]
-                    seut_report(self, context, 'ERROR', False, 'E043', temp_string + ".fbx")
-                    return False
-            
-                else:
-                    seut_report(self, context, 'ERROR', False, 'E044')
-                    return False
-
-            return True
+            return self.checkToolOutput(context, out, cwd)
 
         except subprocess.CalledProcessError as e:
             if self.isLogToolOutput and logfile:
                 write_to_log(logfile, e.output, cmdline=cmdline, cwd=cwd, loglines=loglines)
             if e.returncode not in successfulExitCodes:
-                if e.returncode == 4294967295:
-                    seut_report(self, context, 'ERROR', False, 'E037')
-                elif e.returncode == 3221225477:
-                    seut_report(self, context, 'ERROR', False, 'E047')
-                else:
-                    seut_report(self, context, 'ERROR', False, 'E035', str(tooltype))
+                self.reportToolError(context, e.returncode, tooltype)
                 raise
 
-            return False
+            return self.checkToolOutput(context, e.output, cwd)
+
+    def checkToolOutput(self, context, out, path: str = None) -> bool:
+        """Reports errors found in the output of a tool run on the files in path. Returns False if there were any"""
+
+        out_str = out.decode("utf-8", "ignore")
+        if out_str.find(": ERROR:") != -1:
+            if out_str.find("Assimp.AssimpException: Error loading unmanaged library from path: Assimp32.dll") != -1:
+                seut_report(self, context, 'ERROR', False, 'E039')
+                return False
+                
+            elif out_str.find("System.ArgumentOutOfRangeException: Index was out of range. Must be non-negative and less than the size of the collection.") != -1:
+                file_name = get_failed_file(out_str, out_str.find("System.ArgumentOutOfRangeException"), path)
+                if file_name is not None:
+                    seut_report(self, context, 'ERROR', False, 'E043', file_name)
+                else:
+                    seut_report(self, context, 'ERROR', False, 'E044')
+                return False
+        
+            else:
+                seut_report(self, context, 'ERROR', False, 'E044')
+                return False
+
+        return True
+
+    def reportToolError(self, context, returncode: int, tooltype):
+        if returncode == 4294967295:
+            seut_report(self, context, 'ERROR', False, 'E037')
+        elif returncode == 3221225477:
+            seut_report(self, context, 'ERROR', False, 'E047')
+        else:
+            seut_report(self, context, 'ERROR', False, 'E035', str(tooltype))
     
     def __getitem__(self, key): # makes all attributes available for parameter substitution
         if not type(key) is str or key.startswith('_'):
@@ -633,6 +697,24 @@ class ExportSettings:
         except AttributeError:
             raise KeyError(key)
 
+def get_failed_file(out_str: str, position: int, path: str = None):
+    """Returns the FBX file a tool was working on when an error occurred at position in its output, None if it can't be determined.
+    If path is given, only files actually within it count, as the tool may print paths of any folder it was run from"""
+
+    names = [match.group(1).strip() for match in fbx_file_name.finditer(out_str)]
+    before = [match.group(1).strip() for match in fbx_file_name.finditer(out_str[:position])]
+
+    # The tool logs every file before processing it, so the last one mentioned before the error is the culprit.
+    for name in reversed(before) if before != [] else names:
+        # Names may contain spaces, but so may the text preceding them on the same line.
+        options = [name, name.split()[-1]] if path is not None else [name.split()[-1]]
+        for option in options:
+            if path is None or os.path.isfile(os.path.join(path, option)):
+                return option
+
+    return None
+
+
 # HARAG: UP = 'Y'
 # HARAG: FWD = 'Z'
 # HARAG: MATRIX_NORMAL = axis_conversion(to_forward=FWD, to_up=UP).to_4x4()
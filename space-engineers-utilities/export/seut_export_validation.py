@@ -0,0 +1,200 @@
+import bpy
+import os
+import time
+
+from ..seut_collections             import get_collections, get_cols_by_type, get_first_free_index
+from ..seut_errors                  import seut_report, check_collection, get_abs_path, get_path_issues, get_uv_issues
+
+
+exported_scene_types = ['mainScene', 'subpart', 'character', 'character_animation']
+
+
+class ValidationResult:
+    """Collects the issues found during validation, so they can be reported all at once"""
+
+    def __init__(self):
+        self.issues = []
+
+    def add(self, report_type: str, code: str, variable_1=None, variable_2=None, variable_3=None):
+        self.issues.append((report_type, code, variable_1, variable_2, variable_3))
+
+    def extend(self, issues: list):
+        for issue in issues:
+            self.add(*issue)
+
+    @property
+    def errors(self) -> int:
+        return len([issue for issue in self.issues if issue[0] == 'ERROR'])
+
+    @property
+    def warnings(self) -> int:
+        return len([issue for issue in self.issues if issue[0] == 'WARNING'])
+
+
+def is_ascii(text: str) -> bool:
+    try:
+        text.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def validate_paths(result: ValidationResult, scene):
+    """Runs the checks of check_export() on a scene that does not need to be the active one"""
+
+    if scene.seut.mod_path == "" or not os.path.isdir(get_abs_path(scene.seut.mod_path)):
+        result.add('ERROR', 'E019', "Mod", scene.name)
+        if scene.seut.subtypeId == "":
+            result.add('ERROR', 'E004', scene.name)
+        return
+
+    result.extend(get_path_issues(scene))
+
+
+def get_empty_issues(scene, empty, collection) -> list:
+    """Returns the issues with the parenting and references of an empty, as checked by export_fbx()"""
+
+    issues = []
+
+    if empty.parent is None and not empty.seut.linked:
+        issues.append(('WARNING', 'W005', empty.name, collection.name))
+    elif empty.parent is not None and empty.parent.parent is not None:
+        issues.append(('WARNING', 'W006', empty.name, empty.parent.name, collection.name))
+
+    if 'highlight' in empty:
+        for entry in empty.seut.highlight_objects:
+            if entry.obj is not None and empty.parent is not None and entry.obj.parent is not None and empty.parent != entry.obj.parent:
+                issues.append(('WARNING', 'W007', empty.name, entry.obj.name))
+
+    elif 'file' in empty and empty.seut.linkedScene is not None:
+        linked_scene = empty.seut.linkedScene
+        if linked_scene.seut.export_largeGrid != scene.seut.export_largeGrid or linked_scene.seut.export_smallGrid != scene.seut.export_smallGrid:
+            issues.append(('WARNING', 'W001', linked_scene.name, scene.name))
+
+    return issues
+
+
+def get_col_dict_issues(cols: dict) -> list:
+    """Returns index gaps and LOD distances not increasing with the index among the collections of a type, as checked by check_export_col_dict()"""
+
+    if cols == {}:
+        return []
+
+    if get_first_free_index(cols) <= len(cols):
+        col = next(iter(cols.values()))
+        if col.seut.col_type == 'lod' and col.seut.ref_col is not None:
+            return [('ERROR', 'E006', f"BS{col.seut.ref_col.seut.type_index}_LOD")]
+        return [('ERROR', 'E006', col.seut.col_type)]
+
+    issues = []
+    for idx, col in cols.items():
+        if col.seut.col_type == 'lod' and idx - 1 in cols and cols[idx - 1].seut.lod_distance > col.seut.lod_distance:
+            issues.append(('ERROR', 'E011', col.name, cols[idx - 1].name))
+
+    return issues
+
+
+def get_main_issues(scene, collection) -> list:
+    """Returns the issues with the armatures and parenting of the Main collection, as checked by export_main()"""
+
+    issues = []
+    found_armatures = any(obj.type == 'ARMATURE' for obj in collection.objects)
+    is_character = scene.seut.sceneType in ['character', 'character_animation']
+
+    if not found_armatures and is_character:
+        issues.append(('WARNING', 'W008', scene.name, scene.seut.sceneType))
+    if found_armatures and not is_character:
+        issues.append(('WARNING', 'W009', scene.name, scene.seut.sceneType))
+
+    unparented_objects = len([obj for obj in collection.objects if obj.parent is None and obj.type != 'LIGHT' and obj.type != 'CAMERA'])
+    if unparented_objects > 1:
+        issues.append(('ERROR', 'E031', collection.name))
+
+    return issues
+
+
+def get_collision_issues(collection) -> list:
+    """Returns the issues preventing a collision collection from being exported, as checked by export_hkt()"""
+
+    issues = [('ERROR', 'E034', obj.name) for obj in collection.objects if len(obj.modifiers) > 0]
+
+    if len(collection.objects) > 10:
+        issues.append(('ERROR', 'E022', collection.name, len(collection.objects)))
+
+    return issues
+
+
+def validate_scene(self, context, scene) -> ValidationResult:
+    """Runs every export check on a scene in a single pass, without exporting anything"""
+
+    result = ValidationResult()
+    collections = get_collections(scene)
+
+    validate_paths(result, scene)
+
+    if collections is None or not collections.get('main') or check_collection(self, context, scene, collections['main'][0], True) != {'CONTINUE'}:
+        result.add('ERROR', 'E002', f"'Main' of scene '{scene.name}'")
+        return result
+
+    main = collections['main'][0]
+
+    result.extend(get_col_dict_issues(get_cols_by_type(scene, 'bs')))
+    result.extend(get_col_dict_issues(get_cols_by_type(scene, 'lod', main)))
+    for bs in collections.get('bs') or []:
+        result.extend(get_col_dict_issues(get_cols_by_type(scene, 'lod', bs)))
+
+    names = [scene.seut.subtypeId]
+
+    # Main, Build Stages and LODs
+    result.extend(get_main_issues(scene, main))
+    for col_type in ['main', 'bs', 'lod']:
+        for col in collections.get(col_type) or []:
+            if check_collection(self, context, scene, col, True) != {'CONTINUE'}:
+                continue
+
+            for obj in col.objects:
+                names.append(obj.name)
+
+                if obj.type == 'MESH':
+                    result.extend(get_uv_issues(obj))
+                    names += [slot.material.name for slot in obj.material_slots if slot.material is not None]
+                elif obj.type == 'EMPTY':
+                    result.extend(get_empty_issues(scene, obj, col))
+
+    # Collision
+    for col in collections.get('hkt') or []:
+        if check_collection(self, context, scene, col, True) != {'CONTINUE'}:
+            continue
+        result.extend(get_collision_issues(col))
+
+    if not all(is_ascii(name) for name in names):
+        result.add('ERROR', 'E033')
+
+    return result
+
+
+def validate_scenes(self, context, scenes: list) -> bool:
+    """Validates all given scenes and reports every issue found at once. Returns False if any errors were found"""
+
+    start = time.time()
+
+    if not bpy.data.is_saved:
+        seut_report(self, context, 'ERROR', True, 'E008')
+        return False
+
+    errors = 0
+    warnings = 0
+    for scn in scenes:
+        result = validate_scene(self, context, scn)
+        errors += result.errors
+        warnings += result.warnings
+
+        for report_type, code, variable_1, variable_2, variable_3 in result.issues:
+            seut_report(self, context, report_type, False, code, variable_1, variable_2, variable_3)
+
+    seut_report(self, context, 'INFO', False, 'I029', len(scenes), round(time.time() - start, 3), f"{errors} errors, {warnings} warnings")
+
+    if errors > 0:
+        seut_report(self, context, 'ERROR', True, 'E051', errors)
+
+    return errors == 0
@@ -0,0 +1,195 @@
+import bpy
+import bmesh
+import numpy as np
+
+from collections import deque
+
+
+# Size of the simulated post-transform vertex cache. Small enough to hold on any GPU the game runs on.
+cache_size = 16
+
+
+def get_acmr(tris: np.ndarray, size: int = cache_size) -> float:
+    """Returns the average cache miss ratio (vertices transformed per triangle) of a triangle order with a FIFO vertex cache"""
+
+    if len(tris) == 0:
+        return 0.0
+
+    cache = deque()
+    cached = set()
+    misses = 0
+
+    for v in tris.ravel().tolist():
+        if v not in cached:
+            misses += 1
+            if len(cache) >= size:
+                cached.discard(cache.popleft())
+            cache.append(v)
+            cached.add(v)
+
+    return misses / len(tris)
+
+
+def tipsify(tris: np.ndarray, vertex_count: int, size: int = cache_size) -> list:
+    """Orders triangles for vertex cache reuse (Sander et al., Tipsify). Returns the clusters of triangle indices, split where the cache is flushed"""
+
+    flat = tris.ravel()
+    valence = np.bincount(flat, minlength=vertex_count)
+    offsets = np.concatenate(([0], np.cumsum(valence))).tolist()
+    adjacency = (np.argsort(flat, kind='stable') // 3).tolist()
+
+    tri_list = tris.tolist()
+    live = valence.tolist()
+    cache_time = [0] * vertex_count
+    emitted = [False] * len(tri_list)
+    dead_end = []
+
+    clusters = [[]]
+    time_stamp = size + 1
+    cursor = 0
+    fan = int(flat[0]) if len(flat) > 0 else -1
+
+    while fan >= 0:
+        candidates = []
+        for t in adjacency[offsets[fan]:offsets[fan + 1]]:
+            if emitted[t]:
+                continue
+            for v in tri_list[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if time_stamp - cache_time[v] > size:
+                    cache_time[v] = time_stamp
+                    time_stamp += 1
+            emitted[t] = True
+            clusters[-1].append(t)
+
+        # Prefer the vertex that is still in the cache and has the fewest triangles left.
+        fan, best = -1, -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = 0
+                if time_stamp - cache_time[v] + 2 * live[v] <= size:
+                    priority = time_stamp - cache_time[v]
+                if priority > best:
+                    fan, best = v, priority
+
+        if fan >= 0:
+            continue
+
+        # Dead end: Continue from a recently used vertex, else start a new cluster.
+        while dead_end:
+            v = dead_end.pop()
+            if live[v] > 0:
+                fan = v
+                break
+
+        if fan < 0:
+            while cursor < vertex_count and live[cursor] <= 0:
+                cursor += 1
+            if cursor < vertex_count:
+                fan = cursor
+                clusters.append([])
+
+    return [np.array(cluster, dtype=np.int64) for cluster in clusters if cluster]
+
+
+def sort_clusters_for_overdraw(clusters: list, tris: np.ndarray, co: np.ndarray) -> list:
+    """Sorts triangle clusters so the ones facing outwards are drawn first and occlude the rest"""
+
+    if len(clusters) < 2:
+        return clusters
+
+    a, b, c = co[tris[:, 0]], co[tris[:, 1]], co[tris[:, 2]]
+    normals = np.cross(b - a, c - a)
+    centers = (a + b + c) / 3
+    mesh_center = centers.mean(axis=0)
+
+    keys = []
+    for cluster in clusters:
+        normal = normals[cluster].sum(axis=0)
+        length = np.linalg.norm(normal)
+        center = centers[cluster].mean(axis=0)
+        keys.append(np.dot(normal / length, center - mesh_center) if length > 0 else 0.0)
+
+    return [clusters[idx] for idx in np.argsort(keys, kind='stable')[::-1]]
+
+
+def get_optimized_order(co: np.ndarray, tris: np.ndarray, tri_polys: np.ndarray, poly_materials: np.ndarray):
+    """Returns the new polygon and vertex order of a mesh, plus the ACMR before and after. Triangles are ordered per material, as every material becomes its own index buffer"""
+
+    vertex_count = len(co)
+    tri_materials = poly_materials[tri_polys]
+
+    poly_order = []
+    misses_before = misses_after = 0.0
+    for material in np.unique(tri_materials):
+        selection = np.flatnonzero(tri_materials == material)
+        group = tris[selection]
+
+        clusters = tipsify(group, vertex_count)
+        clusters = sort_clusters_for_overdraw(clusters, group, co)
+        ordered = selection[np.concatenate(clusters)]
+
+        # Polygons are kept intact, so each one is placed where its first triangle ended up.
+        polys, first = np.unique(tri_polys[ordered], return_index=True)
+        polys = polys[np.argsort(first)]
+        poly_order.append(polys)
+
+        rank = np.empty(len(poly_materials), dtype=np.int64)
+        rank[polys] = np.arange(len(polys))
+        final = selection[np.argsort(rank[tri_polys[selection]], kind='stable')]
+
+        misses_before += get_acmr(group) * len(group)
+        misses_after += get_acmr(tris[final]) * len(group)
+
+    poly_order = np.concatenate(poly_order) if poly_order else np.arange(len(poly_materials))
+    unused = np.setdiff1d(np.arange(len(poly_materials)), poly_order)
+    poly_order = np.concatenate((poly_order, unused))
+
+    # Vertices are numbered in the order they are first used.
+    poly_rank = np.empty(len(poly_order), dtype=np.int64)
+    poly_rank[poly_order] = np.arange(len(poly_order))
+    flat = tris[np.argsort(poly_rank[tri_polys], kind='stable')].ravel()
+    verts, first = np.unique(flat, return_index=True)
+    vertex_order = np.concatenate((verts[np.argsort(first)], np.setdiff1d(np.arange(vertex_count), verts)))
+
+    return poly_order, vertex_order, misses_before / max(1, len(tris)), misses_after / max(1, len(tris))
+
+
+def get_optimized_mesh(mesh):
+    """Returns a copy of a mesh with faces and vertices reordered for the vertex cache, plus the ACMR before and after. Returns None for the copy if it would not improve"""
+
+    if len(mesh.polygons) == 0 or mesh.shape_keys is not None:
+        return None, 0.0, 0.0
+
+    mesh.calc_loop_triangles()
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get('co', co)
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int64)
+    mesh.loop_triangles.foreach_get('vertices', tris)
+    tri_polys = np.empty(len(mesh.loop_triangles), dtype=np.int64)
+    mesh.loop_triangles.foreach_get('polygon_index', tri_polys)
+    poly_materials = np.empty(len(mesh.polygons), dtype=np.int64)
+    mesh.polygons.foreach_get('material_index', poly_materials)
+
+    poly_order, vertex_order, before, after = get_optimized_order(co.reshape(-1, 3), tris.reshape(-1, 3), tri_polys, poly_materials)
+    if after >= before:
+        return None, before, after
+
+    poly_rank = np.empty(len(poly_order), dtype=np.int64)
+    poly_rank[poly_order] = np.arange(len(poly_order))
+    vertex_rank = np.empty(len(vertex_order), dtype=np.int64)
+    vertex_rank[vertex_order] = np.arange(len(vertex_order))
+    poly_rank, vertex_rank = poly_rank.tolist(), vertex_rank.tolist()
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.faces.sort(key=lambda f: poly_rank[f.index])
+    bm.verts.sort(key=lambda v: vertex_rank[v.index])
+
+    result = mesh.copy()
+    bm.to_mesh(result)
+    bm.free()
+
+    return result, before, after
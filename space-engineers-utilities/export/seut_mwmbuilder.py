@@ -1,7 +1,11 @@
 import os
 import glob
+import subprocess
 
-from .seut_export_utils         import ExportSettings
+from concurrent.futures         import ThreadPoolExecutor
+
+from .seut_export_utils         import ExportSettings, write_to_log
+from .seut_export_staging       import is_staging
 from ..utils.called_tool_type   import ToolType
 from ..seut_errors              import seut_report
 
@@ -13,8 +17,8 @@ def mwmbuilder(self, context, path, mwm_path, settings: ExportSettings, mwmfile:
     result = False
 
     try:
-        cmdline = [settings.mwmbuilder, '/f', '/s:' + path + '', '/m:' + scene.seut.subtypeId + '*.fbx', '/o:' + mwm_path + '', '/x:' + materials_path + '']
-        
+        cmdline = get_mwmbuilder_cmdline(settings, path, mwm_path, scene.seut.subtypeId, materials_path)
+
         result = settings.callTool(
             context,
             cmdline,
@@ -24,15 +28,70 @@ def mwmbuilder(self, context, path, mwm_path, settings: ExportSettings, mwmfile:
         )
 
     finally:
-        if scene.seut.export_deleteLooseFiles:
-            file_list = [f for f in os.listdir(path) if (f"{scene.seut.subtypeId}_BS" in f or f"{scene.seut.subtypeId}_LOD" in f or f"{scene.seut.subtypeId}." in f) and (".fbx" in f or ".xml" in f or ".hkt" in f or ".log" in f)]
-
-            try:
-                for f in file_list:
-                    os.remove(os.path.join(path, f))
-            
-                if result:
-                    seut_report(self, context, 'INFO', True, 'I007', scene.name)
-
-            except EnvironmentError:
-                seut_report(self, context, 'ERROR', False, 'E020')
\ No newline at end of file
+        if scene.seut.export_deleteLooseFiles and not is_staging(scene):
+            delete_loose_files(self, context, path, result)
+
+
+def get_mwmbuilder_cmdline(settings: ExportSettings, path: str, mwm_path: str, subtype_id: str, materials_path: str) -> list:
+    return [settings.mwmbuilder, '/f', '/s:' + path + '', '/m:' + subtype_id + '*.fbx', '/o:' + mwm_path + '', '/x:' + materials_path + '']
+
+
+def get_mwmbuilder_job(context, path: str, settings: ExportSettings, materials_path: str) -> dict:
+    """Captures everything needed to run MWMB for the grid size currently being exported, so it can be run later alongside others"""
+
+    scene = context.scene
+
+    return {
+        'cmdline': get_mwmbuilder_cmdline(settings, path, path, scene.seut.subtypeId, materials_path),
+        'path': path,
+        'subtype_id': scene.seut.subtypeId,
+        'logfile': os.path.join(path, scene.seut.subtypeId + '.mwm.log'),
+        'delete_loose_files': scene.seut.export_deleteLooseFiles and not is_staging(scene)
+    }
+
+
+def run_mwmbuilder_job(job: dict):
+    try:
+        out = subprocess.check_output(job['cmdline'], cwd=job['path'], stderr=subprocess.STDOUT, shell=True)
+        return 0, out
+    except subprocess.CalledProcessError as e:
+        return e.returncode, e.output
+
+
+def run_mwmbuilder_jobs(self, context, settings: ExportSettings, jobs: list):
+    """Runs several MWMB jobs at the same time. Their output is evaluated on the main thread once all of them are done"""
+
+    with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as executor:
+        outputs = list(executor.map(run_mwmbuilder_job, jobs))
+
+    for job, (returncode, out) in zip(jobs, outputs):
+        write_to_log(job['logfile'], out, cmdline=job['cmdline'], cwd=job['path'])
+
+        if returncode != 0:
+            settings.reportToolError(context, returncode, ToolType(3))
+            result = False
+        else:
+            result = settings.checkToolOutput(context, out, job['path'])
+
+        if job['delete_loose_files']:
+            delete_loose_files(self, context, job['path'], result, job['subtype_id'])
+
+
+def delete_loose_files(self, context, path, result: bool, subtype_id: str = None):
+    """Deletes the temporary files the export of the current scene has left in the export folder"""
+
+    scene = context.scene
+    if subtype_id is None:
+        subtype_id = scene.seut.subtypeId
+
+    file_list = [f for f in os.listdir(path) if (f"{subtype_id}_BS" in f or f"{subtype_id}_LOD" in f or f"{subtype_id}." in f) and (".fbx" in f or ".xml" in f or ".hkt" in f or ".log" in f)]
+
+    try:
+        for f in file_list:
+            os.remove(os.path.join(path, f))
+
+        if result:
+            seut_report(self, context, 'INFO', True, 'I007', scene.name)
+
+    except EnvironmentError:
+        seut_report(self, context, 'ERROR', False, 'E020')
@@ -27,6 +27,11 @@ class SEUT_OT_CopyExportOptions(Operator):
             scn.seut.export_largeGrid = scene.seut.export_largeGrid
             scn.seut.export_smallGrid = scene.seut.export_smallGrid
             scn.seut.export_medium_grid = scene.seut.export_medium_grid
+            scn.seut.export_backend = scene.seut.export_backend
+            scn.seut.export_optimize_meshes = scene.seut.export_optimize_meshes
+            scn.seut.export_merge_objects = scene.seut.export_merge_objects
+            scn.seut.export_lod_textures = scene.seut.export_lod_textures
+            scn.seut.export_lod_textures_start = scene.seut.export_lod_textures_start
             scn.seut.mod_path = scene.seut.mod_path
             scn.seut.export_exportPath = scene.seut.export_exportPath
         
@@ -3,21 +3,31 @@ import os
 import math
 import xml.etree.ElementTree as ET
 import xml.dom.minidom
-import shutil
 
 from os.path        import join
 from bpy.types      import Operator
 
-from .havok.seut_havok_hkt          import convert_fbx_to_fbxi_hkt, convert_fbxi_hkt_to_hkt
-from .seut_mwmbuilder               import mwmbuilder
+from .havok.seut_havok_hkt          import convert_fbx_to_fbxi_hkt, convert_fbxi_hkt_to_hkt, get_hko_content, prepare_collision
+from .havok.seut_havok_cache        import get_collision_hash, restore_cached_hkt, cache_hkt
+from .seut_mwmbuilder               import mwmbuilder, get_mwmbuilder_job, run_mwmbuilder_jobs
+from .seut_export_staging           import begin_staging, end_staging, get_staging_path, link_or_copy
+from .seut_export_mwm               import use_native_backend, export_native_mwm, clear_mesh_cache
+from .seut_export_inspection        import inspect_export
+from .seut_export_validation        import get_col_dict_issues, get_main_issues, get_collision_issues
 from .seut_export_utils             import ExportSettings, export_to_fbxfile, create_relative_path
+from .seut_custom_fbx_exporter      import havok_properties
 from .seut_export_utils             import correct_for_export_type, export_collection, get_col_filename
 from ..utils.seut_xml_utils         import *
 from ..seut_collections             import get_collections, get_rev_ref_cols, get_cols_by_type, get_first_free_index
 from ..seut_errors                  import *
+from ..seut_bbox                    import check_bbox
 from ..seut_utils                   import prep_context, get_preferences, create_relative_path, get_addon
 from ..utils.seut_tool_utils        import get_tool_dir
 
+# Results of check_uvms() per object, kept for the duration of an export.
+checked_uvms = {}
+
+
 class SEUT_OT_Export(Operator):
     """Exports all collections in the current scene and compiles them to MWM.\nScene needs to be in Object mode for export to be available"""
     bl_idname = "scene.export"
@@ -74,17 +84,22 @@ def export(self, context):
     if not os.path.exists(get_abs_path(scene.seut.export_exportPath)):
         os.makedirs(get_abs_path(scene.seut.export_exportPath))
 
-    # Check for availability of FBX Importer
-    result = check_toolpath(self, context, os.path.join(get_tool_dir(), 'FBXImporter.exe'), "Custom FBX Importer", "FBXImporter.exe")
-    if not result == {'CONTINUE'}:
-        scene.seut.linkSubpartInstances = subparts
-        return result
+    # Geometry sticking out of the bounding box is not blocking, but it needs to be pointed out before the grid sizes are derived.
+    check_bbox(self, context)
 
-    # Check for availability of MWM Builder
-    result = check_toolpath(self, context, preferences.mwmb_path, "MWM Builder", "MwmBuilder.exe")
-    if not result == {'CONTINUE'}:
-        scene.seut.linkSubpartInstances = subparts
-        return result
+    # The native MWM writer needs neither the FBX Importer nor MWM Builder
+    if not use_native_backend(scene):
+        # Check for availability of FBX Importer
+        result = check_toolpath(self, context, os.path.join(get_tool_dir(), 'FBXImporter.exe'), "Custom FBX Importer", "FBXImporter.exe")
+        if not result == {'CONTINUE'}:
+            scene.seut.linkSubpartInstances = subparts
+            return result
+
+        # Check for availability of MWM Builder
+        result = check_toolpath(self, context, preferences.mwmb_path, "MWM Builder", "MwmBuilder.exe")
+        if not result == {'CONTINUE'}:
+            scene.seut.linkSubpartInstances = subparts
+            return result
 
     # Check materials path
     materials_path = os.path.join(get_abs_path(preferences.asset_path), 'Materials')
@@ -99,71 +114,134 @@ def export(self, context):
     if scene.seut.sceneType == 'character_animation' and len(scene.timeline_markers) <= 0:
         scene.timeline_markers.new('F_00', frame=0)
         
+    original = {
+        'gridScale': str(scene.seut.gridScale),
+        'subtypeId': str(scene.seut.subtypeId),
+        'rescaleFactor': scene.seut.export_rescaleFactor,
+        'exportPath': str(scene.seut.export_exportPath)
+    }
+
+    checked_uvms.clear()
+    clear_mesh_cache()
+
+    # All grid sizes are written first, then their MWMs are compiled at the same time.
+    # Everything is built in staging directories, only the finished MWMs are moved into the mod.
+    mwm_jobs = []
+    exported = []
+    try:
+        for variant in get_export_variants(scene):
+            set_export_variant(scene, variant, original)
+            begin_staging(scene)
+
+            if export_all(self, context, mwm_jobs) == {'FINISHED'}:
+                exported.append(variant)
+
+            restore_export_settings(scene, original)
+
+        if mwm_jobs != []:
+            run_mwmbuilder_jobs(self, context, ExportSettings(scene, None), mwm_jobs)
+
+    except:
+        end_staging(self, context, False)
+        raise
+
+    end_staging(self, context)
+
+    for variant in exported:
+        set_export_variant(scene, variant, original)
+        inspect_export(self, context)
+        restore_export_settings(scene, original)
+
+    clear_mesh_cache()
+        
+    scene.seut.linkSubpartInstances = subparts
+        
+    context.area.type = current_area
+
+    return {'FINISHED'}
+
+
+def get_export_variants(scene) -> list:
+    """Returns the grid size, rescale factor and export path of every grid size the scene is exported to"""
+
     grid_scale = str(scene.seut.gridScale)
-    subtype_id = str(scene.seut.subtypeId)
-    rescale_factor = int(scene.seut.export_rescaleFactor)
-    path = str(scene.seut.export_exportPath)
-    
+    variants = []
+
     # Exports large grid and character-type scenes
     if scene.seut.export_largeGrid or scene.seut.sceneType == 'character_animation' or scene.seut.sceneType == 'character':
-        scene.seut.gridScale = 'large'
-        scene.seut.subtypeId = correct_for_export_type(scene, scene.seut.subtypeId)
-
+        rescale_factor = 1.0
         if grid_scale == 'small':
-            scene.seut.export_rescaleFactor = 5.0
+            rescale_factor = 5.0
             if scene.seut.export_medium_grid:
-                scene.seut.export_rescaleFactor = 3.0
-        else:
-            scene.seut.export_rescaleFactor = 1.0
+                rescale_factor = 3.0
 
-        if scene.seut.export_exportPath.find("\small\\") != -1 or scene.seut.export_exportPath.endswith("\small"):
-            scene.seut.export_exportPath = scene.seut.export_exportPath.replace("\small\\", "\large\\")
-            scene.seut.export_exportPath = scene.seut.export_exportPath.replace("\small", "\large")
-        
-        export_all(self, context)
+        path = scene.seut.export_exportPath
+        if path.find("\small\\") != -1 or path.endswith("\small"):
+            path = path.replace("\small\\", "\large\\")
+            path = path.replace("\small", "\large")
+
+        variants.append({'gridScale': 'large', 'rescaleFactor': rescale_factor, 'exportPath': path})
 
-        # Resetting the variables
-        scene.seut.subtypeId = subtype_id
-        scene.seut.gridScale = grid_scale
-        scene.seut.export_rescaleFactor = rescale_factor
-        scene.seut.export_exportPath = path
-    
     # Exports small grid scenes
     if scene.seut.export_smallGrid:
-        scene.seut.gridScale = 'small'
-        scene.seut.subtypeId = correct_for_export_type(scene, scene.seut.subtypeId)
-
+        rescale_factor = 1.0
         if grid_scale == 'large':
-            scene.seut.export_rescaleFactor = 0.2
+            rescale_factor = 0.2
             if scene.seut.export_medium_grid:
-                scene.seut.export_rescaleFactor = 0.6
-        else:
-            scene.seut.export_rescaleFactor = 1.0
+                rescale_factor = 0.6
 
-        if scene.seut.export_exportPath.find("\large\\") != -1 or scene.seut.export_exportPath.endswith("\large"):
-            scene.seut.export_exportPath = scene.seut.export_exportPath.replace("\large\\", "\small\\")
-            scene.seut.export_exportPath = scene.seut.export_exportPath.replace("\large", "\small")
-        
-        export_all(self, context)
+        path = scene.seut.export_exportPath
+        if path.find("\large\\") != -1 or path.endswith("\large"):
+            path = path.replace("\large\\", "\small\\")
+            path = path.replace("\large", "\small")
 
-        # Resetting the variables
-        scene.seut.subtypeId = subtype_id
-        scene.seut.gridScale = grid_scale
-        scene.seut.export_rescaleFactor = rescale_factor
-        scene.seut.export_exportPath = path
-        
-    scene.seut.linkSubpartInstances = subparts
-        
-    context.area.type = current_area
+        variants.append({'gridScale': 'small', 'rescaleFactor': rescale_factor, 'exportPath': path})
 
-    return {'FINISHED'}
+    return variants
+
+
+def set_export_variant(scene, variant: dict, original: dict):
+    """Switches the scene to the settings of the grid size being exported"""
+
+    scene.seut.gridScale = variant['gridScale']
+    scene.seut.subtypeId = correct_for_export_type(scene, original['subtypeId'])
+    scene.seut.export_rescaleFactor = variant['rescaleFactor']
+    scene.seut.export_exportPath = variant['exportPath']
 
 
-def export_all(self, context):
-    """Exports all collections"""
+def restore_export_settings(scene, original: dict):
+    scene.seut.subtypeId = original['subtypeId']
+    scene.seut.gridScale = original['gridScale']
+    scene.seut.export_rescaleFactor = original['rescaleFactor']
+    scene.seut.export_exportPath = original['exportPath']
+
+
+def check_uvms_once(self, context, obj):
+    """Runs check_uvms() only once per object and export, as its result is the same for every grid size"""
+
+    if obj.name not in checked_uvms:
+        checked_uvms[obj.name] = check_uvms(self, context, obj)
+
+    return checked_uvms[obj.name]
+
+
+def export_all(self, context, mwm_jobs: list = None):
+    """Exports all collections. If mwm_jobs is passed, MWMB is not run but its job appended to it"""
 
     scene = context.scene
 
+    # The native MWM writer embeds the HKTs directly, so they need to exist before the collections are written.
+    if use_native_backend(scene):
+        export_hkt(self, context)
+        export_bs(self, context)
+        export_lod(self, context)
+        result_main = export_main(self, context)
+
+        if scene.seut.export_sbc_type in ['update', 'new'] and scene.seut.sceneType == 'mainScene':
+            export_sbc(self, context)
+
+        return result_main
+
     export_bs(self, context)
     export_lod(self, context)
     result_main = export_main(self, context)
@@ -173,7 +251,9 @@ def export_all(self, context):
         export_sbc(self, context)
     
     if result_main == {'FINISHED'}:
-        export_mwm(self, context)
+        export_mwm(self, context, mwm_jobs)
+
+    return result_main
 
 
 def export_main(self, context):
@@ -187,31 +267,18 @@ def export_main(self, context):
     if not result == {'CONTINUE'}:
         return result
 
-    found_armatures = False
-    unparented_objects = 0
     for obj in collections['main'][0].objects:
-
-        if obj is not None and obj.type == 'ARMATURE':
-            found_armatures = True
-        
-        if obj.parent is None and obj.type != 'LIGHT' and obj.type != 'CAMERA':
-            unparented_objects += 1
-        
         # Check for missing UVMs (this might not be 100% reliable)
-        if check_uvms(self, context, obj) != {'CONTINUE'}:
+        if check_uvms_once(self, context, obj) != {'CONTINUE'}:
             return {'CANCELLED'}
     
-    # Check for armatures being present in collection
-    if not found_armatures and (scene.seut.sceneType == 'character' or scene.seut.sceneType == 'character_animation'):
-        seut_report(self, context, 'WARNING', True, 'W008', scene.name, scene.seut.sceneType)
-    if found_armatures and not (scene.seut.sceneType == 'character' or scene.seut.sceneType == 'character_animation'):
-        seut_report(self, context, 'WARNING', True, 'W009', scene.name, scene.seut.sceneType)
-    
-    # Check for unparented objects
-    if unparented_objects > 1:
-        seut_report(self, context, 'ERROR', True, 'E031', collections['main'][0].name)
+    # Check for armatures being present in collection and for unparented objects
+    if report_issues(self, context, get_main_issues(scene, collections['main'][0])):
         return {'CANCELLED'}
 
+    if use_native_backend(scene):
+        return export_native_mwm(self, context, collections['main'][0])
+
     export_collection(self, context, collections['main'][0])
     
     return {'FINISHED'}
@@ -224,7 +291,7 @@ def export_hkt(self, context):
     collections = get_collections(scene)
     preferences = get_preferences()
     settings = ExportSettings(scene, None)
-    path = get_abs_path(scene.seut.export_exportPath) + "\\"
+    path = get_staging_path(scene)
 
     # Check for availability of Havok SFM
     result = check_toolpath(self, context, preferences.havok_path, "Havok Standalone Filter Manager", "hctStandAloneFilterManager.exe")
@@ -237,36 +304,32 @@ def export_hkt(self, context):
             if not result == {'CONTINUE'}:
                 continue
 
-            cancelled = False
-            for obj in col.objects:
-
-                # Check for unapplied modifiers
-                if len(obj.modifiers) > 0:
-                    seut_report(self, context, 'ERROR', True, 'E034', obj.name)
-                    cancelled = True
-                    break
-                
-                # TODO: Investigate this again, and only apply rigidbody if there isn't one already
-                context.view_layer.objects.active = obj
-                # bpy.ops.object.transform_apply(location = True, scale = True, rotation = True) # This runs on all objects instead of just the active one for some reason. Breaks when there's instanced subparts.
-                bpy.ops.rigidbody.object_add(type='ACTIVE')
-
-            if cancelled:
-                return {'CANCELLED'}
-            
-            if len(col.objects) > 10:
-                seut_report(self, context, 'ERROR', True, 'E022', col.name, len(col.objects))
+            # Check for unapplied modifiers and too many objects
+            issues = get_collision_issues(col)
+            if report_issues(self, context, issues):
+                if any(issue[1] == 'E034' for issue in issues):
+                    return {'CANCELLED'}
                 continue
             
             fbx_hkt_file = join(path, f"{get_col_filename(col)}.hkt.fbx")
             hkt_file = join(path, f"{get_col_filename(col)}.hkt")
 
-            # Export as FBX
-            export_to_fbxfile(settings, scene, fbx_hkt_file, col.objects, ishavokfbxfile=True)
+            # Collision rarely changes, so the HKT of a previous export (or another collection with the same content) is reused if possible.
+            collision_hash = get_collision_hash(scene, col.objects, get_hko_content(), preferences.havok_path)
+            if restore_cached_hkt(collision_hash, hkt_file):
+                seut_report(self, context, 'INFO', False, 'I031', col.name)
+                continue
+
+            # Export as FBX. Objects without a rigid body are exported with the default settings of one.
+            prepare_collision(col.objects)
+            try:
+                export_to_fbxfile(settings, scene, fbx_hkt_file, col.objects, ishavokfbxfile=True)
+            finally:
+                havok_properties.clear()
 
             # Then create the HKT file.
-            convert_fbx_to_fbxi_hkt(context, settings, fbx_hkt_file, hkt_file)
-            convert_fbxi_hkt_to_hkt(self, context, settings, hkt_file, hkt_file)
+            if convert_fbx_to_fbxi_hkt(context, settings, fbx_hkt_file, hkt_file) and convert_fbxi_hkt_to_hkt(self, context, settings, hkt_file, hkt_file):
+                cache_hkt(collision_hash, hkt_file)
 
     return {'FINISHED'}
 
@@ -303,41 +366,31 @@ def export_lod(self, context):
 
 def check_export_col_dict(self, context, cols: dict):
     scene = context.scene
-    first_free_idx = get_first_free_index(cols)
-
-    # This ensures there's no index gaps
-    if first_free_idx <= len(cols):
-        col = next(iter(cols.values()))
-        col_type = col.seut.col_type
-        if col_type == 'lod' and col.seut.ref_col is not None:
-            ref_col_type_index = col.seut.ref_col.seut.type_index
-            seut_report(self, context, 'ERROR', True, 'E006', f"BS{ref_col_type_index}_LOD")
-        else:
-            seut_report(self, context, 'ERROR', True, 'E006', col_type)
 
+    # This ensures there's no index gaps and LOD distances increase with their index
+    if report_issues(self, context, get_col_dict_issues(cols)):
         return {'CANCELLED'}
 
     for idx, col in cols.items():
         result = check_collection(self, context, scene, col, True)
         if result == {'CONTINUE'}:
 
-            if col.seut.col_type == 'lod' and idx - 1 in cols and cols[idx - 1].seut.lod_distance > col.seut.lod_distance:
-                seut_report(self, context, 'ERROR', True, 'E011', col.name, cols[idx - 1].name)
-                return {'CANCELLED'}
-
             for obj in col.objects:
-                if check_uvms(self, context, obj) != {'CONTINUE'}:
+                if check_uvms_once(self, context, obj) != {'CONTINUE'}:
                     return {'CANCELLED'}
             
-            export_collection(self, context, col)
+            if use_native_backend(scene):
+                export_native_mwm(self, context, col)
+            else:
+                export_collection(self, context, col)
 
 
-def export_mwm(self, context):
-    """Compiles to MWM from the previously exported temp files"""
+def export_mwm(self, context, mwm_jobs: list = None):
+    """Compiles to MWM from the previously exported temp files. If mwm_jobs is passed, the compilation is only queued"""
     
     scene = context.scene
     preferences = get_preferences()
-    path = get_abs_path(scene.seut.export_exportPath)
+    path = get_staging_path(scene)
     materials_path = os.path.join(get_abs_path(preferences.asset_path), 'Materials')
 
     settings = ExportSettings(scene, None)
@@ -361,9 +414,12 @@ def export_mwm(self, context):
     if len(hkts) == 1:
         if not "_BS" in os.path.basename(hkts[0]):
             for bs in bses:
-                shutil.copyfile(os.path.join(path, hkts[0]), os.path.join(path, os.path.splitext(bs)[0] + '.hkt'))
+                link_or_copy(os.path.join(path, hkts[0]), os.path.join(path, os.path.splitext(bs)[0] + '.hkt'))
 
-    mwmbuilder(self, context, path, path, settings, mwmfile, materials_path)
+    if mwm_jobs is not None:
+        mwm_jobs.append(get_mwmbuilder_job(context, path, settings, materials_path))
+    else:
+        mwmbuilder(self, context, path, path, settings, mwmfile, materials_path)
 
     return {'FINISHED'}
 
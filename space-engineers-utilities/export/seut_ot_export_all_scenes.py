@@ -7,6 +7,7 @@ from ..utils.seut_tool_utils    import get_tool_dir
 from ..seut_errors              import *
 from ..seut_utils               import prep_context, get_preferences
 from .seut_ot_export            import export
+from .seut_export_validation    import validate_scenes, exported_scene_types
 
 
 class SEUT_OT_ExportAllScenes(Operator):
@@ -49,32 +50,32 @@ class SEUT_OT_ExportAllScenes(Operator):
         if not result == {'CONTINUE'}:
             return result
 
+        scenes = [scn for scn in bpy.data.scenes if 'SEUT' in scn.view_layers and scn.seut.sceneType in exported_scene_types]
+
+        # Every scene is validated before any tool is run, so all issues surface at once instead of one per export.
+        if not validate_scenes(self, context, scenes):
+            return {'CANCELLED'}
+
         current_area = prep_context(context)
         original_scene = context.window.scene
 
         scene_counter = 0
         failed_counter = 0
 
-        for scn in bpy.data.scenes:
-            
-            if not 'SEUT' in scn.view_layers:
-                continue
+        for scn in scenes:
+            scene_counter += 1
+            context.window.scene = scn
 
-            if scn.seut.sceneType == 'mainScene' or scn.seut.sceneType == 'subpart' or scn.seut.sceneType == 'character' or scn.seut.sceneType == 'character_animation':
-                
-                scene_counter += 1
-                context.window.scene = scn
+            try:
+                result = export(self, context)
 
-                try:
-                    result = export(self, context)
-
-                    if not result == {'FINISHED'}:
-                        failed_counter += 1
-                        seut_report(self, context, 'ERROR', True, 'E016', scn.name)
-
-                except RuntimeError:
+                if not result == {'FINISHED'}:
                     failed_counter += 1
                     seut_report(self, context, 'ERROR', True, 'E016', scn.name)
+
+            except RuntimeError:
+                failed_counter += 1
+                seut_report(self, context, 'ERROR', True, 'E016', scn.name)
         
         context.window.scene = original_scene
         context.area.type = current_area
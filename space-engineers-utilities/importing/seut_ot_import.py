@@ -91,35 +91,8 @@ def import_fbx(self, context, filepath):
         return {'CANCELLED'}
 
     for obj in imported_objects:
-        
         if obj.type == 'EMPTY':
-            
-            # Changes empty display type to correct one
-            obj.empty_display_type = 'CUBE'
-            for key in empty_types.keys():
-                if obj.name[:len(key)] == key:
-                    obj.empty_display_type = empty_types[key]
-                    break
-
-            # Empties are imported at 2x the size they should be, this fixes that issue
-            obj.scale.x *= 0.5
-            obj.scale.y *= 0.5
-            obj.scale.z *= 0.5
-
-            if 'file' in obj and obj['file'] in bpy.data.scenes:
-                obj.seut.linkedScene = bpy.data.scenes[obj['file']]
-
-            if 'highlight' in obj:
-                if obj['highlight'].find(";") == -1:
-                    if obj['highlight'] in bpy.data.objects:
-                        new = obj.seut.highlight_objects.add()
-                        new.obj = bpy.data.objects[obj['highlight']]
-                else:
-                    split = obj['highlight'].split(";")
-                    for entry in split:
-                        if entry in bpy.data.objects:
-                            new = obj.seut.highlight_objects.add()
-                            new.obj = bpy.data.objects[entry]
+            prepare_empty(obj)
     
     xml_path = os.path.splitext(filepath)[0] + '.xml'
     if os.path.exists(xml_path):
@@ -127,4 +100,35 @@ def import_fbx(self, context, filepath):
 
     seut_report(self, context, 'INFO', True, 'I014', filepath)
 
-    return {'FINISHED'}
\ No newline at end of file
+    return {'FINISHED'}
+
+
+def prepare_empty(obj):
+    """Adjusts an imported empty for use in SEUT"""
+
+    # Changes empty display type to correct one
+    obj.empty_display_type = 'CUBE'
+    for key in empty_types.keys():
+        if obj.name[:len(key)] == key:
+            obj.empty_display_type = empty_types[key]
+            break
+
+    # Empties are imported at 2x the size they should be, this fixes that issue
+    obj.scale.x *= 0.5
+    obj.scale.y *= 0.5
+    obj.scale.z *= 0.5
+
+    if 'file' in obj and obj['file'] in bpy.data.scenes:
+        obj.seut.linkedScene = bpy.data.scenes[obj['file']]
+
+    if 'highlight' in obj:
+        if obj['highlight'].find(";") == -1:
+            if obj['highlight'] in bpy.data.objects:
+                new = obj.seut.highlight_objects.add()
+                new.obj = bpy.data.objects[obj['highlight']]
+        else:
+            split = obj['highlight'].split(";")
+            for entry in split:
+                if entry in bpy.data.objects:
+                    new = obj.seut.highlight_objects.add()
+                    new.obj = bpy.data.objects[entry]
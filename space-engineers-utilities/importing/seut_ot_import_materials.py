@@ -1,5 +1,6 @@
 import bpy
 import os
+import time
 import xml.etree.ElementTree as ET
 
 from bpy.props import StringProperty
@@ -10,6 +11,9 @@ from ..seut_errors                          import seut_report, get_abs_path
 from ..seut_utils                           import get_preferences
 
 
+texture_params = ['ColorMetalTexture', 'NormalGlossTexture', 'AddMapsTexture', 'AlphamaskTexture']
+
+
 class SEUT_OT_Import_Materials(Operator):
     """Import Materials from XML Material Library"""
     bl_idname = "wm.import_materials"
@@ -56,6 +60,8 @@ def import_materials(self, context, filepath):
     elif not os.path.isdir(materials_path):
         os.makedirs(materials_path, exist_ok=True)
 
+    timer = time.time()
+
     try:
         tree = ET.parse(filepath)
     except:
@@ -67,27 +73,38 @@ def import_materials(self, context, filepath):
         seut_report(self, context, 'ERROR', True, 'E040')
         return {'CANCELLED'}
 
-    imported = []
-
+    entries = []
     for mat in root:
         if mat.tag != 'Material':
             continue
+        if is_seut_material(mat.attrib['Name']):
+            seut_report(self, context, 'INFO', True, 'I020', mat.attrib['Name'])
+            continue
+        entries.append(mat)
+    time_parse = time.time() - timer
+
+    # Every texture referenced by the materials to create is resolved once up front, so materials sharing textures share one image.
+    timer = time.time()
+    image_index = get_image_index()
+    images = {}
+    for mat in entries:
+        for param in mat:
+            if param.attrib['Name'] in texture_params and param.text is not None and not param.text in images:
+                images[param.text] = load_image(self, context, param.text, materials_path, image_index)
+    time_images = time.time() - timer
+
+    timer = time.time()
+    imported = []
+
+    for mat in entries:
 
         if mat.attrib['Name'] in bpy.data.materials:
-            nodes = bpy.data.materials[mat.attrib['Name']].node_tree.nodes
-            found = False
-            for node in nodes:
-                if node.name == 'SEUT_NODE_GROUP':
-                    found = True
-
-            if found:
-                seut_report(self, context, 'INFO', True, 'I020', mat.attrib['Name'])
-                continue
-            else:
+            if bpy.data.materials[mat.attrib['Name']].node_tree is not None:
+                nodes = bpy.data.materials[mat.attrib['Name']].node_tree.nodes
                 for node in nodes:
                     nodes.remove(node)
-                material = create_material(bpy.data.materials[mat.attrib['Name']])
-                material.name = mat.attrib['Name']
+            material = create_material(bpy.data.materials[mat.attrib['Name']])
+            material.name = mat.attrib['Name']
         
         else:
             material = create_material()
@@ -125,16 +142,16 @@ def import_materials(self, context, filepath):
                         break
 
             elif param.attrib['Name'] == 'ColorMetalTexture':
-                cm_img = load_image(self, context, param.text, materials_path)
+                cm_img = images.get(param.text)
 
             elif param.attrib['Name'] == 'NormalGlossTexture':
-                ng_img = load_image(self, context, param.text, materials_path)
+                ng_img = images.get(param.text)
 
             elif param.attrib['Name'] == 'AddMapsTexture':
-                add_img = load_image(self, context, param.text, materials_path)
+                add_img = images.get(param.text)
 
             elif param.attrib['Name'] == 'AlphamaskTexture':
-                am_img = load_image(self, context, param.text, materials_path)
+                am_img = images.get(param.text)
 
             elif param.attrib['Name'] == 'Facing':
                 material.seut.facing = param.text
@@ -167,37 +184,65 @@ def import_materials(self, context, filepath):
             material.node_tree.nodes.remove(am_node)
         
         imported.append(material.name)
+
+    time_materials = time.time() - timer
+    seut_report(self, context, 'INFO', False, 'I023', round(time_parse, 2), f"{round(time_images, 2)}s ({len(images)} textures)", f"{round(time_materials, 2)}s ({len(imported)} materials)")
         
     if len(imported) <= 0:
         seut_report(self, context, 'INFO', True, 'E041', filepath)
         return {'FINISHED'}
 
     else:
-        materials_string = ""
-        for name in imported:
-            if materials_string == "":
-                materials_string = name
-            else:
-                materials_string = materials_string + ", " + name
-
-        seut_report(self, context, 'INFO', True, 'I019', len(imported), filepath, materials_string)
+        seut_report(self, context, 'INFO', True, 'I019', len(imported), filepath, ", ".join(imported))
         return {'FINISHED'}
 
 
-def load_image(self, context, path: str, materials_path: str):
+def is_seut_material(name: str) -> bool:
+    """Returns whether a SEUT material of the given name already exists in the BLEND file."""
+
+    if name not in bpy.data.materials or bpy.data.materials[name].node_tree is None:
+        return False
+
+    return any(node.name == 'SEUT_NODE_GROUP' for node in bpy.data.materials[name].node_tree.nodes)
+
+
+def get_image_index() -> dict:
+    """Returns a dictionary of all file-based images in the BLEND file, keyed by their normalized absolute path."""
+
+    image_index = {}
+    for img in bpy.data.images:
+        if img.source != 'FILE' or img.filepath == "":
+            continue
+        image_index[normalize_path(bpy.path.abspath(img.filepath, library=img.library))] = img
+
+    return image_index
+
+
+def normalize_path(path: str) -> str:
+    """Returns a path in a form that allows for comparison with other paths."""
+
+    return os.path.normcase(os.path.normpath(path))
+
+
+def load_image(self, context, path: str, materials_path: str, image_index: dict = None):
     """Returns image by first checking if it already is in Blender, if not, loading it from the given path."""
 
+    if image_index is None:
+        image_index = get_image_index()
+
     seut_path = os.path.dirname(materials_path)
-    name = os.path.splitext(os.path.basename(path))
-    
     img_path = os.path.splitext(os.path.join(seut_path, path))[0] + ".tif"
+    key = normalize_path(img_path)
 
-    if name[0] in bpy.data.images:
-        return bpy.data.images[name]
+    if key in image_index:
+        return image_index[key]
 
-    else:
-        try:
-            return bpy.data.images.load(img_path)
-        except:
-            seut_report(self, context, 'WARNING', True, 'W011', img_path)
-            return
+    # Loading only registers the file - pixel data is not read until the image is first displayed.
+    try:
+        image = bpy.data.images.load(img_path, check_existing=True)
+    except:
+        seut_report(self, context, 'WARNING', True, 'W011', img_path)
+        return
+
+    image_index[key] = image
+    return image
@@ -0,0 +1,238 @@
+import bpy
+import os
+import time
+import numpy as np
+
+from bpy.types                  import Operator
+from bpy.props                  import StringProperty, BoolProperty
+from mathutils                  import Matrix
+
+from .seut_ot_import                        import prepare_empty
+from .seut_ot_import_complete               import get_basename, determine_fbx_type
+from ..export.seut_export_mwm               import get_axis_matrix
+from ..materials.seut_ot_remap_materials    import remap_materials
+from ..utils.seut_mesh_utils                import get_matrix_array
+from ..utils.seut_mwm_format                import read_mwm
+from ..seut_collections                     import *
+from ..seut_errors                          import seut_report
+
+
+class SEUT_OT_ImportMWM(Operator):
+    """Imports MWM files directly, without the need for FBX sources or external tools"""
+    bl_idname = "scene.import_mwm"
+    bl_label = "Import MWM"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    filter_glob: StringProperty(
+        default='*.mwm',
+        options={'HIDDEN'}
+        )
+
+    filepath: StringProperty(
+        subtype="FILE_PATH"
+        )
+
+    import_complete: BoolProperty(
+        name="Complete Import",
+        description="Also import the LODs and Build Stages located next to the MWM into their respective collections",
+        default=True
+        )
+
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene is not None
+
+
+    def execute(self, context):
+
+        if self.import_complete:
+            result = import_mwm_complete(self, context, self.filepath)
+        else:
+            result, model = import_mwm(self, context, self.filepath, context.collection)
+
+        remap_materials(self, context)
+
+        return result
+
+
+    def invoke(self, context, event):
+
+        context.window_manager.fileselect_add(self)
+
+        return {'RUNNING_MODAL'}
+
+
+def import_mwm(self, context, filepath, collection):
+    """Imports the mesh and dummies of an MWM into a collection. Returns the parsed model alongside the result"""
+
+    scene = context.scene
+    start = time.time()
+
+    try:
+        model = read_mwm(filepath)
+    except (EnvironmentError, ValueError) as error:
+        seut_report(self, context, 'ERROR', True, 'E050', filepath, error)
+        return {'CANCELLED'}, None
+
+    name = os.path.splitext(os.path.basename(filepath))[0]
+
+    # The inverse of the export conversion brings the model from SE's axes back into Blender's.
+    matrix = get_axis_matrix(scene).inverted()
+
+    obj = create_mesh_object(name, model, matrix)
+    collection.objects.link(obj)
+
+    for dummy in model.get('Dummies', []):
+        empty = create_empty(dummy, matrix)
+        collection.objects.link(empty)
+        empty.parent = obj
+        prepare_empty(empty)
+
+    triangles = sum(len(part['indices']) // 3 for part in model.get('MeshParts', []))
+    seut_report(self, context, 'INFO', True, 'I027', filepath, triangles, round(time.time() - start, 3))
+
+    return {'FINISHED'}, model
+
+
+def create_mesh_object(name: str, model: dict, matrix):
+    """Creates a mesh object from the vertex and index streams of a parsed MWM"""
+
+    m = get_matrix_array(matrix)[:3, :3]
+    parts = model.get('MeshParts', [])
+
+    positions = model.get('Vertices', np.empty((0, 3), dtype=np.float32)) @ m.T
+    normals = model.get('Normals', np.zeros((len(positions), 3), dtype=np.float32)) @ m.T
+
+    if len(parts) > 0:
+        indices = np.concatenate([part['indices'] for part in parts]).astype(np.int32)
+        material_indices = np.concatenate([np.full(len(part['indices']) // 3, idx, dtype=np.int32) for idx, part in enumerate(parts)])
+    else:
+        indices = np.empty(0, dtype=np.int32)
+        material_indices = np.empty(0, dtype=np.int32)
+
+    tri_count = len(indices) // 3
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set('co', positions.astype(np.float32).ravel())
+
+    mesh.loops.add(len(indices))
+    mesh.loops.foreach_set('vertex_index', indices)
+
+    mesh.polygons.add(tri_count)
+    mesh.polygons.foreach_set('loop_start', np.arange(0, len(indices), 3, dtype=np.int32))
+    mesh.polygons.foreach_set('loop_total', np.full(tri_count, 3, dtype=np.int32))
+    mesh.polygons.foreach_set('material_index', material_indices)
+    mesh.polygons.foreach_set('use_smooth', np.ones(tri_count, dtype=bool))
+
+    if 'TexCoords0' in model and len(model['TexCoords0']) == len(positions):
+        uv_layer = mesh.uv_layers.new(name='UVMap')
+        uv_layer.data.foreach_set('uv', model['TexCoords0'][indices].astype(np.float32).ravel())
+
+    for part in parts:
+        if part['material'] in bpy.data.materials:
+            mat = bpy.data.materials[part['material']]
+        else:
+            mat = bpy.data.materials.new(part['material'])
+        mesh.materials.append(mat)
+
+    mesh.update()
+    mesh.validate(clean_customdata=False)
+
+    if len(normals) == len(mesh.vertices):
+        mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set_from_vertices(normals.astype(np.float32))
+
+    return bpy.data.objects.new(name, mesh)
+
+
+def create_empty(dummy: dict, matrix):
+    """Creates an empty from a dummy of a parsed MWM"""
+
+    empty = bpy.data.objects.new(dummy['name'], None)
+    empty.empty_display_size = 1.0
+
+    # SE stores its matrices row by row with the translation in the last row.
+    se_matrix = Matrix([dummy['matrix'][i:i + 4] for i in range(0, 16, 4)]).transposed()
+    empty.matrix_world = matrix @ se_matrix @ matrix.inverted()
+
+    for key, value in dummy['data'].items():
+        empty[key] = value
+
+    return empty
+
+
+def import_mwm_complete(self, context, filepath):
+    """Imports an MWM alongside its LODs and Build Stages into the SEUT collections of the scene, the way SEUT_OT_ImportComplete does for FBX"""
+
+    scene = context.scene
+    collections = get_collections(scene)
+
+    filename = os.path.basename(filepath)
+    directory = os.path.dirname(filepath)
+
+    basename = get_basename(filename)
+    scene.seut.subtypeId = basename
+    tag = ' (' + scene.seut.subtypeId + ')'
+
+    col_counter = 0
+    failed_counter = 0
+    lod_distances = {}
+    lod_cols = {}
+
+    for f in sorted(os.listdir(directory)):
+        if os.path.splitext(f)[1].lower() != ".mwm":
+            continue
+
+        if not (basename == os.path.splitext(f)[0] or f"{basename}Construction" in f or f"{basename}_Construction" in f or f"{basename}_BS" in f or f"{basename}_LOD" in f):
+            continue
+
+        mwm_type = determine_fbx_type(f)
+
+        col_type = mwm_type['col_type']
+        type_index = mwm_type['type_index']
+        ref_col = None
+        if mwm_type['ref_col_type'] is not None:
+            ref_col = get_seut_collection(scene, mwm_type['ref_col_type'], ref_col_type=None, type_index=mwm_type['ref_col_type_index'])
+
+        if col_type in ['bs', 'lod']:
+            cols = get_cols_by_type(scene, col_type, ref_col)
+            if col_type in collections and type_index in cols:
+                col = cols[type_index]
+            else:
+                col = create_seut_collection(scene, col_type, type_index, ref_col)
+
+        else:
+            if 'main' in collections and collections['main']:
+                col = collections['main'][0]
+            else:
+                col = create_seut_collection(scene, 'main', None, None)
+
+        col_counter += 1
+        result, model = import_mwm(self, context, os.path.join(directory, f), col)
+
+        if not result == {'FINISHED'}:
+            failed_counter += 1
+            continue
+
+        for lod in model.get('LODs', []):
+            lod_distances[os.path.basename(lod['model'].replace("\\", "/")).lower()] = lod['distance']
+
+        if col_type == 'lod':
+            lod_cols[os.path.splitext(f)[0].lower()] = col
+
+        if col_type != 'main':
+            scene.view_layers['SEUT'].layer_collection.children['SEUT' + tag].children[col.name].hide_viewport = True
+
+    # LOD distances are stored in the model referencing the LOD, so they can only be applied once all files have been read.
+    for name, col in sorted(lod_cols.items(), key=lambda c: c[1].seut.type_index):
+        if name in lod_distances:
+            col.seut.lod_distance = int(lod_distances[name])
+
+    sort_collections(scene, context)
+
+    seut_report(self, context, 'INFO', True, 'I021', col_counter - failed_counter, col_counter)
+
+    return {'FINISHED'}
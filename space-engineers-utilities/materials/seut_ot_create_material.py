@@ -59,10 +59,9 @@ def create_material(material=None):
     node_group_node.name = 'SEUT_NODE_GROUP'
     node_group_node.location = (-25.0000, 173.1309)
 
-    if not 'SEUT Node Group' in bpy.data.node_groups or bpy.data.node_groups['SEUT Node Group'].library != None:
+    node_group = get_seut_nodegroup()
+    if node_group is None:
         node_group = create_seut_nodegroup(node_group_node)
-    else:
-        node_group = bpy.data.node_groups['SEUT Node Group']
 
     node_group_node.node_tree = node_group
     node_group_node.inputs[6].default_value = (1.0, 1.0, 1.0, 1.0)
@@ -82,6 +81,15 @@ def create_material(material=None):
     return material
 
 
+def get_seut_nodegroup():
+    """Returns the local SEUT node group, if it exists."""
+
+    # A linked node group of the same name must not shadow the local one, else a new group is created for every material.
+    for node_group in bpy.data.node_groups:
+        if node_group.name == 'SEUT Node Group' and node_group.library is None:
+            return node_group
+
+
 def create_seut_nodegroup(node):
     """Creates the SEUT node group."""
     
@@ -0,0 +1,316 @@
+import bpy
+import os
+import math
+import numpy as np
+
+from bpy.types  import Operator
+from bpy.props  import EnumProperty, IntProperty
+
+from .seut_ot_create_material       import create_material
+from ..utils.seut_mesh_utils        import get_mesh_objects
+from ..seut_errors                  import seut_report, get_abs_path
+
+
+# Texture channels of an atlas and the value pixels not covered by any material are filled with.
+atlas_channels = {
+    'CM': (0.5, 0.5, 0.5, 0.0),
+    'NG': (0.5, 0.5, 1.0, 0.5),
+    'ADD': (0.0, 0.0, 0.0, 0.0),
+    'ALPHAMASK': (1.0, 1.0, 1.0, 1.0)
+}
+
+
+class SEUT_OT_BuildTextureAtlas(Operator):
+    """Packs the used texture regions of all materials of the active LOD collection into one atlas material and remaps its UVs"""
+    bl_idname = "scene.build_texture_atlas"
+    bl_label = "Build Texture Atlas"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    max_size: EnumProperty(
+        name="Max Size",
+        description="Largest resolution of the atlas. Regions are scaled down until they fit",
+        items=(
+            ('512', '512', ''),
+            ('1024', '1024', ''),
+            ('2048', '2048', ''),
+            ('4096', '4096', '')
+            ),
+        default='2048'
+    )
+    padding: IntProperty(
+        name="Padding",
+        description="Pixels added around every region, so mipmaps do not bleed into neighbouring regions",
+        default=4,
+        min=0,
+        max=32
+    )
+
+
+    @classmethod
+    def poll(cls, context):
+        active_col = context.view_layer.active_layer_collection.collection
+        return active_col.seut.col_type == 'lod' and context.mode == 'OBJECT'
+
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        collection = context.view_layer.active_layer_collection.collection
+
+        if scene.seut.mod_path == "" or not os.path.isdir(get_abs_path(scene.seut.mod_path)):
+            seut_report(self, context, 'ERROR', True, 'E003', "Mod", get_abs_path(scene.seut.mod_path))
+            return {'CANCELLED'}
+
+        objects = get_mesh_objects(collection)
+        regions = get_material_regions(objects)
+
+        for material in list(regions.keys()):
+            reason = check_atlas_material(material, regions[material])
+            if reason is not None:
+                seut_report(self, context, 'WARNING', False, 'W022', material.name, reason)
+                del regions[material]
+
+        if len(regions) < 2:
+            seut_report(self, context, 'ERROR', True, 'E055', collection.name)
+            return {'CANCELLED'}
+
+        materials = list(regions.keys())
+        sources = [get_source_rect(material, regions[material], self.padding) for material in materials]
+
+        # Regions are halved until they fit, keeping their proportions to each other.
+        max_size = int(self.max_size)
+        scale = 1.0
+        while True:
+            sizes = [(max(1, int(rect[2] * scale)), max(1, int(rect[3] * scale))) for rect in sources]
+            packing = pack_rectangles(sizes, max_size)
+            if packing is not None:
+                break
+            scale *= 0.5
+
+        positions, width, height = packing
+        name = f"{scene.seut.subtypeId}_{collection.seut.col_type.upper()}{collection.seut.type_index}_Atlas"
+        folder = os.path.join(get_abs_path(scene.seut.mod_path), 'Textures', 'Models', 'Atlas')
+        os.makedirs(folder, exist_ok=True)
+
+        atlas = create_material()
+        atlas.name = name
+        atlas.seut.technique = 'MESH'
+
+        for channel, default in atlas_channels.items():
+            pixels = np.empty((height, width, 4), dtype=np.float32)
+            pixels[:] = default
+
+            used = False
+            for material, rect, position, size in zip(materials, sources, positions, sizes):
+                image = get_channel_image(material, channel)
+                if image is None:
+                    continue
+                region = sample_region(get_image_pixels(image), rect, get_reference_size(material), size[0], size[1])
+                pixels[position[1]:position[1] + size[1], position[0]:position[0] + size[0]] = region
+                used = True
+
+            if not used:
+                continue
+
+            image = bpy.data.images.new(f"{name}_{channel.lower()}", width, height, alpha=True)
+            image.pixels.foreach_set(pixels.ravel())
+            if channel != 'CM':
+                image.colorspace_settings.name = 'Non-Color'
+            image.filepath_raw = os.path.join(folder, f"{name}_{channel.lower()}.png")
+            image.file_format = 'PNG'
+            image.save()
+
+            atlas.node_tree.nodes[channel].image = image
+
+        # UVs are moved from the region of their material's textures to that region's place in the atlas.
+        transforms = {}
+        for material, rect, position, size in zip(materials, sources, positions, sizes):
+            transforms[material] = (get_reference_size(material), np.floor(regions[material][:2]), rect, position, size)
+
+        for obj in objects:
+            if obj.data.uv_layers.active is None:
+                continue
+            if obj.data.users > 1:
+                obj.data = obj.data.copy()
+            remap_uvs(obj, transforms, width, height)
+            for slot in obj.material_slots:
+                if slot.material in transforms:
+                    slot.material = atlas
+
+        seut_report(self, context, 'INFO', True, 'I040', len(materials), f"{width}x{height}", atlas.name)
+
+        return {'FINISHED'}
+
+
+def get_channel_image(material, channel: str):
+    """Returns the image of a texture channel of a SEUT material, if it has pixels"""
+
+    nodes = material.node_tree.nodes
+    if channel not in nodes or nodes[channel].type != 'TEX_IMAGE' or nodes[channel].image is None:
+        return None
+
+    image = nodes[channel].image
+    if image.size[0] == 0 or image.size[1] == 0:
+        return None
+
+    return image
+
+
+def get_reference_size(material) -> tuple:
+    """Returns the resolution all texture channels of a material are sampled at, which is that of its largest one"""
+
+    sizes = [tuple(image.size) for image in (get_channel_image(material, channel) for channel in atlas_channels) if image is not None]
+
+    return max(sizes, key=lambda size: size[0] * size[1])
+
+
+def get_material_regions(objects: list) -> dict:
+    """Returns the UV bounds (u_min, v_min, u_max, v_max) every material is used with across the objects"""
+
+    regions = {}
+    for obj in objects:
+        mesh = obj.data
+        if mesh.uv_layers.active is None or len(mesh.polygons) < 1:
+            continue
+
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float64)
+        mesh.uv_layers.active.data.foreach_get('uv', uvs)
+        uvs = uvs.reshape(-1, 2)
+        totals = np.empty(len(mesh.polygons), dtype=np.int64)
+        mesh.polygons.foreach_get('loop_total', totals)
+        indices = np.empty(len(mesh.polygons), dtype=np.int64)
+        mesh.polygons.foreach_get('material_index', indices)
+        loop_indices = np.repeat(indices, totals)
+
+        for idx in np.unique(indices).tolist():
+            if idx >= len(obj.material_slots) or obj.material_slots[idx].material is None:
+                continue
+            material = obj.material_slots[idx].material
+            selection = uvs[loop_indices == idx]
+            bounds = np.concatenate((selection.min(axis=0), selection.max(axis=0)))
+
+            if material in regions:
+                previous = regions[material]
+                bounds = np.concatenate((np.minimum(previous[:2], bounds[:2]), np.maximum(previous[2:], bounds[2:])))
+            regions[material] = bounds
+
+    return regions
+
+
+def check_atlas_material(material, bounds) -> str:
+    """Returns why a material can't be added to an atlas, None if it can"""
+
+    if material.node_tree is None or get_channel_image(material, 'CM') is None:
+        return "It has no color texture with pixel data"
+    if material.seut.technique != 'MESH':
+        return f"Technique '{material.seut.technique}' is not supported"
+
+    # Tiling textures would need repeating their region, which an atlas can't do.
+    if np.any(bounds[2:] - np.floor(bounds[:2]) > 1.0 + 1e-4):
+        return "Its UVs tile the texture"
+
+    return None
+
+
+def get_source_rect(material, bounds, padding: int) -> tuple:
+    """Returns the pixel region (x, y, width, height) of a material's textures its UVs use, including padding"""
+
+    width, height = get_reference_size(material)
+    offset = np.floor(bounds[:2])
+
+    x0 = max(0, math.floor((bounds[0] - offset[0]) * width) - padding)
+    y0 = max(0, math.floor((bounds[1] - offset[1]) * height) - padding)
+    x1 = min(width, math.ceil((bounds[2] - offset[0]) * width) + padding)
+    y1 = min(height, math.ceil((bounds[3] - offset[1]) * height) + padding)
+
+    return (x0, y0, max(1, x1 - x0), max(1, y1 - y0))
+
+
+def get_image_pixels(image) -> np.ndarray:
+    """Returns the pixels of an image as RGBA array of shape (height, width, 4)"""
+
+    width, height = image.size
+    pixels = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    pixels = pixels.reshape(height, width, image.channels)
+
+    if image.channels == 4:
+        return pixels
+
+    rgba = np.ones((height, width, 4), dtype=np.float32)
+    rgba[:, :, :3] = pixels[:, :, :3] if image.channels >= 3 else pixels[:, :, :1]
+
+    return rgba
+
+
+def sample_region(pixels: np.ndarray, rect: tuple, reference: tuple, width: int, height: int) -> np.ndarray:
+    """Returns a region given in pixels of the reference resolution, scaled to the given size with nearest neighbour sampling"""
+
+    x, y, w, h = rect
+    xs = ((x + (np.arange(width) + 0.5) * w / width) * pixels.shape[1] / reference[0]).astype(np.int64)
+    ys = ((y + (np.arange(height) + 0.5) * h / height) * pixels.shape[0] / reference[1]).astype(np.int64)
+
+    return pixels[np.clip(ys, 0, pixels.shape[0] - 1)][:, np.clip(xs, 0, pixels.shape[1] - 1)]
+
+
+def pack_rectangles(sizes: list, max_size: int):
+    """Packs rectangles into rows, tallest first. Returns their positions and the power of two size of the atlas, None if they don't fit"""
+
+    area = sum(w * h for w, h in sizes)
+    width = 2 ** math.ceil(math.log2(max(max(w for w, h in sizes), math.sqrt(area), 1)))
+    if width > max_size:
+        return None
+
+    positions = [None] * len(sizes)
+    x = y = row_height = 0
+    for idx in sorted(range(len(sizes)), key=lambda idx: sizes[idx][1], reverse=True):
+        w, h = sizes[idx]
+        if x + w > width:
+            y += row_height
+            x = row_height = 0
+        positions[idx] = (x, y)
+        x += w
+        row_height = max(row_height, h)
+
+    height = 2 ** math.ceil(math.log2(max(1, y + row_height)))
+    if height > max_size:
+        return None
+
+    return positions, width, height
+
+
+def remap_uvs(obj, transforms: dict, width: int, height: int):
+    """Moves the UVs of all faces using an atlased material to the material's region in the atlas"""
+
+    mesh = obj.data
+    if mesh.uv_layers.active is None:
+        return
+
+    uvs = np.empty(len(mesh.loops) * 2, dtype=np.float64)
+    mesh.uv_layers.active.data.foreach_get('uv', uvs)
+    uvs = uvs.reshape(-1, 2)
+    totals = np.empty(len(mesh.polygons), dtype=np.int64)
+    mesh.polygons.foreach_get('loop_total', totals)
+    indices = np.empty(len(mesh.polygons), dtype=np.int64)
+    mesh.polygons.foreach_get('material_index', indices)
+    loop_indices = np.repeat(indices, totals)
+
+    result = uvs.copy()
+    for idx, slot in enumerate(obj.material_slots):
+        if slot.material not in transforms:
+            continue
+
+        (ref_w, ref_h), offset, (x, y, w, h), (atlas_x, atlas_y), (atlas_w, atlas_h) = transforms[slot.material]
+        selection = loop_indices == idx
+        px = (uvs[selection, 0] - offset[0]) * ref_w
+        py = (uvs[selection, 1] - offset[1]) * ref_h
+        result[selection, 0] = (atlas_x + (px - x) * atlas_w / w) / width
+        result[selection, 1] = (atlas_y + (py - y) * atlas_h / h) / height
+
+    mesh.uv_layers.active.data.foreach_set('uv', result.ravel())
+    mesh.update()
@@ -201,7 +201,7 @@ def mass_convert_textures(self, context, dirs: list, target_dir: str, preset: st
 
         converted = 0
         for r in results:
-            idx_o = presets[preset].index('-o')
+            idx_o = r[2].index('-o')
             target_file = os.path.join(r[2][idx_o + 1], os.path.splitext(os.path.basename(r[2][1]))[0] + '.' + output_type)
             if r[0] == 0:
                 converted += 1
@@ -243,7 +243,8 @@ def convert_texture(path_in: str, path_out: str, preset: str, settings=[]):
 
 def get_conversion_args(preset: str, path_in: str, path_out: str, settings=[]) -> list:
 
-    args = presets[preset]
+    # The presets are copied, so neither the settings nor the sRGB switch below persist into the next conversion.
+    args = list(presets[preset])
     args[0] = os.path.join(get_tool_dir(), 'texconv.exe')
     args[1] = path_in
     args[len(args) - 1] = path_out
@@ -255,7 +256,7 @@ def get_conversion_args(preset: str, path_in: str, path_out: str, settings=[]) -
         args.insert(idx_ft + 3, 'R8G8B8A8_UNORM')
         args.insert(idx_ft + 4, '-srgbi')
 
-    if preset == 'custom' and settings != []:
+    if settings != []:
         pos = 2
         for i in settings:
             args.insert(pos, i)
@@ -167,6 +167,8 @@ def get_config() -> dict:
         dict['asset_path'] = preferences.asset_path
     if preferences.havok_path is not None:
         dict['havok_path'] = preferences.havok_path
+    if preferences.staging_path is not None:
+        dict['staging_path'] = preferences.staging_path
 
     data['space-engineers-utilities'].append(dict)
     return data
@@ -185,6 +187,8 @@ def set_config(data):
             preferences.asset_path = cfg['asset_path']
         if 'havok_path' in cfg:
             preferences.havok_path = cfg['havok_path']
+        if 'staging_path' in cfg:
+            preferences.staging_path = cfg['staging_path']
 
 
 def bau_register():
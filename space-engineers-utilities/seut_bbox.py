@@ -1,135 +1,123 @@
 import bpy
-import gpu
-import math
+import numpy as np
 
-from bgl                import *
-from gpu_extras.batch   import batch_for_shader
 from bpy.types          import Operator
 
+from .seut_collections          import get_collections
+from .seut_errors               import check_collection_excluded, seut_report
+from .utils.seut_mesh_utils     import get_collection_vertices
 
-# Most of the code used in this class is **heavily** based on Jayanam's "Blender 2.8 Python GPU : Draw Lines"-video:
-# https://www.youtube.com/watch?v=EgrgEoNFNsA
-class SEUT_OT_BBox(Operator):
-    """Sets the bounding box"""
-    bl_idname = "object.bbox"
-    bl_label = "Bounding Box"
+
+class SEUT_OT_BBoxAutoFit(Operator):
+    """Sets the bounding box to the smallest size that contains the geometry of the Main, BS and LOD collections"""
+    bl_idname = "object.bbox_auto_fit"
+    bl_label = "Auto-Fit"
     bl_options = {'REGISTER', 'UNDO'}
 
-    def __init__(self):
-        self.draw_handle = None
-        self.draw_event = None
 
-    def invoke(self, context, event):
+    @classmethod
+    def poll(cls, context):
+        return context.scene.seut.sceneType == 'mainScene'
+
+
+    def execute(self, context):
 
         scene = context.scene
-        wm = context.window_manager
 
-        # If the toggle is off, don't do anything.
-        if wm.seut.bBoxToggle == 'off':
-            return {'FINISHED'}
+        size, extent = get_bbox_fit(scene, context.evaluated_depsgraph_get())
+        if size is None:
+            seut_report(self, context, 'ERROR', True, 'E048', scene.name)
+            return {'CANCELLED'}
 
-        factor = 1
+        scene.seut.bBox_X = int(size[0])
+        scene.seut.bBox_Y = int(size[1])
+        scene.seut.bBox_Z = int(size[2])
 
-        if scene.seut.gridScale == 'large': factor = 2.5
-        if scene.seut.gridScale == 'small': factor = 0.5
+        seut_report(self, context, 'INFO', True, 'I025', scene.name, format_bbox_size(size))
 
-        x = scene.seut.bBox_X * factor
-        y = scene.seut.bBox_Y * factor
-        z = scene.seut.bBox_Z * factor
+        return {'FINISHED'}
 
-        self.coords = (
-            (-x/2, -y/2, -z/2), (+x/2, -y/2, -z/2),
-            (-x/2, +y/2, -z/2), (+x/2, +y/2, -z/2),
-            (-x/2, -y/2, +z/2), (+x/2, -y/2, +z/2),
-            (-x/2, +y/2, +z/2), (+x/2, +y/2, +z/2)
-        )
 
-        self.indices = (
-            (0, 1), (0, 2), (1, 3), (2, 3),
-            (4, 5), (4, 6), (5, 7), (6, 7),
-            (0, 4), (1, 5), (2, 6), (3, 7)
-        )
+def get_grid_size(grid_scale: str) -> float:
+    """Returns the edge length of a block of the given grid scale in meters."""
 
-        self.create_batch()
+    if grid_scale == 'small':
+        return 0.5
+    else:
+        return 2.5
 
-        args = (self, context)
-        self.register_handlers(args, context)
 
-        context.window_manager.modal_handler_add(self)
+def format_bbox_size(size) -> str:
+    """Returns a bounding box size as X x Y x Z string."""
 
-        return {'RUNNING_MODAL'}
+    return "x".join(str(int(value)) for value in size)
 
 
-    def register_handlers(self, args, context):
-        self.draw_handle = bpy.types.SpaceView3D.draw_handler_add(
-            self.draw_callback_3d, args, "WINDOW", "POST_VIEW"
-        )
+def get_bbox_fit(scene, depsgraph) -> tuple:
+    """Returns the bounding box size in blocks required by the geometry of the Main, BS and LOD collections and the geometry's largest distance from the origin per axis."""
 
-        self.draw_event = context.window_manager.event_timer_add(1, window=context.window)
+    collections = get_collections(scene)
+    arrays = []
 
-    def unregister_handlers(self, context):
+    for key in ['main', 'bs', 'lod']:
+        if collections[key] is None:
+            continue
+        for col in collections[key]:
+            if check_collection_excluded(scene, col):
+                continue
+            arrays.append(get_collection_vertices(col, depsgraph))
 
-        context.window_manager.event_timer_remove(self.draw_event)
+    if len(arrays) < 1:
+        return None, None
 
-        bpy.types.SpaceView3D.draw_handler_remove(self.draw_handle, "WINDOW")
+    co = np.concatenate(arrays)
+    if len(co) < 1:
+        return None, None
 
-        self.draw_handle = None
-        self.draw_event = None
+    # The bounding box is centered on the origin, so the furthest vertex on each axis defines its size.
+    extent = np.abs(co).max(axis=0)
+    size = get_required_cells(extent, get_grid_size(scene.seut.gridScale))
 
-    def modal(self, context, event):
-        scene = context.scene
-        wm = context.window_manager
+    return size, extent
 
-        if context.area:
-            context.area.tag_redraw()
 
-        # Escape condition for when the user turns off the bounding box.
-        if wm.seut.bBoxToggle == 'off':
-            self.unregister_handlers(context)
-            return {'FINISHED'}
+def get_required_cells(extent, grid_size: float, scalar: float = 1.0):
+    """Returns the number of blocks needed per axis to contain geometry extending the given distance from the origin."""
 
-        factor = 1
+    # A small tolerance keeps floating point noise on vertices sitting exactly on a block boundary from adding a block.
+    return np.maximum(1, np.ceil(extent * 2 / grid_size * scalar - 0.001)).astype(int)
 
-        if scene.seut.gridScale == 'large': factor = 2.5
-        if scene.seut.gridScale == 'small': factor = 0.5
 
-        x = scene.seut.bBox_X * factor
-        y = scene.seut.bBox_Y * factor
-        z = scene.seut.bBox_Z * factor
+def check_bbox(self, context, can_report=False):
+    """Checks whether the geometry of the scene fits its bounding box for all grid sizes the scene is exported to."""
 
-        if not scene.seut.sceneType == 'mainScene':
-            x = 0
-            y = 0
-            z = 0
+    scene = context.scene
 
-        self.coords = (
-            (-x/2, -y/2, -z/2), (+x/2, -y/2, -z/2),
-            (-x/2, +y/2, -z/2), (+x/2, +y/2, -z/2),
-            (-x/2, -y/2, +z/2), (+x/2, -y/2, +z/2),
-            (-x/2, +y/2, +z/2), (+x/2, +y/2, +z/2)
-        )
+    if scene.seut.sceneType != 'mainScene':
+        return {'CONTINUE'}
 
-        self.create_batch()
-        
-        return {'PASS_THROUGH'}
+    size, extent = get_bbox_fit(scene, context.evaluated_depsgraph_get())
+    if size is None:
+        return {'CONTINUE'}
 
-    def finish(self):
-        self.unregister_handlers(context)
-        return {'FINISHED'}
+    declared = np.array([scene.seut.bBox_X, scene.seut.bBox_Y, scene.seut.bBox_Z])
+    grid_size = get_grid_size(scene.seut.gridScale)
+
+    # Mirrors the sizes export_sbc() writes: converting between grid sizes in medium grid mode scales the block by 3/5 or 3.
+    variants = []
+    if scene.seut.export_largeGrid:
+        variants.append(('Large Grid', 0.6 if scene.seut.gridScale == 'small' and scene.seut.export_medium_grid else 1.0))
+    if scene.seut.export_smallGrid:
+        variants.append(('Small Grid', 3.0 if scene.seut.gridScale == 'large' and scene.seut.export_medium_grid else 1.0))
+
+    result = {'CONTINUE'}
+    for name, scalar in variants:
+        exported = np.round(declared * scalar).astype(int)
+        required = get_required_cells(extent, grid_size, scalar)
+
+        if np.any(exported < required):
+            seut_report(self, context, 'WARNING', can_report, 'W015', scene.name, f"{name}: {format_bbox_size(exported)}", format_bbox_size(np.maximum(exported, required)))
+            result = {'CANCELLED'}
+
+    return result
 
-    def create_batch(self):
-
-        self.shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        self.batch = batch_for_shader(self.shader, 'LINES', {"pos": self.coords}, indices=self.indices)
-
-    def draw_callback_3d(self, op, context):
-        wm = context.window_manager
-        
-        try:
-            glEnable(GL_BLEND)
-            self.shader.bind()
-            self.shader.uniform_float("color", (wm.seut.bboxColor[0], wm.seut.bboxColor[1], wm.seut.bboxColor[2], wm.seut.bboxColor[3]))
-            self.batch.draw(self.shader)
-            glDisable(GL_BLEND)
-        except:
-            return
\ No newline at end of file
@@ -535,10 +535,10 @@ def create_seut_collection(scene, col_type: str, type_index=None, ref_col=None):
                 else:
                     type_index = 1
             
-            if type_index == 1:
-                lod_distance = 25
-            else:
+            if type_index - 1 in cols:
                 lod_distance = cols[type_index - 1].seut.lod_distance * 2
+            else:
+                lod_distance = 25 * 2 ** (type_index - 1)
 
             if ref_col.seut.col_type != 'main':
                 ref_col_type = ref_col.seut.col_type
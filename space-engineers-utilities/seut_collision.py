@@ -0,0 +1,604 @@
+import bpy
+import bmesh
+import time
+import numpy as np
+
+from mathutils      import Matrix
+from bpy.types      import Operator
+from bpy.props      import IntProperty, FloatProperty, BoolProperty
+
+from .seut_collections              import get_collections, create_seut_collection
+from .seut_errors                   import check_collection, seut_report
+from .utils.seut_mesh_utils         import get_collection_triangles, get_evaluated_triangles, get_surface_samples
+
+
+# Havok primitive shapes, from cheapest to most expensive to collide with ingame.
+primitive_shapes = ['SPHERE', 'CAPSULE', 'BOX', 'CYLINDER']
+
+
+class SEUT_OT_GenerateConvexCollision(Operator):
+    """Fills the collision collection with convex hulls approximating the geometry of the collection it references"""
+    bl_idname = "scene.generate_convex_collision"
+    bl_label = "Generate Convex Collision"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    max_hulls: IntProperty(
+        name="Hulls",
+        description="Maximum number of convex hulls to create. Space Engineers supports at most 10 collision objects per collection",
+        default=6,
+        min=1,
+        max=10
+    )
+    tolerance: FloatProperty(
+        name="Concavity Tolerance",
+        description="Hulls are split until no part of the geometry lies deeper than this below the surface of its hull",
+        default=0.05,
+        min=0.001,
+        max=5.0,
+        subtype='DISTANCE'
+    )
+    max_vertices: IntProperty(
+        name="Vertices per Hull",
+        description="Maximum number of vertices of a single hull. Simpler hulls are cheaper for Havok to process ingame",
+        default=32,
+        min=4,
+        max=255
+    )
+    replace: BoolProperty(
+        name="Replace Existing",
+        description="Removes all objects already in the collision collection",
+        default=True
+    )
+
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.seut.sceneType in ['mainScene', 'subpart'] and context.mode == 'OBJECT'
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        collections = get_collections(scene)
+
+        if collections['main'] is None:
+            seut_report(self, context, 'ERROR', True, 'E002', "Main")
+            return {'CANCELLED'}
+
+        # If a collision collection is active, its reference is used instead of Main.
+        active_col = context.view_layer.active_layer_collection.collection
+        if active_col.seut.col_type == 'hkt' and active_col.seut.ref_col is not None:
+            source = active_col.seut.ref_col
+        else:
+            source = collections['main'][0]
+
+        result = check_collection(self, context, scene, source, False)
+        if not result == {'CONTINUE'}:
+            return result
+
+        start = time.time()
+
+        co, tris = get_collection_triangles(source, context.evaluated_depsgraph_get())
+        hulls = get_convex_decomposition(co, tris, self.max_hulls, self.tolerance, self.max_vertices)
+
+        if len(hulls) < 1:
+            seut_report(self, context, 'WARNING', True, 'W019', source.name)
+            return {'CANCELLED'}
+
+        collection = get_collision_collection(scene, source)
+        if collection is None:
+            seut_report(self, context, 'ERROR', True, 'E002', "Collision")
+            return {'CANCELLED'}
+
+        if self.replace:
+            for obj in list(collection.objects):
+                bpy.data.objects.remove(obj, do_unlink=True)
+
+        create_hull_objects(collection, hulls, "Collision")
+
+        seut_report(self, context, 'INFO', True, 'I032', len(hulls), collection.name, round(time.time() - start, 3))
+
+        return {'FINISHED'}
+
+
+class SEUT_OT_FitCollisionPrimitives(Operator):
+    """Switches collision objects to box, sphere, cylinder or capsule shapes where they closely match one"""
+    bl_idname = "scene.fit_collision_primitives"
+    bl_label = "Fit Primitive Shapes"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description="Maximum distance between the surface of an object and the primitive shape fitted to it",
+        default=0.02,
+        min=0.0,
+        max=1.0,
+        subtype='DISTANCE'
+    )
+
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.seut.sceneType in ['mainScene', 'subpart'] and context.mode == 'OBJECT'
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        collections = get_collections(scene)
+        depsgraph = context.evaluated_depsgraph_get()
+
+        # If a collision collection is active, only its objects are fitted.
+        active_col = context.view_layer.active_layer_collection.collection
+        if active_col.seut.col_type == 'hkt':
+            cols = [active_col]
+        else:
+            cols = collections['hkt'] if collections['hkt'] is not None else []
+
+        objects = [obj for col in cols for obj in col.objects if obj.type == 'MESH']
+        if len(objects) < 1:
+            seut_report(self, context, 'ERROR', True, 'E002', "Collision")
+            return {'CANCELLED'}
+
+        fitted = 0
+        for obj in objects:
+            # Changing the origin of a mesh used by several objects would move the others.
+            if obj.data.users > 1:
+                continue
+
+            co, tris = get_evaluated_triangles(obj, depsgraph)
+            fit = get_primitive_fit(co, tris, self.tolerance, object_axes=np.array(obj.matrix_world.to_3x3()))
+            if fit is not None:
+                apply_primitive_fit(obj, fit)
+                fitted += 1
+
+        seut_report(self, context, 'INFO', True, 'I033', fitted, len(objects))
+
+        return {'FINISHED'}
+
+
+def get_collision_collection(scene, ref_col):
+    """Returns the collision collection referencing a collection, creating it if it doesn't exist yet."""
+
+    collections = get_collections(scene)
+
+    if collections['hkt'] is not None:
+        for col in collections['hkt']:
+            if col.seut.ref_col == ref_col:
+                return col
+
+    return create_seut_collection(scene, 'hkt', ref_col=ref_col)
+
+
+def create_hull_objects(collection, hulls: list, name: str) -> list:
+    """Creates a mesh object per hull within a collection. The hulls are in world space."""
+
+    objects = []
+    for co, tris in hulls:
+        mesh = bpy.data.meshes.new(name)
+        mesh.from_pydata(co.tolist(), [], tris.tolist())
+        mesh.update()
+
+        obj = bpy.data.objects.new(name, mesh)
+        collection.objects.link(obj)
+        objects.append(obj)
+
+    return objects
+
+
+def get_convex_hull(points: np.ndarray):
+    """Returns the vertices and triangles of the convex hull around a set of points, None if they do not enclose any volume."""
+
+    points = np.unique(np.round(points, 5), axis=0)
+    if len(points) < 4:
+        return None
+
+    bm = bmesh.new()
+    for p in points:
+        bm.verts.new(p)
+
+    result = bmesh.ops.convex_hull(bm, input=bm.verts, use_existing_faces=False)
+    unused = [e for e in result['geom_interior'] + result['geom_unused'] if isinstance(e, bmesh.types.BMVert)]
+    bmesh.ops.delete(bm, geom=unused, context='VERTS')
+    bmesh.ops.triangulate(bm, faces=bm.faces)
+
+    if len(bm.faces) < 4:
+        bm.free()
+        return None
+
+    bm.verts.index_update()
+    co = np.array([v.co for v in bm.verts], dtype=np.float64)
+    tris = np.array([[v.index for v in f.verts] for f in bm.faces], dtype=np.int32)
+    bm.free()
+
+    return co, tris
+
+
+def get_hull_planes(co: np.ndarray, tris: np.ndarray):
+    """Returns the outward normals, plane offsets and areas of the triangles of a convex hull."""
+
+    corners = co[tris]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    valid = lengths > 1e-12
+    normals = normals[valid] / lengths[valid, None]
+    offsets = np.einsum('ij,ij->i', normals, corners[valid, 0])
+
+    # The center of a convex hull lies behind all of its faces.
+    flip = normals @ co.mean(axis=0) - offsets > 0
+    normals[flip] *= -1
+    offsets[flip] *= -1
+
+    return normals, offsets, lengths[valid] / 2
+
+
+def get_hull_volume(co: np.ndarray, tris: np.ndarray) -> float:
+    normals, offsets, areas = get_hull_planes(co, tris)
+
+    return float(np.sum(np.abs(offsets - normals @ co.mean(axis=0)) * areas) / 3)
+
+
+def get_concavity(points: np.ndarray, hull) -> tuple:
+    """Returns how deep the deepest point lies below the surface of its convex hull, and that point."""
+
+    normals, offsets, _ = get_hull_planes(*hull)
+    depth = -np.max(points @ normals.T - offsets, axis=1)
+    deepest = int(np.argmax(depth))
+
+    return max(0.0, float(depth[deepest])), points[deepest]
+
+
+def evaluate_cluster(co: np.ndarray, tris: np.ndarray):
+    """Returns the convex hull of a cluster of triangles, its concavity and its deepest point."""
+
+    points = co[np.unique(tris)]
+    hull = get_convex_hull(points)
+    if hull is None:
+        return None, 0.0, None
+
+    concavity, deepest = get_concavity(points, hull)
+    return hull, concavity, deepest
+
+
+def split_cluster(co: np.ndarray, tris: np.ndarray, deepest: np.ndarray):
+    """Splits a cluster of triangles in two along the plane that results in the tightest pair of hulls."""
+
+    centroids = co[tris].mean(axis=1)
+    points = co[np.unique(tris)]
+    center = points.mean(axis=0)
+
+    # Cutting along the principal axes through the deepest point separates the parts meeting at a concave edge.
+    axes = np.linalg.eigh(np.cov(points.T))[1].T
+    best = None
+    for axis in axes:
+        for origin in (deepest, center):
+            side = centroids @ axis < origin @ axis
+            if np.all(side) or not np.any(side):
+                continue
+
+            halves = (tris[side], tris[~side])
+            results = [evaluate_cluster(co, half) for half in halves]
+            if any(r[0] is None for r in results):
+                continue
+
+            volume = sum(get_hull_volume(*r[0]) for r in results)
+            if best is None or volume < best[0]:
+                best = (volume, halves, results)
+
+    if best is None:
+        return None
+
+    return list(zip(best[1], best[2]))
+
+
+def grow_hull(points: np.ndarray):
+    """Yields the hulls of a growing subset of the points, each time adding the point furthest outside the last hull."""
+
+    first = int(np.argmax(np.linalg.norm(points - points.mean(axis=0), axis=1)))
+    second = int(np.argmax(np.linalg.norm(points - points[first], axis=1)))
+    line = points[second] - points[first]
+    offsets = points - points[first]
+    third = int(np.argmax(np.linalg.norm(np.cross(offsets, line), axis=1)))
+    fourth = int(np.argmax(np.abs(offsets @ np.cross(line, points[third] - points[first]))))
+    selected = [first, second, third, fourth]
+
+    while True:
+        hull = get_convex_hull(points[selected])
+        if hull is None:
+            return
+        yield hull
+
+        normals, offsets, _ = get_hull_planes(*hull)
+        distances = np.max(points @ normals.T - offsets, axis=1)
+        idx = int(np.argmax(distances))
+        if distances[idx] <= 1e-5:
+            return
+        selected.append(idx)
+
+
+def limit_hull_vertices(hull, max_vertices: int):
+    """Reduces a hull to at most the given number of vertices while still enclosing all of its original vertices."""
+
+    co, tris = hull
+    if len(co) <= max_vertices:
+        return hull
+
+    normals, offsets, _ = get_hull_planes(co, tris)
+    center = co.mean(axis=0)
+    heights = offsets - normals @ center
+    scale = float(np.median(heights))
+    candidates = []
+
+    # Keep only some of the planes: each maps to a point of the dual hull, and a subset of them meets at the corners matching the faces of their dual hull.
+    dual = normals * (scale / heights)[:, None]
+    for dual_hull in grow_hull(dual):
+        dual_normals, dual_offsets, _ = get_hull_planes(*dual_hull)
+
+        # The planes only enclose a volume once their dual hull contains the center.
+        if np.all(dual_offsets > 1e-9):
+            reduced = get_convex_hull(center + dual_normals * (scale / dual_offsets)[:, None])
+            if reduced is not None:
+                if len(reduced[0]) > max_vertices:
+                    break
+                candidates.append(reduced)
+
+    # Alternatively keep the vertices that span the most volume and push the planes between them outward until they enclose the rest.
+    for reduced in grow_hull(co):
+        if len(reduced[0]) > max_vertices:
+            break
+
+        normals, offsets, _ = get_hull_planes(*reduced)
+        origin = reduced[0].mean(axis=0)
+        factor = max(1.0, float(np.max((co - origin) @ normals.T / (offsets - normals @ origin))))
+        candidates.append((origin + (reduced[0] - origin) * factor, reduced[1]))
+
+    if len(candidates) < 1:
+        return hull
+
+    return min(candidates, key=lambda candidate: get_hull_volume(*candidate))
+
+
+def get_convex_decomposition(co: np.ndarray, tris: np.ndarray, max_hulls: int, tolerance: float, max_vertices: int) -> list:
+    """Approximates geometry by up to max_hulls convex hulls, by repeatedly splitting the most concave one. Returns vertices and triangles per hull."""
+
+    if len(tris) < 1:
+        return []
+
+    hull, concavity, deepest = evaluate_cluster(co, tris)
+    if hull is None:
+        return []
+
+    clusters = [(tris, hull, concavity, deepest)]
+    final = []
+
+    while len(clusters) + len(final) < max_hulls and len(clusters) > 0:
+        idx = max(range(len(clusters)), key=lambda i: clusters[i][2])
+        cluster_tris, hull, concavity, deepest = clusters[idx]
+        if concavity <= tolerance:
+            break
+
+        halves = split_cluster(co, cluster_tris, deepest)
+        clusters.pop(idx)
+        if halves is None:
+            final.append(hull)
+            continue
+
+        for half_tris, (half_hull, half_concavity, half_deepest) in halves:
+            clusters.append((half_tris, half_hull, half_concavity, half_deepest))
+
+    hulls = final + [cluster[1] for cluster in clusters]
+
+    return [limit_hull_vertices(hull, max_vertices) for hull in hulls]
+
+
+def get_mesh_volume(co: np.ndarray, tris: np.ndarray) -> float:
+    corners = co[tris]
+
+    return abs(float(np.einsum('ij,ij->i', corners[:, 0], np.cross(corners[:, 1], corners[:, 2])).sum())) / 6
+
+
+def get_principal_axes(points: np.ndarray):
+    """Returns the center of a set of points and its principal axes as columns of a right-handed rotation matrix."""
+
+    center = points.mean(axis=0)
+    axes = np.linalg.eigh(np.cov((points - center).T))[1]
+    if np.linalg.det(axes) < 0:
+        axes[:, 2] *= -1
+
+    return center, axes
+
+
+def get_orthonormal_axes(first: np.ndarray, second: np.ndarray):
+    """Returns a right-handed rotation matrix whose first axis points along first and whose second lies in the plane of both, None if they are parallel."""
+
+    x = first / np.linalg.norm(first)
+    y = second - x * (x @ second)
+    if np.linalg.norm(y) < 1e-6:
+        return None
+    y /= np.linalg.norm(y)
+
+    return np.column_stack((x, y, np.cross(x, y)))
+
+
+def get_candidate_axes(co: np.ndarray, tris: np.ndarray, principal_axes: np.ndarray, object_axes: np.ndarray = None) -> list:
+    """Returns the orientations a box is fitted in. Principal axes are arbitrary for cubes and square cross-sections,
+    so the object's and world axes, as well as frames spanned by the largest flat sides of the mesh, are tried too."""
+
+    candidates = [principal_axes, np.identity(3)]
+
+    if object_axes is not None:
+        axes = get_orthonormal_axes(object_axes[:, 0], object_axes[:, 1])
+        if axes is not None:
+            candidates.append(axes)
+
+    corners = co[tris]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = np.linalg.norm(normals, axis=1)
+    valid = areas > 1e-12
+    if np.count_nonzero(valid) > 0:
+        normals = normals[valid] / areas[valid, None]
+        # Opposite sides of a box share their axis, so normals are compared regardless of their sign.
+        first = np.argmax(np.abs(normals) > 1e-6, axis=1)
+        normals *= np.where(normals[np.arange(len(normals)), first] < 0, -1, 1)[:, None]
+        inverse = np.unique(np.round(normals, 3), axis=0, return_inverse=True)[1].reshape(-1)
+        side_areas = np.bincount(inverse, weights=areas[valid])
+        # Rounding only groups the faces, each side's axis is the area-weighted mean of its exact normals.
+        side_normals = np.column_stack([np.bincount(inverse, weights=normals[:, k] * areas[valid]) for k in range(3)])
+        sides = [side_normals[idx] for idx in np.argsort(side_areas)[::-1][:4]]
+
+        for idx, first_side in enumerate(sides):
+            for second_side in sides[idx + 1:]:
+                if abs(first_side @ second_side) < 0.1 * np.linalg.norm(first_side) * np.linalg.norm(second_side):
+                    axes = get_orthonormal_axes(first_side, second_side)
+                    if axes is not None:
+                        candidates.append(axes)
+
+    return candidates
+
+
+def get_frame(axes: np.ndarray, origin: np.ndarray) -> np.ndarray:
+    frame = np.identity(4)
+    frame[:3, :3] = axes
+    frame[:3, 3] = origin
+
+    return frame
+
+
+def fit_circle(points: np.ndarray):
+    """Least-squares circle through 2D points. Returns center and radius."""
+
+    a = np.column_stack((2 * points, np.ones(len(points))))
+    b = np.sum(points ** 2, axis=1)
+    solution = np.linalg.lstsq(a, b, rcond=None)[0]
+    center = solution[:2]
+
+    return center, np.sqrt(max(0.0, solution[2] + center @ center))
+
+
+def fit_sphere(points: np.ndarray) -> dict:
+    a = np.column_stack((2 * points, np.ones(len(points))))
+    b = np.sum(points ** 2, axis=1)
+    solution = np.linalg.lstsq(a, b, rcond=None)[0]
+    center = solution[:3]
+    radius = np.sqrt(max(0.0, solution[3] + center @ center))
+
+    return {
+        'shape': 'SPHERE',
+        'matrix': get_frame(np.identity(3), center),
+        'error': float(np.max(np.abs(np.linalg.norm(points - center, axis=1) - radius))),
+        'volume': 4 / 3 * np.pi * radius ** 3
+    }
+
+
+def fit_box(points: np.ndarray, center: np.ndarray, candidates: list) -> dict:
+    """Fits a box in each of the candidate orientations and returns the closest fit, the smaller one if equally close."""
+
+    best = None
+    for axes in candidates:
+        fit = fit_box_axes(points, center, axes)
+        if best is None or (fit['error'], fit['volume']) < (best['error'] - 1e-6, best['volume']):
+            best = fit
+
+    return best
+
+
+def fit_box_axes(points: np.ndarray, center: np.ndarray, axes: np.ndarray) -> dict:
+    local = (points - center) @ axes
+    low, high = local.min(axis=0), local.max(axis=0)
+    middle = (low + high) / 2
+    half = (high - low) / 2
+
+    q = np.abs(local - middle) - half
+    distance = np.linalg.norm(np.maximum(q, 0), axis=1) + np.minimum(q.max(axis=1), 0)
+
+    return {
+        'shape': 'BOX',
+        'matrix': get_frame(axes, center + axes @ middle),
+        'error': float(np.max(np.abs(distance))),
+        'volume': float(np.prod(2 * half))
+    }
+
+
+def fit_round_shape(points: np.ndarray, center: np.ndarray, axes: np.ndarray, shape: str) -> dict:
+    """Fits a cylinder or capsule along each principal axis and returns the closest fit."""
+
+    best = None
+    for k in range(3):
+        # The shape's axis becomes the local Z axis.
+        frame_axes = np.roll(axes, 2 - k, axis=1)
+        local = (points - center) @ frame_axes
+        t = local[:, 2]
+        t_mid = (t.min() + t.max()) / 2
+        height = t.max() - t.min()
+
+        if shape == 'CAPSULE':
+            # The rounded ends would distort the radius, so it is only fitted to the middle section.
+            band = np.abs(t - t_mid) <= height / 4
+            if np.count_nonzero(band) < 3:
+                continue
+            circle_center, radius = fit_circle(local[band, :2])
+            half_length = height / 2 - radius
+            if half_length < 0:
+                continue
+
+            axial = np.clip(t - t_mid, -half_length, half_length)
+            offset = local - np.column_stack((np.tile(circle_center, (len(local), 1)), axial + t_mid))
+            distance = np.linalg.norm(offset, axis=1) - radius
+            volume = np.pi * radius ** 2 * 2 * half_length + 4 / 3 * np.pi * radius ** 3
+
+        else:
+            circle_center, radius = fit_circle(local[:, :2])
+            radial = np.linalg.norm(local[:, :2] - circle_center, axis=1) - radius
+            axial = np.abs(t - t_mid) - height / 2
+            outside = np.sqrt(np.maximum(radial, 0) ** 2 + np.maximum(axial, 0) ** 2)
+            distance = outside + np.minimum(np.maximum(radial, axial), 0)
+            volume = np.pi * radius ** 2 * height
+
+        error = float(np.max(np.abs(distance)))
+        if best is None or error < best['error']:
+            origin = center + frame_axes @ np.array([circle_center[0], circle_center[1], t_mid])
+            best = {'shape': shape, 'matrix': get_frame(frame_axes, origin), 'error': error, 'volume': volume}
+
+    return best
+
+
+def get_primitive_fit(co: np.ndarray, tris: np.ndarray, tolerance: float, volume_tolerance: float = 0.1, object_axes: np.ndarray = None):
+    """Returns the cheapest primitive shape that matches the surface of a mesh within tolerance, None if none does."""
+
+    if len(tris) < 1:
+        return None
+
+    points = get_surface_samples(co, tris)
+    center, axes = get_principal_axes(points)
+    mesh_volume = get_mesh_volume(co, tris)
+
+    fits = {
+        'SPHERE': fit_sphere(points),
+        'CAPSULE': fit_round_shape(points, center, axes, 'CAPSULE'),
+        'BOX': fit_box(points, center, get_candidate_axes(co, tris, axes, object_axes)),
+        'CYLINDER': fit_round_shape(points, center, axes, 'CYLINDER')
+    }
+
+    for shape in primitive_shapes:
+        fit = fits[shape]
+        if fit is None or fit['error'] > tolerance:
+            continue
+
+        # The surface being close to the shape does not mean it covers all of it, e.g. half a cylinder.
+        if mesh_volume > 0 and abs(mesh_volume - fit['volume']) > volume_tolerance * fit['volume']:
+            continue
+
+        return fit
+
+    return None
+
+
+def apply_primitive_fit(obj, fit: dict):
+    """Moves the origin and axes of an object onto the fitted shape without moving its geometry, then switches it to that shape."""
+
+    frame = Matrix(fit['matrix'].tolist())
+    obj.data.transform(frame.inverted() @ obj.matrix_world)
+    obj.matrix_world = frame
+    obj.seut.collision_shape = fit['shape']
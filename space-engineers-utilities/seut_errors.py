@@ -3,8 +3,7 @@ import sys
 import io
 import os
 import time
-
-from mathutils  import Vector
+import numpy as np
 
 
 log = io.StringIO()
@@ -58,6 +57,15 @@ errors = {
     'E045': "Model path must be located within the Mod's directory ('{variable_1}').",
     'E046': "Could not convert '{variable_1}'-texture of material '{variable_2}' to DDS.\n{variable_3}",
     'E047': "An access violation error occurred during Havok conversion.",
+    'E048': "Scene '{variable_1}' contains no geometry to fit the bounding box to.",
+    'E049': "MWM file '{variable_1}' could not be written: {variable_2}",
+    'E050': "MWM file '{variable_1}' could not be read: {variable_2}",
+    'E051': "Export cancelled: Validation found {variable_1} error(s). See the SEUT issue list for details.",
+    'E052': "MWM files could not be moved to '{variable_1}': {variable_2}",
+    'E053': "Generating LOD{variable_2} of collection '{variable_1}' failed in the background Blender instance (exit code {variable_3}).",
+    'E054': "Statistics could not be written to '{variable_1}': {variable_2}",
+    'E055': "Collection '{variable_1}' does not use at least two materials that can be combined into a texture atlas.",
+    'E056': "Generating LOD{variable_2} of collection '{variable_1}' was stopped after {variable_3}s in the background Blender instance.",
 }
 
 warnings = {
@@ -74,6 +82,18 @@ warnings = {
     'W011': "Loading of image '{variable_1}' failed.",
     'W012': "Material '{variable_1}' is a DLC material. Keen requires any model using it to be DLC-locked.",
     'W013': "Object '{variable_1}' has no geometry.",
+    'W014': "No geometry of collection '{variable_1}' lies on the faces of the bounding box. No Mountpoint Areas were generated.",
+    'W015': "Geometry of scene '{variable_1}' sticks out of its bounding box ({variable_2}). Required size: {variable_3}.",
+    'W016': "Icon of scene '{variable_1}' could not be rendered to '{variable_2}'.",
+    'W017': "Object '{variable_1}' has faces without a material. They were not written to the MWM.",
+    'W018': "MWM '{variable_1}': {variable_2}",
+    'W019': "Collection '{variable_1}' contains no geometry to generate collision from.",
+    'W020': "Neither Main nor any Build Stage contain geometry to generate LODs from.",
+    'W021': "Object '{variable_1}' has modifiers and was skipped. Hidden faces can only be culled on meshes without modifiers.",
+    'W022': "Material '{variable_1}' can't be added to the texture atlas: {variable_2}.",
+    'W023': "References in '{variable_1}' could not be rewritten: {variable_2}",
+    'W024': "Inspection found {variable_1} issue(s) in {variable_2} exported MWM file(s). See the SEUT issue list for details.",
+    'W025': "LOD generation cancelled. No LOD collections were changed.",
 }
 
 infos = {
@@ -99,6 +119,27 @@ infos = {
     'I020': "Material '{variable_1}' was skipped because it already exists in the BLEND file.",
     'I021': "{variable_1} of {variable_2} files successfully imported. Refer to Blender System Console for details.",
     'I022': "Successfully exported log to '{variable_1}'.",
+    'I023': "MaterialsLib import timings - Parsing: {variable_1}s, Images: {variable_2}, Materials: {variable_3}.",
+    'I024': "{variable_1} Mountpoint Areas generated from geometry of collection '{variable_2}'.",
+    'I025': "Bounding box of scene '{variable_1}' set to {variable_2}.",
+    'I026': "{variable_1} icons rendered, {variable_2} skipped because they are unchanged ({variable_3}s).",
+    'I027': "Imported '{variable_1}' ({variable_2} triangles) in {variable_3}s.",
+    'I028': "Inspected {variable_1} MWM files in {variable_2}s, {variable_3} issues found.",
+    'I029': "Validated {variable_1} scenes in {variable_2}s: {variable_3}.",
+    'I030': "Temporary files of scene '{variable_1}' have been kept in '{variable_2}'.",
+    'I031': "Collision of collection '{variable_1}' is unchanged, reused cached HKT.",
+    'I032': "{variable_1} convex hulls generated in collection '{variable_2}' ({variable_3}s).",
+    'I033': "{variable_1} of {variable_2} collision objects switched to primitive shapes.",
+    'I034': "{variable_1} LOD collections generated in {variable_2}s.",
+    'I035': "LOD collection '{variable_1}' deviates up to {variable_2} m from its reference. Recommended distance: {variable_3} m.",
+    'I036': "Statistics of {variable_1} scene(s) exported to '{variable_2}'.",
+    'I037': "Mesh '{variable_1}' reordered for the vertex cache: ACMR {variable_2} -> {variable_3}.",
+    'I038': "{variable_1} of {variable_2} faces in collection '{variable_3}' are hidden.",
+    'I039': "Objects of collection '{variable_1}' merged by material: {variable_2} draw calls reduced to {variable_3}.",
+    'I040': "{variable_1} materials packed into a {variable_2} texture atlas, material '{variable_3}'.",
+    'I041': "{variable_1} textures of the mod use {variable_2} video memory and {variable_3} disk space. Details written to 'SEUT_TextureBudget.json' in the mod folder.",
+    'I042': "{variable_1} unreferenced files and {variable_2} groups of duplicate files found, using {variable_3}. Details written to 'SEUT_AssetAudit.json' in the mod folder.",
+    'I043': "{variable_1} references to duplicate files rewritten in {variable_2} files.",
 }
 
 
@@ -106,32 +147,44 @@ def check_export(self, context, can_report=True):
     """Basic check for export path and SubtypeId existing."""
 
     scene = context.scene
-    path = get_abs_path(scene.seut.export_exportPath)
 
     # If file is still startup file (hasn't been saved yet), it's not possible to derive a path from it.
     if not bpy.data.is_saved:
         seut_report(self, context, 'ERROR', can_report, 'E008')
         return {'CANCELLED'}
 
-    elif path == "":
-        seut_report(self, context, 'ERROR', can_report, 'E019', "Export", scene.name)
-        return {'CANCELLED'}
-    
-    if not path.startswith(get_abs_path(scene.seut.mod_path)):
-        seut_report(self, context, 'ERROR', can_report, 'E045', get_abs_path(scene.seut.mod_path))
+    if report_issues(self, context, get_path_issues(scene), can_report):
         return {'CANCELLED'}
 
-    if path.find("Models\\") != -1 or (path + "\\").find("Models\\") != -1:
-        pass
-    else:
-        seut_report(self, context, 'ERROR', can_report, 'E014', path, scene.name)
-        return {'CANCELLED'}
+    return {'CONTINUE'}
+
+
+def get_path_issues(scene) -> list:
+    """Returns the issues with the export path and SubtypeId of a scene, which does not need to be the active one"""
+
+    issues = []
+    path = get_abs_path(scene.seut.export_exportPath)
+
+    if scene.seut.export_exportPath == "":
+        issues.append(('ERROR', 'E019', "Export", scene.name))
+    elif not path.startswith(get_abs_path(scene.seut.mod_path)):
+        issues.append(('ERROR', 'E045', get_abs_path(scene.seut.mod_path)))
+    elif path.find("Models\\") == -1 and (path + "\\").find("Models\\") == -1:
+        issues.append(('ERROR', 'E014', path, scene.name))
 
     if scene.seut.subtypeId == "":
-        seut_report(self, context, 'ERROR', can_report, 'E004', scene.name)
-        return {'CANCELLED'}
+        issues.append(('ERROR', 'E004', scene.name))
+
+    return issues
 
-    return {'CONTINUE'}
+
+def report_issues(self, context, issues: list, can_report=True) -> bool:
+    """Reports a list of issues of the form (type, code, variables...). Returns whether any of them is an error"""
+
+    for issue in issues:
+        seut_report(self, context, issue[0], can_report, *issue[1:])
+
+    return any(issue[0] == 'ERROR' for issue in issues)
 
 
 def check_collection(self, context, scene, collection, partial_check=True):
@@ -191,31 +244,35 @@ def check_uvms(self, context, obj):
     """Checks whether object has UV layers"""
 
     if obj is not None and obj.type == 'MESH':
-    
-        if len(obj.data.uv_layers) < 1:
-            seut_report(self, context, 'ERROR', True, 'E032', obj.name)
+        if report_issues(self, context, get_uv_issues(obj)):
             return {'CANCELLED'}
-
-        at_zero = 0
-        obj_total = len(obj.data.uv_layers.active.data)
-        for loop in obj.data.loops:
-            uv = obj.data.uv_layers.active.data[loop.index].uv
-            if uv == Vector((0.0, 0.0)):
-                at_zero += 1
-        
-        if obj_total <= 0:
-            seut_report(self, context, 'WARNING', False, 'W013', obj.name)
-            return {'CONTINUE'}
-
-        if (at_zero / obj_total) > 0.25 and at_zero > 10:
-            seut_report(self, context, 'ERROR', True, 'E042', obj.name, at_zero, obj_total)
-            return {'CANCELLED'}
-        elif (at_zero / obj_total) > 0.005 and at_zero > 10:
-            seut_report(self, context, 'WARNING', True, 'W002', obj.name)
     
     return {'CONTINUE'}
 
 
+def get_uv_issues(obj) -> list:
+    """Returns the issues with the UV map of a mesh object: missing entirely, or too many UVs left at the origin"""
+
+    if len(obj.data.uv_layers) < 1:
+        return [('ERROR', 'E032', obj.name)]
+
+    uv_data = obj.data.uv_layers.active.data
+    obj_total = len(uv_data)
+    if obj_total <= 0:
+        return [('WARNING', 'W013', obj.name)]
+
+    uvs = np.empty(obj_total * 2, dtype=np.float32)
+    uv_data.foreach_get('uv', uvs)
+    at_zero = int(np.count_nonzero(np.all(uvs.reshape(-1, 2) == 0.0, axis=1)))
+
+    if (at_zero / obj_total) > 0.25 and at_zero > 10:
+        return [('ERROR', 'E042', obj.name, at_zero, obj_total)]
+    elif (at_zero / obj_total) > 0.005 and at_zero > 10:
+        return [('WARNING', 'W002', obj.name)]
+
+    return []
+
+
 def get_abs_path(path: str) -> str:
     """Returns the absolute path"""
     return os.path.abspath(bpy.path.abspath(path))
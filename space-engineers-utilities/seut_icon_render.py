@@ -1,14 +1,29 @@
 import bpy
 import os
+import sys
+import time
+import hashlib
+import tempfile
+import numpy as np
 
 from math           import pi
 from bpy.types      import Operator
+from bpy.props      import IntProperty, BoolProperty
 
-from .materials.seut_ot_texture_conversion  import convert_texture
+from .materials.seut_ot_texture_conversion  import convert_texture, get_conversion_args
 from .seut_collections                      import get_collections, create_seut_collection
 from .seut_errors                           import check_collection, check_collection_excluded, seut_report, get_abs_path
 from .seut_utils                            import to_radians, clear_selection, prep_context, seut_report
-    
+from .utils.seut_tool_utils                 import call_tool_threaded
+
+
+# Name, type, location, rotation (degrees) and energy (at a render distance of 1) of the lights of the icon render rig.
+icon_lights = [
+    ('Key Light', 'POINT', (-12.5, -12.5, 5.0), (0.0, 0.0, 0.0), 7500.0),
+    ('Fill Light', 'POINT', (10.0, -10.0, -2.5), (0.0, 0.0, 0.0), 5000.0),
+    ('Rim Light', 'SPOT', (0.0, 15.0, 0.0), (-90.0, 0.0, 0.0), 10000.0)
+]
+
 
 def setup_icon_render(self, context):
     """Sets up render utilities"""
@@ -32,65 +47,52 @@ def setup_icon_render(self, context):
     if scene.render.filepath == '/tmp\\':
         scene.render.filepath = '//'
 
-    # Spawn holder empty
-    bpy.ops.object.add(type='EMPTY', location=scene.seut.renderEmptyLocation, rotation=scene.seut.renderEmptyRotation)
-    empty = bpy.context.view_layer.objects.active
-    empty.scale.x = scene.seut.renderDistance
-    empty.scale.y = scene.seut.renderDistance
-    empty.scale.z = scene.seut.renderDistance
-    empty.name = 'Icon Render'
+    create_icon_rig(scene, collection)
+    create_icon_compositor(scene)
+
+    # Force update render resolution
+    scene.seut.renderResolution = scene.seut.renderResolution
+    scene.render.engine = 'BLENDER_EEVEE'
+    scene.render.film_transparent = True
+
+    clear_selection(context)
+    context.area.type = current_area
+
+
+def create_icon_rig(scene, collection):
+    """Creates the empty holding the camera and lights for icon renders in the given collection"""
+
+    empty = bpy.data.objects.new('Icon Render', None)
+    empty.location = scene.seut.renderEmptyLocation
+    empty.rotation_euler = scene.seut.renderEmptyRotation
+    empty.scale = (scene.seut.renderDistance, scene.seut.renderDistance, scene.seut.renderDistance)
     empty.empty_display_type = 'SPHERE'
-    
-    # Spawn camera
-    bpy.ops.object.camera_add(location=(0.0, -15, 0.0), rotation=(to_radians(90), 0.0, 0.0))
-    camera = bpy.context.view_layer.objects.active
+    collection.objects.link(empty)
+
+    camera_data = bpy.data.cameras.new('ICON')
+    camera_data.lens = scene.seut.renderZoom
+    camera = bpy.data.objects.new('ICON', camera_data)
+    camera.location = (0.0, -15, 0.0)
+    camera.rotation_euler = (to_radians(90), 0.0, 0.0)
     camera.parent = empty
+    collection.objects.link(camera)
     scene.camera = camera
-    camera.name = 'ICON'
-    camera.data.name = 'ICON'
-    camera.data.lens = scene.seut.renderZoom
-
-    # Spawn lights
-    bpy.ops.object.light_add(type='POINT', location=(-12.5, -12.5, 5.0), rotation=(0.0, 0.0, 0.0))
-    key_light = bpy.context.view_layer.objects.active
-    key_light.parent = empty
-    key_light.name = 'Key Light'
-    key_light.data.energy = 7500.0 * scene.seut.renderDistance
-    
-    bpy.ops.object.light_add(type='POINT', location=(10.0, -10.0, -2.5), rotation=(0.0, 0.0, 0.0))
-    fill_light = bpy.context.view_layer.objects.active
-    fill_light.parent = empty
-    fill_light.name = 'Fill Light'
-    fill_light.data.energy = 5000.0 * scene.seut.renderDistance
-    
-    bpy.ops.object.light_add(type='SPOT', location=(0.0, 15.0, 0.0), rotation=(to_radians(-90), 0.0, 0.0))
-    rim_light = bpy.context.view_layer.objects.active
-    rim_light.parent = empty
-    rim_light.name = 'Rim Light'
-    rim_light.data.energy = 10000.0 * scene.seut.renderDistance
-    
-    parent_collection = empty.users_collection[0]
-    if parent_collection != collection:
-        collection.objects.link(empty)
-        collection.objects.link(camera)
-        collection.objects.link(key_light)
-        collection.objects.link(fill_light)
-        collection.objects.link(rim_light)
-
-        if parent_collection is None:
-            scene.collection.objects.unlink(empty)
-            scene.collection.objects.unlink(camera)
-            scene.collection.objects.unlink(key_light)
-            scene.collection.objects.unlink(fill_light)
-            scene.collection.objects.unlink(rim_light)
-        else:
-            parent_collection.objects.unlink(empty)
-            parent_collection.objects.unlink(camera)
-            parent_collection.objects.unlink(key_light)
-            parent_collection.objects.unlink(fill_light)
-            parent_collection.objects.unlink(rim_light)
-
-    # Spawn compositor node tree
+
+    for name, light_type, location, rotation, energy in icon_lights:
+        light_data = bpy.data.lights.new(name, type=light_type)
+        light_data.energy = energy * scene.seut.renderDistance
+        light = bpy.data.objects.new(name, light_data)
+        light.location = location
+        light.rotation_euler = (to_radians(rotation[0]), to_radians(rotation[1]), to_radians(rotation[2]))
+        light.parent = empty
+        collection.objects.link(light)
+
+    return empty
+
+
+def create_icon_compositor(scene):
+    """Creates the compositor node tree that gives icons their look"""
+
     scene.use_nodes = True
     tree = scene.node_tree
     tree.nodes.clear()
@@ -103,6 +105,7 @@ def setup_icon_render(self, context):
     node_mix_rgb = tree.nodes.new(type='CompositorNodeMixRGB')
     node_bright_contrast = tree.nodes.new(type='CompositorNodeBrightContrast')
     node_viewer = tree.nodes.new(type='CompositorNodeViewer')
+    node_composite = tree.nodes.new(type='CompositorNodeComposite')
 
     node_render_layers.location = (-860.0, 300.0)
     node_color_correction.location = (-460.0, 300.0)
@@ -112,6 +115,7 @@ def setup_icon_render(self, context):
     node_mix_rgb.location = (460.0, 300.0)
     node_bright_contrast.location = (720.0, 300.0)
     node_viewer.location = (1000.0, 300.0)
+    node_composite.location = (1000.0, 100.0)
 
     tree.links.new(node_render_layers.outputs[0], node_color_correction.inputs[0])
     tree.links.new(node_color_correction.outputs[0], node_rgb_to_bw.inputs[0])
@@ -123,6 +127,8 @@ def setup_icon_render(self, context):
     tree.links.new(node_rgb.outputs[0], node_mix_rgb.inputs[2])
     tree.links.new(node_mix_rgb.outputs[0], node_bright_contrast.inputs[0])
     tree.links.new(node_bright_contrast.outputs[0], node_viewer.inputs[0])
+    # Background renders cannot access the Viewer Node and write the composite output instead.
+    tree.links.new(node_bright_contrast.outputs[0], node_composite.inputs[0])
 
     node_color_correction.midtones_gain = 2.0
     node_color_correction.shadows_gain = 2.5
@@ -134,17 +140,9 @@ def setup_icon_render(self, context):
     node_bright_contrast.inputs[1].default_value = 0.35
     node_bright_contrast.inputs[2].default_value = 0.35
     
-    scene.node_tree.nodes['RGB'].mute = scene.seut.renderColorOverlay
-    scene.node_tree.nodes['RGB to BW'].mute = scene.seut.renderColorOverlay
-    scene.node_tree.nodes['Combine RGBA'].mute = scene.seut.renderColorOverlay
-
-    # Force update render resolution
-    scene.seut.renderResolution = scene.seut.renderResolution
-    scene.render.engine = 'BLENDER_EEVEE'
-    scene.render.film_transparent = True
-
-    clear_selection(context)
-    context.area.type = current_area
+    node_rgb.mute = scene.seut.renderColorOverlay
+    node_rgb_to_bw.mute = scene.seut.renderColorOverlay
+    node_combine_rgba.mute = scene.seut.renderColorOverlay
 
 
 def clean_icon_render(self, context):
@@ -291,4 +289,282 @@ class SEUT_OT_CopyRenderOptions(Operator):
         
         seut_report(self, context, 'INFO', True, 'I006', "Icon Render")
 
-        return {'FINISHED'}
\ No newline at end of file
+        return {'FINISHED'}
+
+class SEUT_OT_IconRenderBatch(Operator):
+    """Renders the icons of all SEUT scenes in parallel background processes and converts them in one pass.\nIcons of unchanged models are skipped"""
+    bl_idname = "scene.icon_render_batch"
+    bl_label = "Render All Icons"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    process_count: IntProperty(
+        name="Processes",
+        description="The number of Blender instances rendering icons in parallel",
+        default=4,
+        min=1,
+        max=16
+    )
+    force: BoolProperty(
+        name="Force",
+        description="Render all icons, even if their models and render options have not changed",
+        default=False
+    )
+
+
+    def execute(self, context):
+
+        if not bpy.data.is_saved:
+            seut_report(self, context, 'ERROR', True, 'E008')
+            return {'CANCELLED'}
+
+        timer = time.time()
+        jobs = []
+        skipped = 0
+
+        for scn in bpy.data.scenes:
+            if scn.seut.sceneType != 'mainScene' or not 'SEUT' in scn.view_layers or scn.seut.subtypeId == "":
+                continue
+
+            output_type = scn.seut.render_output_type.lower()
+            target = os.path.join(get_abs_path(scn.render.filepath), scn.seut.subtypeId + '.' + output_type)
+            icon_hash = get_icon_hash(scn)
+
+            if not self.force and scn.seut.render_hash == icon_hash and os.path.exists(target):
+                skipped += 1
+                continue
+
+            # DDS icons are rendered to PNG first and converted afterwards.
+            if output_type == 'dds':
+                render_path = os.path.splitext(target)[0] + '.png'
+            else:
+                render_path = target
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            jobs.append((scn, render_path, target, icon_hash))
+
+        if len(jobs) < 1:
+            seut_report(self, context, 'INFO', True, 'I026', 0, skipped, round(time.time() - timer, 1))
+            return {'FINISHED'}
+
+        # The background processes work on a copy so unsaved changes are rendered and the open file stays untouched.
+        blend_path = os.path.join(tempfile.gettempdir(), f"seut_icon_render_{os.getpid()}.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+
+        package = __package__
+        expression = f"import addon_utils, importlib; addon_utils.enable('{package}', default_set=False); importlib.import_module('{package}.seut_icon_render').render_icon_worker()"
+
+        commands = []
+        for scn, render_path, target, icon_hash in jobs:
+            commands.append([bpy.app.binary_path, '-b', blend_path, '--python-expr', expression, '--', scn.name, render_path])
+
+        call_tool_threaded(commands, self.process_count)
+
+        try:
+            os.remove(blend_path)
+        except OSError:
+            pass
+
+        commands = []
+        for scn, render_path, target, icon_hash in jobs:
+            if render_path != target and os.path.exists(render_path):
+                commands.append(get_conversion_args('icon', render_path, os.path.dirname(target)))
+
+        if len(commands) > 0:
+            call_tool_threaded(commands, 10)
+
+        rendered = 0
+        for scn, render_path, target, icon_hash in jobs:
+            if render_path != target and os.path.exists(render_path):
+                converted = os.path.splitext(target)[0] + '.DDS'
+                if os.path.exists(converted):
+                    os.rename(converted, target)
+                os.remove(render_path)
+
+            if os.path.exists(target) and os.path.getmtime(target) >= timer:
+                scn.seut.render_hash = icon_hash
+                rendered += 1
+            else:
+                seut_report(self, context, 'WARNING', False, 'W016', scn.name, target)
+
+        seut_report(self, context, 'INFO', True, 'I026', rendered, skipped, round(time.time() - timer, 1))
+
+        return {'FINISHED'}
+
+
+def get_icon_hash(scene) -> str:
+    """Returns a hash of everything that affects the icon of a scene: the evaluated objects of its Main collection, their materials and its icon render options"""
+
+    md5 = hashlib.md5()
+
+    options = (
+        scene.seut.subtypeId,
+        scene.seut.render_output_type,
+        scene.seut.renderColorOverlay,
+        scene.seut.renderResolution,
+        tuple(scene.seut.renderEmptyRotation),
+        tuple(scene.seut.renderEmptyLocation),
+        scene.seut.renderZoom,
+        scene.seut.renderDistance
+    )
+    md5.update(repr(options).encode())
+
+    collections = get_collections(scene)
+    if collections['main'] is None:
+        return md5.hexdigest()
+
+    depsgraph = scene.view_layers['SEUT'].depsgraph
+    depsgraph.update()
+
+    materials = set()
+    for obj in sorted(collections['main'][0].all_objects, key=lambda o: o.name):
+        hash_object(md5, obj, depsgraph, materials, set())
+
+    for material in sorted(materials, key=lambda m: m.name):
+        hash_material(md5, material)
+
+    return md5.hexdigest()
+
+
+def get_rna_values(struct) -> list:
+    """Returns the values of all properties of a Blender struct, with ID pointers replaced by their names"""
+
+    values = []
+    for prop in struct.bl_rna.properties:
+        if prop.identifier == 'rna_type' or prop.type == 'COLLECTION':
+            continue
+
+        value = getattr(struct, prop.identifier, None)
+        if prop.type == 'POINTER':
+            value = getattr(value, 'name', None)
+        elif getattr(prop, 'is_array', False):
+            value = tuple(value)
+
+        values.append((prop.identifier, value))
+
+    return values
+
+
+def hash_object(md5, obj, depsgraph, materials: set, visited: set):
+    """Adds an object to the hash through its evaluated mesh and modifier settings. Collections it instances are added recursively"""
+
+    md5.update(obj.name.encode())
+    md5.update(np.array(obj.matrix_world, dtype=np.float32).tobytes())
+    md5.update(repr([get_rna_values(mod) for mod in obj.modifiers]).encode())
+
+    for slot in obj.material_slots:
+        if slot.material is not None:
+            materials.add(slot.material)
+            md5.update(slot.material.name.encode())
+
+    if obj.instance_type == 'COLLECTION' and obj.instance_collection is not None and obj.instance_collection not in visited:
+        visited.add(obj.instance_collection)
+        md5.update(obj.instance_collection.name.encode())
+        for child in sorted(obj.instance_collection.all_objects, key=lambda o: o.name):
+            hash_object(md5, child, depsgraph, materials, visited)
+
+    if obj.type != 'MESH':
+        return
+
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    md5.update(co.tobytes())
+    indices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', indices)
+    md5.update(indices.tobytes())
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', material_indices)
+    md5.update(material_indices.tobytes())
+
+    if mesh.uv_layers.active is not None:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get('uv', uvs)
+        md5.update(uvs.tobytes())
+
+    obj_eval.to_mesh_clear()
+
+
+def hash_material(md5, material):
+    """Adds a material to the hash through its node settings and the files of its images"""
+
+    md5.update(material.name.encode())
+    md5.update(repr(get_rna_values(material.seut)).encode())
+
+    if material.node_tree is None:
+        return
+
+    for node in sorted(material.node_tree.nodes, key=lambda n: n.name):
+        md5.update(node.name.encode())
+        md5.update(node.bl_idname.encode())
+        for socket in node.inputs:
+            if hasattr(socket, 'default_value'):
+                value = socket.default_value
+                md5.update(repr(tuple(value) if hasattr(value, '__len__') else value).encode())
+
+        if node.type == 'TEX_IMAGE' and node.image is not None:
+            hash_image(md5, node.image)
+
+    md5.update(repr(sorted((link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier) for link in material.node_tree.links)).encode())
+
+
+def hash_image(md5, image):
+    """Adds an image to the hash through its file and its modification time, as its pixels are not loaded"""
+
+    md5.update(repr((image.name, image.source, image.colorspace_settings.name)).encode())
+
+    if image.packed_file is not None:
+        md5.update(repr(image.packed_file.size).encode())
+    elif image.source == 'FILE' and image.filepath != "":
+        path = bpy.path.abspath(image.filepath, library=image.library)
+        md5.update(path.encode())
+        if os.path.exists(path):
+            md5.update(repr((os.path.getmtime(path), os.path.getsize(path))).encode())
+
+
+def render_icon_worker():
+    """Renders the icon of a single scene. Entry point of the background processes started by the batch icon render"""
+
+    argv = sys.argv[sys.argv.index('--') + 1:]
+    scene = bpy.data.scenes[argv[0]]
+    render_path = argv[1]
+
+    collections = get_collections(scene)
+
+    # If Icon Render Mode was active when the file was copied, its rig is reused.
+    if collections['render'] is None:
+        collection = create_seut_collection(scene, 'render')
+        create_icon_rig(scene, collection)
+        create_icon_compositor(scene)
+        collections = get_collections(scene)
+    else:
+        for obj in collections['render'][0].objects:
+            if obj.type == 'CAMERA':
+                scene.camera = obj
+        if scene.node_tree is None or not any(node.type == 'COMPOSITE' for node in scene.node_tree.nodes):
+            create_icon_compositor(scene)
+
+    # Only Main is part of the icon. Scene modes are not switched off in the copy, so the collections of Mountpoint and Mirroring Mode are hidden as well.
+    for key, cols in get_collections(scene, inclusive=True).items():
+        if key in ['seut', 'main', 'render'] or cols is None:
+            continue
+        for col in cols:
+            col.hide_render = True
+
+    scene.render.resolution_x = scene.seut.renderResolution
+    scene.render.resolution_y = scene.seut.renderResolution
+    scene.render.resolution_percentage = 100
+    scene.render.engine = 'BLENDER_EEVEE'
+    scene.render.film_transparent = True
+    scene.render.use_compositing = True
+    scene.render.image_settings.color_mode = 'RGBA'
+
+    if render_path.lower().endswith('.tif'):
+        scene.render.image_settings.file_format = 'TIFF'
+    else:
+        scene.render.image_settings.file_format = 'PNG'
+
+    scene.render.filepath = render_path
+    bpy.ops.render.render(write_still=True, scene=scene.name)
@@ -0,0 +1,983 @@
+import bpy
+import bmesh
+import os
+import json
+import math
+import time
+import shutil
+import tempfile
+import subprocess
+
+import numpy as np
+
+from bpy.types      import Operator
+from bpy.props      import EnumProperty, IntProperty, IntVectorProperty, FloatProperty, BoolProperty
+from mathutils      import bvhtree, Vector
+
+from .export.seut_export_staging    import get_staging_root
+from .utils.seut_mesh_utils         import get_mesh_objects, get_collection_triangles, get_surface_samples, transform_points, get_matrix_array
+from .seut_bbox                     import get_grid_size
+from .seut_collections              import get_collections, get_cols_by_type, create_seut_collection, sort_collections
+from .seut_errors                   import check_collection, seut_report
+
+
+class SEUT_OT_GenerateLODs(Operator):
+    """Generates LOD collections for Main and all Build Stages by decimating their geometry"""
+    bl_idname = "scene.generate_lods"
+    bl_label = "Generate LODs"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    mode: EnumProperty(
+        name="Mode",
+        items=(
+            ('ratio', 'Ratio', 'Every LOD keeps a fixed share of the triangles of the previous one'),
+            ('budget', 'Budget', 'Every LOD is decimated down to a fixed number of triangles')
+            ),
+        default='ratio'
+    )
+    levels: IntProperty(
+        name="Levels",
+        description="Number of LODs to generate",
+        default=3,
+        min=1,
+        max=5
+    )
+    ratio: FloatProperty(
+        name="Ratio",
+        description="Share of triangles every LOD keeps of the previous one",
+        default=0.5,
+        min=0.01,
+        max=1.0,
+        subtype='FACTOR'
+    )
+    budgets: IntVectorProperty(
+        name="Triangle Budgets",
+        description="Maximum number of triangles of LOD1 to LOD5",
+        size=5,
+        default=(5000, 2000, 800, 300, 100),
+        min=1
+    )
+    include_bs: BoolProperty(
+        name="Build Stages",
+        description="Also generate LODs for all Build Stages",
+        default=True
+    )
+    replace: BoolProperty(
+        name="Replace Existing",
+        description="Replaces the contents of LOD collections that already exist. If disabled, they are skipped",
+        default=True
+    )
+    use_background: BoolProperty(
+        name="Background",
+        description="Decimates in separate Blender instances, keeping the UI responsive",
+        default=True
+    )
+    timeout: IntProperty(
+        name="Timeout",
+        description="Seconds after which a background Blender instance is stopped and its LOD counted as failed",
+        default=600,
+        min=10
+    )
+
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.seut.sceneType in ['mainScene', 'subpart', 'character'] and context.mode == 'OBJECT'
+
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, 'mode', expand=True)
+        layout.prop(self, 'levels')
+        if self.mode == 'ratio':
+            layout.prop(self, 'ratio')
+        else:
+            col = layout.column(align=True)
+            for idx in range(self.levels):
+                col.prop(self, 'budgets', index=idx, text=f"LOD{idx + 1}")
+        layout.prop(self, 'include_bs')
+        layout.prop(self, 'replace')
+        layout.prop(self, 'use_background')
+        if self.use_background:
+            layout.prop(self, 'timeout')
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        collections = get_collections(scene)
+
+        if collections['main'] is None:
+            seut_report(self, context, 'ERROR', True, 'E002', "Main")
+            return {'CANCELLED'}
+
+        sources = [collections['main'][0]]
+        # Only main scenes have Build Stages.
+        if self.include_bs and collections.get('bs') is not None:
+            sources += collections['bs']
+
+        sources = [col for col in sources if check_collection(self, context, scene, col, True) == {'CONTINUE'}]
+
+        self.start = time.time()
+        self.jobs = get_lod_jobs(context, sources, self.get_targets())
+        if self.jobs == []:
+            seut_report(self, context, 'WARNING', True, 'W020')
+            return {'CANCELLED'}
+
+        if not self.use_background:
+            for job in self.jobs:
+                job['results'] = decimate_meshes(context, job['meshes'])
+
+            # Jobs of the same collection share their source meshes, so they can only be removed once all levels have been decimated.
+            for job in self.jobs:
+                for mesh in job['temp_meshes']:
+                    bpy.data.meshes.remove(mesh)
+
+            return self.finish(context)
+
+        self.folder = tempfile.mkdtemp(prefix="SEUT_LOD_", dir=get_staging_root())
+        prepare_lod_workers(self.jobs, self.folder)
+        start_lod_workers(self.jobs)
+
+        wm = context.window_manager
+        self.timer = wm.event_timer_add(0.5, window=context.window)
+        wm.modal_handler_add(self)
+
+        return {'RUNNING_MODAL'}
+
+
+    def modal(self, context, event):
+
+        if event.type == 'ESC':
+            self.cancel(context)
+            seut_report(self, context, 'WARNING', True, 'W025')
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        for job in self.jobs:
+            if job['process'] is not None and job['process'].poll() is None and time.time() - job['started'] > self.timeout:
+                stop_lod_worker(job)
+                job['timed_out'] = True
+
+        start_lod_workers(self.jobs)
+        if any(job['process'] is None or job['process'].poll() is None for job in self.jobs):
+            return {'PASS_THROUGH'}
+
+        context.window_manager.event_timer_remove(self.timer)
+
+        for job in self.jobs:
+            if job['timed_out']:
+                seut_report(self, context, 'ERROR', True, 'E056', job['source'].name, job['level'], self.timeout)
+                job['results'] = None
+            elif job['process'].returncode != 0 or not os.path.isfile(job['target']):
+                seut_report(self, context, 'ERROR', True, 'E053', job['source'].name, job['level'], job['process'].returncode)
+                job['results'] = None
+            else:
+                job['results'] = load_worker_results(job['target'])
+
+        for job in self.jobs:
+            for mesh in job['temp_meshes']:
+                bpy.data.meshes.remove(mesh)
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+        return self.finish(context)
+
+
+    def cancel(self, context):
+        """Stops all background Blender instances and removes everything they were given to work on"""
+
+        context.window_manager.event_timer_remove(self.timer)
+
+        for job in self.jobs:
+            stop_lod_worker(job)
+
+        for job in self.jobs:
+            for mesh in job['temp_meshes']:
+                bpy.data.meshes.remove(mesh)
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+    def get_targets(self) -> list:
+        """Returns the share of triangles each level keeps, or the number of triangles it is limited to, depending on mode"""
+
+        if self.mode == 'ratio':
+            return [('ratio', self.ratio ** (idx + 1)) for idx in range(self.levels)]
+        else:
+            return [('budget', self.budgets[idx]) for idx in range(self.levels)]
+
+
+    def finish(self, context):
+
+        scene = context.scene
+
+        created = 0
+        failed = set()
+        for job in sorted(self.jobs, key=lambda job: job['level']):
+            # A LOD can't follow one that is missing, so the higher levels of a failed source are dropped.
+            if job['source'] in failed:
+                for mesh in job['results'] or []:
+                    bpy.data.meshes.remove(mesh)
+                continue
+            if job['results'] is None:
+                failed.add(job['source'])
+                continue
+            if create_lod_collection(scene, job, self.replace) is not None:
+                created += 1
+
+        sort_collections(scene, context)
+        seut_report(self, context, 'INFO', True, 'I034', created, round(time.time() - self.start, 3))
+
+        return {'FINISHED'}
+
+
+class SEUT_OT_AdviseLODDistances(Operator):
+    """Sets the distances of all LODs to where their deviation from the collection they reference becomes too small to see"""
+    bl_idname = "scene.advise_lod_distances"
+    bl_label = "Advise LOD Distances"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    pixel_error: FloatProperty(
+        name="Pixel Error",
+        description="Largest deviation on screen, in pixels, at which a LOD may be shown",
+        default=1.0,
+        min=0.1,
+        max=20.0
+    )
+    fov: FloatProperty(
+        name="Field of View",
+        description="Vertical field of view of the ingame camera",
+        default=math.radians(70),
+        min=math.radians(40),
+        max=math.radians(90),
+        subtype='ANGLE'
+    )
+    resolution: IntProperty(
+        name="Vertical Resolution",
+        description="Vertical screen resolution the pixel error refers to",
+        default=1080,
+        min=480,
+        max=4320
+    )
+    apply: BoolProperty(
+        name="Apply",
+        description="Writes the recommended distances to the LOD collections. If disabled, they are only reported",
+        default=True
+    )
+
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.seut.sceneType in ['mainScene', 'subpart', 'character']
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        collections = get_collections(scene)
+        depsgraph = context.evaluated_depsgraph_get()
+
+        if collections['lod'] is None or collections['lod'] == []:
+            seut_report(self, context, 'ERROR', True, 'E002', "LOD")
+            return {'CANCELLED'}
+
+        ref_cols = set(col.seut.ref_col for col in collections['lod'] if col.seut.ref_col is not None)
+
+        for ref_col in ref_cols:
+            co, tris = get_collection_triangles(ref_col, depsgraph)
+            if len(tris) < 1:
+                continue
+
+            reference = (co, tris, get_triangle_grid(co, tris))
+            previous = 0
+            for idx, lod_col in sorted(get_cols_by_type(scene, 'lod', ref_col).items()):
+                deviation = get_deviation(reference, get_collection_triangles(lod_col, depsgraph))
+                if deviation is None:
+                    continue
+
+                # Distances need to increase from one LOD to the next.
+                distance = max(get_lod_distance(deviation, self.pixel_error, self.fov, self.resolution), previous + 1)
+                previous = distance
+
+                seut_report(self, context, 'INFO', False, 'I035', lod_col.name, round(deviation, 4), distance)
+                if self.apply:
+                    lod_col.seut.lod_distance = distance
+
+        return {'FINISHED'}
+
+
+class SEUT_OT_CullHiddenFaces(Operator):
+    """Finds the faces of the active LOD or Build Stage collection that can not be seen from any direction outside the bounding box, then removes them or assigns them to a vertex group"""
+    bl_idname = "scene.cull_hidden_faces"
+    bl_label = "Cull Hidden Faces"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    action: EnumProperty(
+        name="Action",
+        items=(
+            ('remove', 'Remove', 'Deletes the hidden faces'),
+            ('group', 'Vertex Group', 'Assigns the vertices of the hidden faces to the vertex group \'SEUT Hidden\'')
+            ),
+        default='group'
+    )
+    directions: IntProperty(
+        name="Directions",
+        description="Number of directions the collection is viewed from. More directions find fewer, but more reliably hidden faces",
+        default=64,
+        min=8,
+        max=512
+    )
+
+
+    @classmethod
+    def poll(cls, context):
+        active_col = context.view_layer.active_layer_collection.collection
+        return context.scene.seut.sceneType in ['mainScene', 'subpart', 'character'] and active_col.seut.col_type in ['lod', 'bs'] and context.mode == 'OBJECT'
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        collection = context.view_layer.active_layer_collection.collection
+        depsgraph = context.evaluated_depsgraph_get()
+
+        result = check_collection(self, context, scene, collection, False)
+        if not result == {'CONTINUE'}:
+            return result
+
+        co, tris = get_collection_triangles(collection, depsgraph)
+        if len(tris) < 1:
+            seut_report(self, context, 'ERROR', True, 'E002', f'"{collection.name}"')
+            return {'CANCELLED'}
+
+        # Geometry sticking out of the bounding box must not be skipped by the rays.
+        half_size = np.abs(co).max(axis=0)
+        if scene.seut.sceneType == 'mainScene':
+            declared = np.array([scene.seut.bBox_X, scene.seut.bBox_Y, scene.seut.bBox_Z]) * get_grid_size(scene.seut.gridScale) / 2
+            half_size = np.maximum(half_size, declared)
+
+        tree = bvhtree.BVHTree.FromPolygons(co.tolist(), tris.tolist())
+        occluders = get_occluders(co, tris)
+        directions = get_sphere_directions(self.directions)
+
+        objects = []
+        for obj in get_mesh_objects(collection):
+
+            # Face indices of the evaluated mesh only match the mesh data if no modifiers change the topology.
+            if len(obj.modifiers) > 0:
+                seut_report(self, context, 'WARNING', False, 'W021', obj.name)
+                continue
+
+            objects.append(obj)
+
+        # The faces of all objects are tested at once, so every direction only has to be prepared once.
+        faces = [get_face_points(obj) for obj in objects]
+        hidden = get_hidden_faces(faces, tree, occluders, directions, half_size)
+
+        total = culled = 0
+        for obj, obj_hidden in zip(objects, np.split(hidden, np.cumsum([len(face[0]) for face in faces])[:-1])):
+            total += len(obj_hidden)
+            culled += int(obj_hidden.sum())
+
+            if obj_hidden.any():
+                if obj.data.users > 1:
+                    obj.data = obj.data.copy()
+                apply_hidden_faces(obj, obj_hidden, self.action)
+
+        seut_report(self, context, 'INFO', True, 'I038', culled, total, collection.name)
+
+        return {'FINISHED'}
+
+
+def get_lod_distance(deviation: float, pixel_error: float, fov: float, resolution: int) -> int:
+    """Returns the distance from which on a deviation of the given size covers less than pixel_error pixels on screen"""
+
+    pixels_per_unit = resolution / (2 * math.tan(fov / 2))
+
+    return math.ceil(deviation * pixels_per_unit / pixel_error)
+
+
+def get_triangle_distances(points: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Returns the distance of every point to the closest point of its triangle"""
+
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    ab = b - a
+    ac = c - a
+    bc = c - b
+    d1 = np.einsum('ij,ij->i', ab, points - a)
+    d2 = np.einsum('ij,ij->i', ac, points - a)
+    d3 = np.einsum('ij,ij->i', ab, points - b)
+    d4 = np.einsum('ij,ij->i', ac, points - b)
+    d5 = np.einsum('ij,ij->i', ab, points - c)
+    d6 = np.einsum('ij,ij->i', ac, points - c)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    # The closest point lies within the triangle, on one of its edges or on one of its corners, depending on which region the point projects into.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = va + vb + vc
+        closest = a + ab * (vb / denom)[:, None] + ac * (vc / denom)[:, None]
+
+        regions = (
+            ((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0), lambda m: b[m] + bc[m] * ((d4 - d3)[m] / ((d4 - d3)[m] + (d5 - d6)[m]))[:, None]),
+            ((vb <= 0) & (d2 >= 0) & (d6 <= 0), lambda m: a[m] + ac[m] * (d2[m] / (d2[m] - d6[m]))[:, None]),
+            ((vc <= 0) & (d1 >= 0) & (d3 <= 0), lambda m: a[m] + ab[m] * (d1[m] / (d1[m] - d3[m]))[:, None]),
+            ((d6 >= 0) & (d5 <= d6), lambda m: c[m]),
+            ((d3 >= 0) & (d4 <= d3), lambda m: b[m]),
+            ((d1 <= 0) & (d2 <= 0), lambda m: a[m])
+        )
+        for mask, get_closest in regions:
+            closest[mask] = get_closest(mask)
+
+    return np.linalg.norm(points - closest, axis=1)
+
+
+def get_triangle_grid(co: np.ndarray, tris: np.ndarray, max_cells: int = 2 ** 22) -> tuple:
+    """Sorts the triangles of a mesh into the cells of a uniform grid their bounds overlap, to find the ones close to a point without testing all of them"""
+
+    triangles = co[tris]
+    areas = np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1)
+    triangles = triangles[areas > 1e-12]
+    if len(triangles) < 1:
+        return triangles, np.zeros(3), 1.0, np.ones(3, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+    low = triangles.min(axis=1)
+    high = triangles.max(axis=1)
+    origin = low.min(axis=0)
+    extent = high.max(axis=0) - origin
+
+    # Cells twice the size of a typical triangle hold few triangles each, as long as there are not too many of them.
+    size = max(2 * float(np.median((high - low).max(axis=1))), float(np.prod(extent + 1e-6) / max_cells) ** (1 / 3), 1e-6)
+    resolution = (extent / size).astype(np.int64) + 1
+
+    cell_low = ((low - origin) / size).astype(np.int64)
+    spans = ((high - origin) / size).astype(np.int64) - cell_low + 1
+    counts = spans.prod(axis=1)
+    entry_tris = np.repeat(np.arange(len(triangles)), counts)
+    local = np.arange(len(entry_tris)) - np.repeat(np.cumsum(counts) - counts, counts)
+    entry_spans = spans[entry_tris]
+    entry_cells = cell_low[entry_tris] + np.column_stack((local % entry_spans[:, 0], local // entry_spans[:, 0] % entry_spans[:, 1], local // (entry_spans[:, 0] * entry_spans[:, 1])))
+    entry_cells = np.ravel_multi_index(entry_cells.T, resolution)
+
+    order = np.argsort(entry_cells, kind='stable')
+    cell_counts = np.bincount(entry_cells, minlength=int(resolution.prod()))
+
+    return triangles, origin, size, resolution, entry_tris[order], np.cumsum(cell_counts) - cell_counts, cell_counts
+
+
+def get_nearest_distances(points: np.ndarray, grid: tuple, max_rings: int = 4) -> np.ndarray:
+    """Returns the distance of every point to the closest triangle of a grid.
+    Cells are searched in growing rings around each point until no triangle outside of them can be closer. Points still far from all triangles after that are tested against every triangle"""
+
+    triangles, origin, size, resolution, cell_tris, cell_starts, cell_counts = grid
+
+    distances = np.full(len(points), np.inf)
+    cells = np.clip(((points - origin) / size).astype(np.int64), 0, resolution - 1)
+    remaining = np.arange(len(points))
+
+    for ring in range(max_rings + 1):
+        offsets = np.array([(x, y, z) for x in range(-ring, ring + 1) for y in range(-ring, ring + 1) for z in range(-ring, ring + 1) if max(abs(x), abs(y), abs(z)) == ring])
+
+        for offset in offsets:
+            offset_cells = cells[remaining] + offset
+            valid = np.all((offset_cells >= 0) & (offset_cells < resolution), axis=1)
+
+            # Cells further away than the closest triangle found so far are skipped.
+            gaps = np.maximum(origin + offset_cells * size - points[remaining], points[remaining] - origin - (offset_cells + 1) * size)
+            valid &= np.linalg.norm(np.maximum(gaps, 0.0), axis=1) < distances[remaining]
+            pair_points = remaining[valid]
+            offset_cells = np.ravel_multi_index(offset_cells[valid].T, resolution)
+
+            counts = cell_counts[offset_cells]
+            pair_points = np.repeat(pair_points, counts)
+            pair_tris = cell_tris[np.repeat(cell_starts[offset_cells] - np.cumsum(counts) + counts, counts) + np.arange(len(pair_points))]
+            np.minimum.at(distances, pair_points, get_triangle_distances(points[pair_points], triangles[pair_tris]))
+
+        # Triangles outside the cells searched so far are at least this far from the points.
+        remaining = remaining[distances[remaining] > ring * size]
+        if len(remaining) < 1:
+            return distances
+
+    chunk = max(1, 2 ** 20 // len(triangles))
+    for start in range(0, len(remaining), chunk):
+        pair_points = np.repeat(remaining[start:start + chunk], len(triangles))
+        pair_distances = get_triangle_distances(points[pair_points], np.tile(triangles, (len(remaining[start:start + chunk]), 1, 1)))
+        distances[remaining[start:start + chunk]] = pair_distances.reshape(-1, len(triangles)).min(axis=1)
+
+    return distances
+
+
+def get_deviation(reference: tuple, lod: tuple, percentile: float = 99.0, count: int = 20000):
+    """Returns the deviation between the surfaces of a collection and its LOD in both directions, measured at count points spread across each. Outliers are ignored"""
+
+    ref_co, ref_tris, ref_grid = reference
+    lod_co, lod_tris = lod
+    if len(lod_tris) < 1 or len(ref_grid[0]) < 1:
+        return None
+
+    lod_grid = get_triangle_grid(lod_co, lod_tris)
+    if len(lod_grid[0]) < 1:
+        return None
+
+    # The LOD may lack details of the reference and it may also add surfaces the reference does not have.
+    # Vertices are not measured, as dense areas of the reference would outweigh the rest of its surface.
+    lod_to_ref = get_nearest_distances(get_surface_samples(lod_co, lod_tris, count, False), ref_grid)
+    ref_to_lod = get_nearest_distances(get_surface_samples(ref_co, ref_tris, count, False), lod_grid)
+
+    return float(max(np.percentile(lod_to_ref, percentile), np.percentile(ref_to_lod, percentile)))
+
+
+def get_lod_jobs(context, sources: list, targets: list) -> list:
+    """Returns a job per source collection and LOD level, each listing the meshes to decimate and by how much"""
+
+    depsgraph = context.evaluated_depsgraph_get()
+    jobs = []
+
+    for source in sources:
+        objects = [obj for obj in source.objects if obj.type == 'MESH']
+
+        # Modifiers are applied before decimation, as they would be on export.
+        meshes = []
+        for obj in objects:
+            mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+            mesh.name = f"SEUT_LOD_{len(meshes)}"
+            mesh.calc_loop_triangles()
+            meshes.append(mesh)
+
+        triangles = sum(len(mesh.loop_triangles) for mesh in meshes)
+        if triangles == 0:
+            for mesh in meshes:
+                bpy.data.meshes.remove(mesh)
+            continue
+
+        for level, (target_type, target) in enumerate(targets, start=1):
+            ratio = target if target_type == 'ratio' else min(1.0, target / triangles)
+            jobs.append({
+                'source': source,
+                'level': level,
+                'objects': objects,
+                'meshes': [(mesh, ratio) for mesh in meshes],
+                'temp_meshes': meshes if level == 1 else []
+            })
+
+    return jobs
+
+
+def decimate_meshes(context, meshes: list) -> list:
+    """Decimates meshes within this instance of Blender. Returns the decimated meshes in the same order"""
+
+    scene = context.scene
+    results = []
+
+    for mesh, ratio in meshes:
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        scene.collection.objects.link(obj)
+
+        if ratio < 1.0:
+            modifier = obj.modifiers.new("Decimate", 'DECIMATE')
+            modifier.decimate_type = 'COLLAPSE'
+            modifier.ratio = ratio
+            modifier.use_collapse_triangulate = True
+
+        depsgraph = context.evaluated_depsgraph_get()
+        results.append(bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph)))
+        bpy.data.objects.remove(obj)
+
+    return results
+
+
+def prepare_lod_workers(jobs: list, folder: str):
+    """Writes the meshes of every job to disk, along with the instructions for the background Blender instance decimating them"""
+
+    worker = os.path.join(os.path.dirname(__file__), 'utils', 'seut_lod_worker.py')
+    sources = {}
+
+    for idx, job in enumerate(jobs):
+        meshes = [mesh for mesh, ratio in job['meshes']]
+        key = tuple(mesh.name for mesh in meshes)
+        if key not in sources:
+            sources[key] = os.path.join(folder, f"source_{len(sources)}.blend")
+            bpy.data.libraries.write(sources[key], set(meshes), fake_user=True)
+
+        job['target'] = os.path.join(folder, f"result_{idx}.blend")
+        job_file = os.path.join(folder, f"job_{idx}.json")
+        with open(job_file, 'w') as file:
+            json.dump({
+                'source': sources[key],
+                'target': job['target'],
+                'meshes': [(mesh.name, ratio) for mesh, ratio in job['meshes']]
+            }, file)
+
+        job['command'] = [bpy.app.binary_path, '--background', '--factory-startup', '--python', worker, '--', job_file]
+        job['process'] = None
+        job['started'] = None
+        job['timed_out'] = False
+
+
+def start_lod_workers(jobs: list, limit: int = None):
+    """Starts background Blender instances for queued jobs until as many run at once as the limit allows, by default one per CPU core"""
+
+    if limit is None:
+        limit = os.cpu_count() or 1
+
+    running = sum(1 for job in jobs if job['process'] is not None and job['process'].poll() is None)
+    for job in jobs:
+        if running >= limit:
+            break
+        if job['process'] is None:
+            job['process'] = subprocess.Popen(
+                job['command'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            job['started'] = time.time()
+            running += 1
+
+
+def stop_lod_worker(job: dict):
+    """Terminates the background Blender instance of a job if it is still running"""
+
+    process = job['process']
+    if process is None or process.poll() is not None:
+        return
+
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def load_worker_results(path: str) -> list:
+    """Appends the decimated meshes written by a worker, in the order they were requested in"""
+
+    with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+        names = sorted(data_from.meshes, key=lambda name: int(name.split("_")[2]))
+        data_to.meshes = names
+
+    return list(data_to.meshes)
+
+
+def get_default_lod_distance(level: int, previous: int = 0) -> int:
+    """Returns the distance a new LOD is shown from: 25 for LOD1, doubling with every level and always beyond the previous LOD"""
+
+    if previous > 0:
+        return previous * 2
+
+    return 25 * 2 ** (level - 1)
+
+
+def create_lod_collection(scene, job: dict, replace: bool):
+    """Fills the LOD collection of a level with the decimated meshes of a job, creating it if necessary"""
+
+    source = job['source']
+    level = job['level']
+
+    cols = get_cols_by_type(scene, 'lod', source)
+    if level in cols:
+        collection = cols[level]
+        if not replace:
+            for mesh in job['results']:
+                bpy.data.meshes.remove(mesh)
+            return None
+
+        for obj in list(collection.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
+    else:
+        collection = create_seut_collection(scene, 'lod', level, source)
+        if collection is None:
+            return None
+
+        # Only LODs of main scenes receive a default distance on creation, but all of them need to increase from level to level.
+        previous = cols[level - 1].seut.lod_distance if level - 1 in cols else 0
+        collection.seut.lod_distance = get_default_lod_distance(level, previous)
+
+    for src_obj, mesh in zip(job['objects'], job['results']):
+        mesh.name = f"{src_obj.data.name}_LOD{level}"
+
+        # Materials are not carried over by the workers, but the slots and the faces' material indices are.
+        for idx, slot in enumerate(src_obj.material_slots):
+            if idx < len(mesh.materials):
+                mesh.materials[idx] = slot.material
+            else:
+                mesh.materials.append(slot.material)
+
+        obj = bpy.data.objects.new(f"{src_obj.name}_LOD{level}", mesh)
+        obj.matrix_world = src_obj.matrix_world.copy()
+        collection.objects.link(obj)
+
+    return collection
+
+
+def get_sphere_directions(count: int) -> np.ndarray:
+    """Returns directions spread evenly across a sphere, in random order so consecutive ones differ"""
+
+    idx = np.arange(count) + 0.5
+    z = 1 - 2 * idx / count
+    radius = np.sqrt(1 - z ** 2)
+    angle = np.pi * (1 + 5 ** 0.5) * idx
+
+    directions = np.column_stack((radius * np.cos(angle), radius * np.sin(angle), z))
+
+    return directions[np.random.default_rng(0).permutation(count)]
+
+
+def get_exit_distances(points: np.ndarray, direction: np.ndarray, half_size: np.ndarray) -> np.ndarray:
+    """Returns how far points have to travel along a direction to leave a box centered on the origin"""
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distances = (np.sign(direction) * half_size - points) / direction
+    distances[:, direction == 0] = np.inf
+
+    return np.maximum(distances.min(axis=1), 0.0)
+
+
+def get_occluders(co: np.ndarray, tris: np.ndarray) -> tuple:
+    """Returns the corners and unit normals of the triangles rays can hit, and the size of a typical one"""
+
+    corners = co[tris]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    valid = lengths > 1e-12
+    corners = corners[valid]
+
+    size = float(np.median((corners.max(axis=1) - corners.min(axis=1)).max(axis=1))) if len(corners) > 0 else 0.0
+
+    return corners, normals[valid] / lengths[valid, None], size
+
+
+def rasterize_occluders(occluders: tuple, direction: np.ndarray, max_resolution: int = 1024) -> tuple:
+    """Projects the triangles facing a direction onto a grid across the view and stores the one closest to the viewer at every sample, -1 where there is none"""
+
+    corners, normals, size = occluders
+
+    helper = np.array([1.0, 0.0, 0.0]) if abs(direction[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    u = np.cross(direction, helper)
+    u /= np.linalg.norm(u)
+    basis = np.column_stack((u, np.cross(direction, u)))
+
+    # Only faces facing the viewer block rays, the same as in is_reachable.
+    front = np.flatnonzero(normals @ direction > 0.0)
+    tri_2d = corners[front] @ basis
+    tri_depth = corners[front] @ direction
+
+    low = tri_2d.min(axis=1)
+    high = tri_2d.max(axis=1)
+    origin = low.min(axis=0) if len(front) > 0 else np.zeros(2)
+    extent = high.max(axis=0) - origin if len(front) > 0 else np.zeros(2)
+
+    # Samples half the size of a typical triangle apart hit most triangles without entering large ones too often.
+    spacing = max(size / 2, float(extent.max()) / (max_resolution - 2), 1e-9)
+    resolution = (extent / spacing).astype(np.int64) + 2
+
+    # Every triangle is tested against the samples within its bounds.
+    sample_low = np.ceil((low - origin) / spacing).astype(np.int64)
+    spans = np.maximum(np.floor((high - origin) / spacing).astype(np.int64) - sample_low + 1, 0)
+    counts = spans[:, 0] * spans[:, 1]
+    entry_tris = np.repeat(np.arange(len(front)), counts)
+    local = np.arange(len(entry_tris)) - np.repeat(np.cumsum(counts) - counts, counts)
+    entry_x = sample_low[entry_tris, 0] + local % np.maximum(spans[entry_tris, 0], 1)
+    entry_y = sample_low[entry_tris, 1] + local // np.maximum(spans[entry_tris, 0], 1)
+
+    inside, weights = get_barycentric(tri_2d[entry_tris], np.column_stack((entry_x, entry_y)) * spacing + origin, 0.0)
+    entry_tris = entry_tris[inside]
+    entry_samples = entry_x[inside] * resolution[1] + entry_y[inside]
+    entry_depth = np.einsum('ij,ij->i', weights[inside], tri_depth[entry_tris])
+
+    depth_buffer = np.full(int(resolution.prod()), -np.inf)
+    np.maximum.at(depth_buffer, entry_samples, entry_depth)
+    id_buffer = np.full(int(resolution.prod()), -1, dtype=np.int32)
+    closest = entry_depth >= depth_buffer[entry_samples]
+    id_buffer[entry_samples[closest]] = front[entry_tris[closest]]
+
+    return basis, origin, spacing, resolution, id_buffer
+
+
+def get_covered_points(occluders: tuple, raster: tuple, points: np.ndarray, direction: np.ndarray, margin: float) -> np.ndarray:
+    """Returns which points the front of a triangle certainly covers when viewed from a direction, without casting rays.
+    Each point is tested exactly against the closest triangles of the four samples of the rasterized view around it.
+    Points close to an edge or to the covering triangle are not counted, those are left to the ray casts"""
+
+    corners = occluders[0]
+    basis, origin, spacing, resolution, id_buffer = raster
+
+    covered = np.zeros(len(points), dtype=bool)
+    point_2d = points @ basis
+    point_depth = points @ direction
+    cell = np.clip(((point_2d - origin) / spacing).astype(np.int64), 0, resolution - 2)
+
+    for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+        remaining = np.flatnonzero(~covered)
+        pair_tris = id_buffer[(cell[remaining, 0] + dx) * resolution[1] + cell[remaining, 1] + dy]
+        remaining = remaining[pair_tris >= 0]
+        pair_tris = pair_tris[pair_tris >= 0]
+
+        inside, weights = get_barycentric(corners[pair_tris] @ basis, point_2d[remaining], 1e-4)
+        depth = np.einsum('ij,ij->i', weights, corners[pair_tris] @ direction)
+        covered[remaining[inside & (depth > point_depth[remaining] + margin)]] = True
+
+    return covered
+
+
+def get_barycentric(triangles: np.ndarray, points: np.ndarray, tolerance: float) -> tuple:
+    """Returns whether 2D points lie within their triangles by more than tolerance, along with their barycentric coordinates"""
+
+    a = triangles[:, 0]
+    v0 = triangles[:, 1] - a
+    v1 = triangles[:, 2] - a
+    v2 = points - a
+    area = v0[:, 0] * v1[:, 1] - v1[:, 0] * v0[:, 1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w1 = (v2[:, 0] * v1[:, 1] - v1[:, 0] * v2[:, 1]) / area
+        w2 = (v0[:, 0] * v2[:, 1] - v2[:, 0] * v0[:, 1]) / area
+    weights = np.column_stack((1.0 - w1 - w2, w1, w2))
+
+    return (np.abs(area) > 1e-12) & (weights.min(axis=1) > tolerance), weights
+
+
+def cast_visibility(tree, occluders: tuple, rasters: dict, points: np.ndarray, normals: np.ndarray, owners: np.ndarray, hidden: np.ndarray, directions: np.ndarray, half_size: np.ndarray, margin: float):
+    """Marks the faces owning the points as visible if a ray from outside the box reaches a point before anything else. Faces are only tested from the front.
+    Points another face covers are sorted out beforehand, so rays are only cast where the outcome is uncertain. Rasterized views are kept in rasters while memory allows"""
+
+    ray = Vector()
+    origin = Vector()
+
+    for idx, direction in enumerate(directions):
+        candidates = np.flatnonzero(hidden[owners] & (normals @ direction > 0.0))
+        if len(candidates) < 1:
+            continue
+
+        raster = rasters.get(idx)
+        if raster is None:
+            raster = rasterize_occluders(occluders, direction)
+            if sum(cached[4].nbytes for cached in rasters.values()) + raster[4].nbytes <= 256 * 1024 ** 2:
+                rasters[idx] = raster
+
+        candidates = candidates[~get_covered_points(occluders, raster, points[candidates], direction, margin)]
+        if len(candidates) < 1:
+            continue
+
+        distances = get_exit_distances(points[candidates], direction, half_size) + margin
+        origins = points[candidates] + np.outer(distances, direction)
+        ray[:] = (-direction).tolist()
+
+        for point, origin_co, distance in zip(candidates.tolist(), origins.tolist(), distances.tolist()):
+            if hidden[owners[point]]:
+                origin[:] = origin_co
+                if is_reachable(tree, origin, ray, distance, margin):
+                    hidden[owners[point]] = False
+
+
+def is_reachable(tree, origin, ray, distance: float, margin: float) -> bool:
+    """Returns whether a ray travels the given distance without hitting the front of a face. Back faces are not rendered ingame, so they don't occlude"""
+
+    travelled = 0.0
+    while True:
+        location, normal, index, hit_distance = tree.ray_cast(origin, ray, distance - travelled + margin)
+        if location is None or travelled + hit_distance >= distance - margin * 0.01:
+            return True
+        if normal.dot(ray) < 0.0:
+            return False
+
+        travelled += hit_distance + margin * 0.01
+        origin = location + ray * margin * 0.01
+
+
+def get_face_points(obj) -> tuple:
+    """Returns the world space centers and normals of the faces of an object, as well as points close to their corners and the face each of those belongs to"""
+
+    mesh = obj.data
+    face_count = len(mesh.polygons)
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get('co', co)
+    centers = np.empty(face_count * 3, dtype=np.float64)
+    mesh.polygons.foreach_get('center', centers)
+    normals = np.empty(face_count * 3, dtype=np.float64)
+    mesh.polygons.foreach_get('normal', normals)
+    totals = np.empty(face_count, dtype=np.int64)
+    mesh.polygons.foreach_get('loop_total', totals)
+    vertex_indices = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get('vertex_index', vertex_indices)
+
+    matrix = get_matrix_array(obj.matrix_world)
+    co = transform_points(co.reshape(-1, 3), obj.matrix_world)
+    centers = transform_points(centers.reshape(-1, 3), obj.matrix_world)
+    normals = normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1), 1e-12)[:, None]
+
+    loop_faces = np.repeat(np.arange(face_count), totals)
+    corners = co[vertex_indices] * 0.8 + centers[loop_faces] * 0.2
+
+    return centers, normals, corners, loop_faces
+
+
+def get_hidden_faces(faces: list, tree, occluders: tuple, directions: np.ndarray, half_size: np.ndarray) -> np.ndarray:
+    """Returns for every face of the given objects whether it is hidden from all directions, in the order of the objects"""
+
+    face_count = sum(len(centers) for centers, normals, corners, loop_faces in faces)
+    if face_count < 1:
+        return np.zeros(0, dtype=bool)
+
+    offsets = np.cumsum([0] + [len(centers) for centers, normals, corners, loop_faces in faces])
+    centers = np.concatenate([face[0] for face in faces])
+    normals = np.concatenate([face[1] for face in faces])
+    corners = np.concatenate([face[2] for face in faces])
+    loop_faces = np.concatenate([face[3] + offset for face, offset in zip(faces, offsets)])
+
+    # The margin keeps ray origins clear of the box and tolerates coplanar faces.
+    margin = max(1e-3, float(np.max(half_size)) * 1e-4)
+    hidden = np.ones(face_count, dtype=bool)
+
+    rasters = {}
+    cast_visibility(tree, occluders, rasters, centers, normals, np.arange(face_count), hidden, directions, half_size, margin)
+
+    # Faces whose center is covered may still show a corner, so those are tested again closer to their corners.
+    if hidden.any():
+        cast_visibility(tree, occluders, rasters, corners, normals[loop_faces], loop_faces, hidden, directions, half_size, margin)
+
+    return hidden
+
+
+def apply_hidden_faces(obj, hidden: np.ndarray, action: str):
+    """Deletes hidden faces or assigns the vertices only used by hidden faces to a vertex group"""
+
+    mesh = obj.data
+
+    if action == 'remove':
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        bm.faces.ensure_lookup_table()
+        faces = [bm.faces[idx] for idx in np.flatnonzero(hidden).tolist()]
+        bmesh.ops.delete(bm, geom=faces, context='FACES')
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.update()
+
+    else:
+        totals = np.empty(len(mesh.polygons), dtype=np.int64)
+        mesh.polygons.foreach_get('loop_total', totals)
+        vertex_indices = np.empty(len(mesh.loops), dtype=np.int64)
+        mesh.loops.foreach_get('vertex_index', vertex_indices)
+
+        used = np.zeros(len(mesh.vertices), dtype=bool)
+        used[vertex_indices] = True
+        visible = np.zeros(len(mesh.vertices), dtype=bool)
+        visible[vertex_indices[~np.repeat(hidden, totals)]] = True
+
+        group = obj.vertex_groups.get('SEUT Hidden')
+        if group is None:
+            group = obj.vertex_groups.new(name='SEUT Hidden')
+        group.remove(list(range(len(mesh.vertices))))
+        group.add(np.flatnonzero(used & ~visible).tolist(), 1.0, 'REPLACE')
@@ -4,10 +4,9 @@ from math           import pi
 from bpy.types      import Operator
 from collections    import OrderedDict
 
-from .materials.seut_materials      import create_internal_material
 from .seut_collections              import get_collections, create_seut_collection
 from .seut_errors                   import check_collection, check_collection_excluded, seut_report
-from .seut_utils                    import link_subpart_scene, unlink_subpart_scene, prep_context, to_radians, clear_selection, lock_object
+from .seut_utils                    import link_subpart_scene, unlink_subpart_scene, prep_context, to_radians, clear_selection
 
 
 mirroring_presets = OrderedDict([
@@ -70,25 +69,6 @@ def setup_mirroring(self, context):
         scene.seut.mirroringToggle = 'off'
         return
 
-    smat_x = None
-    smat_y = None
-    smat_z = None
-
-    for mat in bpy.data.materials:
-        if mat.name == 'SMAT_Mirror_X':
-            smat_x = mat
-        elif mat.name == 'SMAT_Mirror_Y':
-            smat_y = mat
-        elif mat.name == 'SMAT_Mirror_Z':
-            smat_z = mat
-    
-    if smat_x is None:
-        smat_x = create_internal_material(context, 'MIRROR_X')
-    if smat_y is None:
-        smat_y = create_internal_material(context, 'MIRROR_Y')
-    if smat_z is None:
-        smat_z = create_internal_material(context, 'MIRROR_Z')
-
     collection = create_seut_collection(scene, 'mirroring')
     
     # Compile rotation / position / size information
@@ -111,63 +91,39 @@ def setup_mirroring(self, context):
 
     offset = (size * 2 + size / 2) * factor
 
-    # Create empties (using property rotation info) with certain distance from bounding box
+    # Create empties (using property rotation info) with certain distance from bounding box. The mirror planes are drawn as overlays.
     bpy.ops.object.add(type='EMPTY', location=(offset, 0.0, 0.0), rotation=empty_x_rotation)
     empty_x = bpy.context.view_layer.objects.active
     empty_x.name = 'Mirror LeftRight'
     empty_x.empty_display_type = 'ARROWS'
     empty_x.empty_display_size = empty_size
-    bpy.ops.mesh.primitive_plane_add(size=empty_size * 2, calc_uvs=True, enter_editmode=False, align='WORLD', location=(offset / 2, 0.0, 0.0), rotation=(0.0, to_radians(90), 0.0))
-    plane_x = bpy.context.view_layer.objects.active
-    plane_x.name = 'X Axis Mirror Plane'
-    plane_x.active_material = smat_x
-    lock_object(plane_x)
 
     bpy.ops.object.add(type='EMPTY', location=(0.0, offset, 0.0), rotation=empty_y_rotation)
     empty_y = bpy.context.view_layer.objects.active
     empty_y.name = 'Mirror FrontBack'
     empty_y.empty_display_type = 'ARROWS'
     empty_y.empty_display_size = empty_size
-    bpy.ops.mesh.primitive_plane_add(size=empty_size * 2, calc_uvs=True, enter_editmode=False, align='WORLD', location=(0.0, offset / 2, 0.0), rotation=(to_radians(90), 0.0, 0.0))
-    plane_y = bpy.context.view_layer.objects.active
-    plane_y.name = 'Y Axis Mirror Plane'
-    plane_y.active_material = smat_y
-    lock_object(plane_y)
 
     bpy.ops.object.add(type='EMPTY', location=(0.0, 0.0, offset), rotation=empty_z_rotation)
     empty_z = bpy.context.view_layer.objects.active
     empty_z.name = 'Mirror TopBottom'
     empty_z.empty_display_type = 'ARROWS'
     empty_z.empty_display_size = empty_size
-    bpy.ops.mesh.primitive_plane_add(size=empty_size * 2, calc_uvs=True, enter_editmode=False, align='WORLD', location=(0.0, 0.0, offset / 2), rotation=(0.0, 0.0, to_radians(90)))
-    plane_z = bpy.context.view_layer.objects.active
-    plane_z.name = 'Z Axis Mirror Plane'
-    plane_z.active_material = smat_z
-    lock_object(plane_z)
 
     parentCollection = empty_x.users_collection[0]
     if parentCollection != collection:
         collection.objects.link(empty_x)
         collection.objects.link(empty_y)
         collection.objects.link(empty_z)
-        collection.objects.link(plane_x)
-        collection.objects.link(plane_y)
-        collection.objects.link(plane_z)
 
         if parentCollection is None:
             scene.collection.objects.unlink(empty_x)
             scene.collection.objects.unlink(empty_y)
             scene.collection.objects.unlink(empty_z)
-            scene.collection.objects.unlink(plane_x)
-            scene.collection.objects.unlink(plane_y)
-            scene.collection.objects.unlink(plane_z)
         else:
             parentCollection.objects.unlink(empty_x)
             parentCollection.objects.unlink(empty_y)
             parentCollection.objects.unlink(empty_z)
-            parentCollection.objects.unlink(plane_x)
-            parentCollection.objects.unlink(plane_y)
-            parentCollection.objects.unlink(plane_z)
 
     # Instance main collection or mirroringScene main collection under empties
     source_scene = scene
@@ -206,6 +162,7 @@ def clean_mirroring(self, context):
             obj.select_set(state=False, view_layer=context.window.view_layer)
             bpy.data.objects.remove(obj)
 
+        # Mirror planes are no longer created as objects, but may still exist in older BLEND files.
         elif obj.name == 'X Axis Mirror Plane' or obj.name == 'Y Axis Mirror Plane' or obj.name == 'Z Axis Mirror Plane':
 
             obj.select_set(state=False, view_layer=context.window.view_layer)
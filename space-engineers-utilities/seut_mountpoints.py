@@ -1,17 +1,30 @@
 import bpy
+import numpy as np
 
 from math           import pi
 from bpy.types      import Operator
-from bpy.props      import EnumProperty
+from bpy.props      import EnumProperty, IntProperty, FloatProperty
 
 from .materials.seut_materials      import create_internal_material
 from .seut_collections              import get_collections, create_seut_collection
 from .seut_errors                   import check_collection, check_collection_excluded, seut_report
 from .seut_utils                    import prep_context, to_radians, clear_selection, lock_object
+from .utils.seut_mesh_utils         import get_collection_triangles
 
 
 valid_masks = ['0:0', '0:1', '0:2', '1:2', '3:3']
 
+# Outward normal, local X axis and local Y axis of the side empties created in setup_mountpoints(), in world space.
+# Mountpoint areas are children of these empties, so an area's location is its center projected onto these axes.
+mountpoint_sides = {
+    'front':    ((0, -1, 0), (-1, 0, 0), (0, 0, -1)),
+    'back':     ((0, 1, 0), (1, 0, 0), (0, 0, -1)),
+    'left':     ((1, 0, 0), (0, -1, 0), (0, 0, -1)),
+    'right':    ((-1, 0, 0), (0, 1, 0), (0, 0, -1)),
+    'top':      ((0, 0, 1), (1, 0, 0), (0, 1, 0)),
+    'bottom':   ((0, 0, -1), (1, 0, 0), (0, -1, 0))
+}
+
 
 def setup_mountpoints(self, context):
     """Sets up mountpoint utilities"""
@@ -332,4 +345,186 @@ class SEUT_OT_AddMountpointArea(Operator):
 
         scene.cursor.location = cursor_location
 
-        return {'FINISHED'}
\ No newline at end of file
+        return {'FINISHED'}
+
+class SEUT_OT_GenerateMountpointAreas(Operator):
+    """Generates mountpoint areas from the geometry of the Main collection that touches the faces of the bounding box"""
+    bl_idname = "scene.generate_mountpoint_areas"
+    bl_label = "Generate Areas"
+    bl_options = {'REGISTER', 'UNDO'}
+
+
+    resolution: IntProperty(
+        name="Resolution",
+        description="Number of samples per block along each axis of a side",
+        default=10,
+        min=1,
+        max=50
+    )
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description="Maximum distance of a face from the bounding box for it to still count as contact area",
+        default=0.01,
+        min=0.0,
+        max=0.5
+    )
+
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.seut.sceneType == 'mainScene'
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        collections = get_collections(scene)
+
+        if collections['main'] is None:
+            seut_report(self, context, 'ERROR', True, 'E002', "Main")
+            return {'CANCELLED'}
+        
+        collection = collections['main'][0]
+        result = check_collection(self, context, scene, collection, False)
+        if not result == {'CONTINUE'}:
+            return result
+
+        areas = get_mountpoint_areas(scene, collection, context.evaluated_depsgraph_get(), self.resolution, self.tolerance)
+
+        if len(areas) < 1:
+            seut_report(self, context, 'WARNING', True, 'W014', collection.name)
+            return {'CANCELLED'}
+
+        # Mountpoint mode saves its planes to the areas when it is turned off, so it needs to be rebuilt around the new areas.
+        mode_active = scene.seut.mountpointToggle == 'on'
+        if mode_active:
+            scene.seut.mountpointToggle = 'off'
+
+        scene.seut.mountpointAreas.clear()
+        for side, x, y, xDim, yDim in areas:
+            item = scene.seut.mountpointAreas.add()
+            item.side = side
+            item.x = x
+            item.y = y
+            item.xDim = xDim
+            item.yDim = yDim
+
+        if mode_active:
+            scene.seut.mountpointToggle = 'on'
+
+        seut_report(self, context, 'INFO', True, 'I024', len(areas), collection.name)
+
+        return {'FINISHED'}
+
+
+def get_mountpoint_areas(scene, collection, depsgraph, resolution: int, tolerance: float) -> list:
+    """Returns the areas of the geometry in a collection that lie on the faces of the bounding box, as tuples of side, x, y, xDim and yDim."""
+
+    if scene.seut.gridScale == 'small':
+        scale = 0.5
+    else:
+        scale = 2.5
+
+    co, tris = get_collection_triangles(collection, depsgraph)
+    if len(tris) < 1:
+        return []
+
+    corners = co[tris]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    valid = lengths > 1e-9
+    normals[valid] /= lengths[valid, None]
+
+    cells = np.array([scene.seut.bBox_X, scene.seut.bBox_Y, scene.seut.bBox_Z])
+    half_extents = cells * scale / 2
+
+    areas = []
+    for side, axes in mountpoint_sides.items():
+        normal, axis_x, axis_y = (np.array(axis, dtype=np.float64) for axis in axes)
+
+        depth = np.abs(normal) @ half_extents
+        width = np.abs(axis_x) @ half_extents * 2
+        height = np.abs(axis_y) @ half_extents * 2
+
+        # Only faces lying in the plane of the side and pointing outwards can connect to a neighbouring block.
+        on_plane = np.all(np.abs(corners @ normal - depth) <= tolerance, axis=1)
+        facing = normals @ normal > 0.99
+        contact = corners[valid & on_plane & facing]
+        if len(contact) < 1:
+            continue
+
+        projected = np.stack((contact @ axis_x, contact @ axis_y), axis=-1)
+        samples_x = int(round(np.abs(axis_x) @ cells)) * resolution
+        samples_y = int(round(np.abs(axis_y) @ cells)) * resolution
+        grid = rasterize_triangles(projected, width, height, samples_x, samples_y)
+
+        size_x = width / samples_x
+        size_y = height / samples_y
+        for x_start, y_start, x_end, y_end in merge_rectangles(grid):
+            x = -width / 2 + (x_start + x_end) / 2 * size_x
+            y = -height / 2 + (y_start + y_end) / 2 * size_y
+            areas.append((side, x, y, (x_end - x_start) * size_x, (y_end - y_start) * size_y))
+
+    return areas
+
+
+def rasterize_triangles(triangles: np.ndarray, width: float, height: float, samples_x: int, samples_y: int) -> np.ndarray:
+    """Returns a boolean grid of shape (samples_y, samples_x) marking the cells of a centered rectangle whose centers are covered by the 2D triangles."""
+
+    xs = -width / 2 + (np.arange(samples_x) + 0.5) * (width / samples_x)
+    ys = -height / 2 + (np.arange(samples_y) + 0.5) * (height / samples_y)
+    px, py = np.meshgrid(xs, ys)
+    points = np.stack((px.ravel(), py.ravel()), axis=1)[None]
+
+    covered = np.zeros(len(points[0]), dtype=bool)
+    eps = 1e-9
+
+    # Triangles are tested in chunks against all sample points to keep memory usage bounded.
+    chunk = max(1, 1000000 // len(points[0]))
+    for start in range(0, len(triangles), chunk):
+        tri = triangles[start:start + chunk]
+        a = tri[:, 0, None, :]
+        b = tri[:, 1, None, :]
+        c = tri[:, 2, None, :]
+
+        d1 = edge_function(a, b, points)
+        d2 = edge_function(b, c, points)
+        d3 = edge_function(c, a, points)
+
+        negative = (d1 < -eps) | (d2 < -eps) | (d3 < -eps)
+        positive = (d1 > eps) | (d2 > eps) | (d3 > eps)
+        covered |= np.any(~(negative & positive), axis=0)
+
+    return covered.reshape(samples_y, samples_x)
+
+
+def edge_function(a: np.ndarray, b: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """Returns on which side of the edge a-b the points p lie."""
+
+    return (b[..., 0] - a[..., 0]) * (p[..., 1] - a[..., 1]) - (b[..., 1] - a[..., 1]) * (p[..., 0] - a[..., 0])
+
+
+def merge_rectangles(grid: np.ndarray) -> list:
+    """Greedily merges the covered cells of a boolean grid into rectangles, returned as (x_start, y_start, x_end, y_end) in cells."""
+
+    grid = grid.copy()
+    rows, columns = grid.shape
+    rectangles = []
+
+    for y in range(rows):
+        for x in np.flatnonzero(grid[y]):
+            if not grid[y, x]:
+                continue
+
+            x_end = x + 1
+            while x_end < columns and grid[y, x_end]:
+                x_end += 1
+
+            y_end = y + 1
+            while y_end < rows and grid[y_end, x:x_end].all():
+                y_end += 1
+
+            grid[y:y_end, x:x_end] = False
+            rectangles.append((int(x), y, int(x_end), y_end))
+
+    return rectangles
@@ -138,6 +138,22 @@ class SEUT_Object(PropertyGroup):
         max=255
     )
 
+    # Collision
+    collision_shape: EnumProperty(
+        name='Collision Shape',
+        description="The Havok shape this object is exported as. Primitive shapes are much cheaper ingame than hulls and meshes",
+        items=(
+            ('DEFAULT', 'Default', "Use the shape of the object's rigid body, or Convex Hull if it has none"),
+            ('CONVEX_HULL', 'Convex Hull', 'Convex hull around the vertices of the object'),
+            ('BOX', 'Box', 'Box along the local axes of the object'),
+            ('SPHERE', 'Sphere', 'Sphere around the origin of the object'),
+            ('CYLINDER', 'Cylinder', 'Cylinder along the local Z axis of the object'),
+            ('CAPSULE', 'Capsule', 'Capsule along the local Z axis of the object'),
+            ('MESH', 'Mesh', 'The mesh itself. Most expensive shape')
+            ),
+        default='DEFAULT'
+    )
+
     # Particles
     particle_id: IntProperty(
         name="Particle ID",
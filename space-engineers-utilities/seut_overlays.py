@@ -0,0 +1,212 @@
+import bpy
+import gpu
+
+from gpu_extras.batch   import batch_for_shader
+
+from .seut_mountpoints  import mountpoint_sides
+
+
+# Colors of the internal materials formerly used by the corresponding helper objects.
+overlay_colors = {
+    'mountpoint': (0.03899, 1.0, 0.348069, 0.35),
+    'mirror_x': (0.715694, 0.0368895, 0.0802198, 0.35),
+    'mirror_y': (0.23074, 0.533276, 0.00477695, 0.35),
+    'mirror_z': (0.0395462, 0.300544, 0.64448, 0.35)
+}
+
+bbox_indices = (
+    (0, 1), (0, 2), (1, 3), (2, 3),
+    (4, 5), (4, 6), (5, 7), (6, 7),
+    (0, 4), (1, 5), (2, 6), (3, 7)
+)
+
+draw_handle = None
+shader = None
+
+# Batches are kept between redraws and only rebuilt if the signature of the data they were built from changes.
+batch_cache = {}
+
+
+def register_overlays():
+    """Registers the draw handler that draws all SEUT overlays in the 3D viewport"""
+
+    global draw_handle
+
+    if draw_handle is None:
+        draw_handle = bpy.types.SpaceView3D.draw_handler_add(draw_overlays, (), 'WINDOW', 'POST_VIEW')
+
+
+def unregister_overlays():
+    """Removes the overlay draw handler and frees all cached batches"""
+
+    global draw_handle
+
+    if draw_handle is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(draw_handle, 'WINDOW')
+        draw_handle = None
+
+    batch_cache.clear()
+
+
+def tag_redraw(context):
+    """Redraws all 3D viewports so changes to the overlays become visible"""
+
+    if context.window_manager is None:
+        return
+
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+def get_shader():
+    """Returns the shader all overlays are drawn with"""
+
+    global shader
+
+    if shader is None:
+        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+
+    return shader
+
+
+def get_batch(key, signature, build):
+    """Returns the cached batch for a key, rebuilding it with build() if its signature has changed"""
+
+    cached = batch_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    batch = build()
+    batch_cache[key] = (signature, batch)
+
+    return batch
+
+
+def get_grid_factor(scene) -> float:
+    if scene.seut.gridScale == 'small':
+        return 0.5
+    else:
+        return 2.5
+
+
+def get_bbox_signature(scene) -> tuple:
+    return (scene.seut.bBox_X, scene.seut.bBox_Y, scene.seut.bBox_Z, scene.seut.gridScale)
+
+
+def build_bbox_batch(scene):
+    """Creates the line batch of the bounding box"""
+
+    factor = get_grid_factor(scene)
+    x = scene.seut.bBox_X * factor
+    y = scene.seut.bBox_Y * factor
+    z = scene.seut.bBox_Z * factor
+
+    coords = (
+        (-x/2, -y/2, -z/2), (+x/2, -y/2, -z/2),
+        (-x/2, +y/2, -z/2), (+x/2, +y/2, -z/2),
+        (-x/2, -y/2, +z/2), (+x/2, -y/2, +z/2),
+        (-x/2, +y/2, +z/2), (+x/2, +y/2, +z/2)
+    )
+
+    return batch_for_shader(get_shader(), 'LINES', {"pos": coords}, indices=bbox_indices)
+
+
+def get_mountpoint_signature(scene) -> tuple:
+    areas = tuple((area.side, area.x, area.y, area.xDim, area.yDim) for area in scene.seut.mountpointAreas if area.enabled)
+    return get_bbox_signature(scene) + areas
+
+
+def build_mountpoint_batch(scene):
+    """Creates a triangle batch of all saved mountpoint areas, placed on the faces of the bounding box"""
+
+    factor = get_grid_factor(scene)
+    half_extents = (scene.seut.bBox_X * factor / 2, scene.seut.bBox_Y * factor / 2, scene.seut.bBox_Z * factor / 2)
+
+    coords = []
+    indices = []
+    for area in scene.seut.mountpointAreas:
+        if not area.enabled:
+            continue
+
+        normal, axis_x, axis_y = mountpoint_sides[area.side]
+        # Slightly in front of the face to avoid z-fighting with the model's surface.
+        depth = sum(abs(n) * h for n, h in zip(normal, half_extents)) + 0.002 * factor
+
+        start = len(coords)
+        for sx, sy in ((-1, -1), (1, -1), (1, 1), (-1, 1)):
+            px = area.x + sx * area.xDim / 2
+            py = area.y + sy * area.yDim / 2
+            coords.append(tuple(n * depth + ax * px + ay * py for n, ax, ay in zip(normal, axis_x, axis_y)))
+        indices.append((start, start + 1, start + 2))
+        indices.append((start, start + 2, start + 3))
+
+    return batch_for_shader(get_shader(), 'TRIS', {"pos": coords}, indices=indices)
+
+
+def get_mirroring_planes(scene) -> dict:
+    """Returns the corners of the planes visualizing the three mirroring axes, in the layout setup_mirroring() places the empties in"""
+
+    factor = get_grid_factor(scene)
+    size = max(1, scene.seut.bBox_X, scene.seut.bBox_Y, scene.seut.bBox_Z)
+    half = size * factor
+    center = (size * 2 + size / 2) * factor / 2
+
+    return {
+        'mirror_x': ((center, -half, -half), (center, half, -half), (center, half, half), (center, -half, half)),
+        'mirror_y': ((-half, center, -half), (half, center, -half), (half, center, half), (-half, center, half)),
+        'mirror_z': ((-half, -half, center), (half, -half, center), (half, half, center), (-half, half, center))
+    }
+
+
+def build_plane_batch(corners):
+    return batch_for_shader(get_shader(), 'TRIS', {"pos": corners}, indices=((0, 1, 2), (0, 2, 3)))
+
+
+def draw_batch(batch, color):
+    shader = get_shader()
+    shader.bind()
+    shader.uniform_float("color", color)
+    batch.draw(shader)
+
+
+# The line drawing is **heavily** based on Jayanam's "Blender 2.8 Python GPU : Draw Lines"-video:
+# https://www.youtube.com/watch?v=EgrgEoNFNsA
+def draw_overlays():
+    """Draws the bounding box, the saved mountpoint areas and the mirroring planes of the active scene"""
+
+    context = bpy.context
+    scene = context.scene
+    wm = context.window_manager
+
+    if scene is None or wm is None or not scene.seut.sceneType == 'mainScene':
+        return
+
+    try:
+        gpu.state.blend_set('ALPHA')
+
+        if wm.seut.bBoxToggle == 'on':
+            batch = get_batch((scene.name, 'bbox'), get_bbox_signature(scene), lambda: build_bbox_batch(scene))
+            draw_batch(batch, tuple(wm.seut.bboxColor))
+
+            # While Mountpoint Mode is active, the areas are represented by editable planes instead.
+            if scene.seut.mountpointToggle == 'off' and len(scene.seut.mountpointAreas) > 0:
+                gpu.state.depth_test_set('LESS_EQUAL')
+                batch = get_batch((scene.name, 'mountpoints'), get_mountpoint_signature(scene), lambda: build_mountpoint_batch(scene))
+                draw_batch(batch, overlay_colors['mountpoint'])
+                gpu.state.depth_test_set('NONE')
+
+        if scene.seut.mirroringToggle == 'on':
+            gpu.state.depth_test_set('LESS_EQUAL')
+            signature = get_bbox_signature(scene)
+            for key, corners in get_mirroring_planes(scene).items():
+                batch = get_batch((scene.name, key), signature, lambda: build_plane_batch(corners))
+                draw_batch(batch, overlay_colors[key])
+            gpu.state.depth_test_set('NONE')
+
+        gpu.state.blend_set('NONE')
+
+    except:
+        gpu.state.depth_test_set('NONE')
+        gpu.state.blend_set('NONE')
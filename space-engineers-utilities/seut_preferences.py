@@ -160,6 +160,10 @@ def update_havok_path(self, context):
     self.havok_path = verify_tool_path(self, context, path, "Havok Stand Alone Filter Manager", filename)
 
     save_addon_prefs()
+
+
+def update_staging_path(self, context):
+    save_addon_prefs()
     
 
 class SEUT_AddonPreferences(AddonPreferences):
@@ -195,6 +199,12 @@ class SEUT_AddonPreferences(AddonPreferences):
         description="This tool converts the individual 'loose files' that the export yields into MWM files the game can read",
         subtype='FILE_PATH'
     )
+    staging_path: StringProperty(
+        name="Staging Directory",
+        description="Temporary files created during export are written to a new folder within this directory. Point it to a RAM disk to keep them off the disk. If empty, the system's temporary folder is used",
+        subtype='DIR_PATH',
+        update=update_staging_path
+    )
 
     def draw(self, context):
         layout = self.layout
@@ -360,6 +370,7 @@ class SEUT_AddonPreferences(AddonPreferences):
         box = layout.box()
         box.label(text="External Tools", icon='TOOL_SETTINGS')
         box.prop(self, "havok_path", text="Havok File Manager", expand=True)
+        box.prop(self, "staging_path", expand=True)
 
 
 def load_icons():
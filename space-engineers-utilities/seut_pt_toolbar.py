@@ -5,6 +5,7 @@ from bpy.types  import Panel
 
 from .utils.seut_patch_blend        import check_patch_needed
 from .seut_collections              import get_collections, seut_collections
+from .seut_statistics               import get_scene_statistics, get_budget_issues
 from .seut_utils                    import get_enum_items, wrap_text
 
 
@@ -204,13 +205,25 @@ class SEUT_PT_Panel_Collections(Panel):
             row.prop(active_col.seut,'ref_col', text="")
 
             if active_col.seut.col_type == 'lod':
-                box.prop(active_col.seut,'lod_distance')
+                row = box.row(align=True)
+                row.prop(active_col.seut,'lod_distance')
+                row.operator('scene.advise_lod_distances', text="", icon='DRIVER_DISTANCE')
+                box.operator('scene.build_texture_atlas', icon='TEXTURE')
+            elif active_col.seut.col_type == 'hkt':
+                box.operator('scene.generate_convex_collision', icon='MESH_ICOSPHERE')
+                box.operator('scene.fit_collision_primitives', icon='MESH_CYLINDER')
+                if context.active_object is not None and context.active_object.type == 'MESH' and active_col in context.active_object.users_collection:
+                    box.prop(context.active_object.seut, 'collision_shape')
+
+        if active_col.seut.col_type in ['lod', 'bs']:
+            box.operator('scene.cull_hidden_faces', icon='HIDE_ON')
 
         if show_button:
             row = layout.row()
             row.scale_y = 1.5
             row.operator('scene.create_collection')
             layout.operator('scene.recreate_collections', icon='OUTLINER')
+            layout.operator('scene.generate_lods', icon='MOD_DECIM')
 
 
 class SEUT_PT_Panel_BoundingBox(Panel):
@@ -244,6 +257,7 @@ class SEUT_PT_Panel_BoundingBox(Panel):
             row.prop(scene.seut, "bBox_X")
             row.prop(scene.seut, "bBox_Y")
             row.prop(scene.seut, "bBox_Z")
+            box.operator('object.bbox_auto_fit', icon='FULLSCREEN_ENTER')
 
             row = box.row()
             row.prop(wm.seut, 'bboxColor', text="")
@@ -327,8 +341,10 @@ class SEUT_PT_Panel_Mountpoints(Panel):
                         box.prop(context.active_object.seut, 'properties_mask')
                 
             layout.operator('scene.add_mountpoint_area', icon='ADD')
+            layout.operator('scene.generate_mountpoint_areas', icon='AUTO')
         else:
             layout.prop(scene.seut, 'mountpointToggle', expand=True)
+            layout.operator('scene.generate_mountpoint_areas', icon='AUTO')
         
 
 class SEUT_PT_Panel_IconRender(Panel):
@@ -353,6 +369,7 @@ class SEUT_PT_Panel_IconRender(Panel):
         wm = context.window_manager
         
         layout.prop(scene.seut, 'renderToggle', expand=True)
+        layout.operator('scene.icon_render_batch', icon='RENDERLAYERS')
 
         camera = None
         for cam in bpy.data.cameras:
@@ -405,6 +422,72 @@ class SEUT_PT_Panel_IconRender(Panel):
             box.prop(scene.render, 'filepath', text="Folder", expand=True)
 
 
+class SEUT_PT_Panel_Statistics(Panel):
+    """Creates the statistics panel for SEUT"""
+    bl_idname = "SEUT_PT_Panel_Statistics"
+    bl_label = "Statistics"
+    bl_category = "SEUT"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_options = {'DEFAULT_CLOSED'}
+
+
+    @classmethod
+    def poll(cls, context):
+        scene = context.scene
+        return scene.seut.sceneType in ['mainScene', 'subpart', 'character'] and check_display_panels(context)
+
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        statistics = get_scene_statistics(scene, context.evaluated_depsgraph_get())
+
+        for name, stats in statistics.items():
+            issues = get_budget_issues(scene, stats)
+
+            box = layout.box()
+            box.label(text=name, icon='ERROR' if issues != [] else 'OUTLINER_COLLECTION')
+
+            if stats['type'] == 'hkt':
+                row = box.row()
+                row.alert = 'objects' in issues
+                row.label(text=f"Shapes: {stats['objects']}")
+                continue
+
+            col = box.column(align=True)
+            row = col.row()
+            row.alert = 'triangles' in issues
+            row.label(text=f"Triangles: {stats['triangles']:,}")
+            col.label(text=f"Vertices: {stats['vertices']:,}")
+            row = col.row()
+            row.alert = 'materials' in issues
+            row.label(text=f"Materials: {len(stats['materials'])}")
+            col.label(text=f"UV Islands: {stats['uv_islands']:,}")
+            row = col.row()
+            row.alert = 'texture_memory' in issues
+            row.label(text=f"Texture Memory: {stats['texture_memory'] / 1024 ** 2:.1f} MB")
+            if 'lod_ratio' in stats:
+                row = col.row()
+                row.alert = 'lod_ratio' in issues
+                row.label(text=f"Reduction: {stats['lod_ratio']:.0%} of Reference")
+
+        # Budgets
+        box = layout.box()
+        box.label(text="Budgets", icon='SETTINGS')
+        col = box.column(align=True)
+        col.prop(scene.seut, "stats_budget_triangles")
+        col.prop(scene.seut, "stats_budget_materials")
+        col.prop(scene.seut, "stats_budget_texture_memory")
+        col.prop(scene.seut, "stats_budget_collision_shapes")
+        col.prop(scene.seut, "stats_budget_lod_ratio")
+
+        layout.operator('scene.export_statistics', icon='EXPORT')
+        layout.operator('scene.analyze_texture_budget', icon='TEXTURE')
+        layout.operator('scene.audit_mod_assets', icon='VIEWZOOM')
+
+
 class SEUT_PT_Panel_Export(Panel):
     """Creates the export panel for SEUT"""
     bl_idname = "SEUT_PT_Panel_Export"
@@ -451,6 +534,17 @@ class SEUT_PT_Panel_Export(Panel):
         row = box.row()
         row.prop(scene.seut, "export_sbc_type", expand=True)
 
+        if scene.seut.sceneType in ['mainScene', 'subpart']:
+            row = box.row()
+            row.prop(scene.seut, "export_backend", expand=True)
+            if scene.seut.export_backend == 'mwmbuilder':
+                box.prop(scene.seut, "export_optimize_meshes", icon='MOD_DECIM')
+                box.prop(scene.seut, "export_merge_objects", icon='AUTOMERGE_OFF')
+                row = box.row(align=True)
+                row.prop(scene.seut, "export_lod_textures", icon='IMAGE_DATA')
+                if scene.seut.export_lod_textures:
+                    row.prop(scene.seut, "export_lod_textures_start")
+
         if scene.seut.sceneType != 'character' and scene.seut.sceneType != 'character_anmiation':
             box2 = box.box()
             box2.label(text="Grid Export", icon='GRID')
@@ -495,6 +589,7 @@ class SEUT_PT_Panel_Import(Panel):
         row.operator('scene.import', icon='IMPORT')
 
         layout.operator('scene.import_complete', icon='IMPORT')
+        layout.operator('scene.import_mwm', icon='IMPORT')
         
         box = layout.box()
         box.label(text='Options', icon='SETTINGS')
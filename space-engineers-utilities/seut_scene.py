@@ -16,6 +16,7 @@ from bpy.props  import (EnumProperty,
 from .seut_mirroring                import clean_mirroring, setup_mirroring
 from .seut_mountpoints              import clean_mountpoints, setup_mountpoints
 from .seut_icon_render              import clean_icon_render, setup_icon_render
+from .seut_overlays                 import tag_redraw
 from .seut_collections              import get_collections, rename_collections, seut_collections
 from .seut_errors                   import get_abs_path, seut_report, check_export
 from .seut_utils                    import link_subpart_scene, unlink_subpart_scene, to_radians, get_parent_collection, toggle_scene_modes
@@ -65,7 +66,11 @@ def update_GridScale(self, context):
                     space.overlay.grid_scale = scale
                     break
 
-    bpy.ops.object.bbox('INVOKE_DEFAULT')
+    tag_redraw(context)
+
+
+def update_BBox(self, context):
+    tag_redraw(context)
 
 
 def update_MirroringToggle(self, context):
@@ -411,19 +416,22 @@ class SEUT_Scene(PropertyGroup):
         name="X:",
         description="",
         default=1,
-        min=1
+        min=1,
+        update=update_BBox
     )
     bBox_Y: IntProperty(
         name="Y:",
         description="",
         default=1,
-        min=1
+        min=1,
+        update=update_BBox
     )
     bBox_Z: IntProperty(
         name="Z:",
         description="",
         default=1,
-        min=1
+        min=1,
+        update=update_BBox
     )
 
     # Mirroing
@@ -582,6 +590,37 @@ class SEUT_Scene(PropertyGroup):
             ),
         default='update'
     )
+    export_backend: EnumProperty(
+        name='Backend',
+        description="How the MWM files of this scene are created",
+        items=(
+            ('mwmbuilder', 'MWM Builder', 'Export to FBX and XML and compile them to MWM with MWM Builder.'),
+            ('native', 'Native', 'Experimental: Write the MWM files directly from the evaluated meshes. Collision is still created by Havok.')
+            ),
+        default='mwmbuilder'
+    )
+    export_optimize_meshes: BoolProperty(
+        name="Optimize Vertex Cache",
+        description="Reorders the triangles of every material and the vertices of the exported meshes so the GPU can reuse already transformed vertices.\nOnly the exported FBX is affected, not the scene",
+        default=False
+    )
+    export_merge_objects: BoolProperty(
+        name="Merge LOD Objects",
+        description="Merges the meshes of LOD and Build Stage collections into a single object on export, so every material only costs one draw call.\nObjects with children, highlights or armatures are kept separate. Only the exported FBX is affected, not the scene",
+        default=False
+    )
+    export_lod_textures: BoolProperty(
+        name="Reduced LOD Textures",
+        description="Materials only used by LODs refer to textures with half or a quarter of the resolution, converted next to the full resolution ones",
+        default=False
+    )
+    export_lod_textures_start: IntProperty(
+        name="From LOD",
+        description="The first LOD to use half resolution textures. The next ones use a quarter",
+        default=2,
+        min=1,
+        max=5
+    )
     export_rescaleFactor: FloatProperty(
         name="Rescale Factor:",
         description="What to set the Rescale Factor to",
@@ -601,6 +640,40 @@ class SEUT_Scene(PropertyGroup):
         update=update_mod_path
     )
 
+    # Statistics
+    stats_budget_triangles: IntProperty(
+        name="Triangles",
+        description="How many triangles a single collection may contain before it is flagged. 0 to disable",
+        default=20000,
+        min=0
+    )
+    stats_budget_materials: IntProperty(
+        name="Materials",
+        description="How many materials (and with that draw calls) a single collection may use before it is flagged. 0 to disable",
+        default=8,
+        min=0
+    )
+    stats_budget_texture_memory: IntProperty(
+        name="Texture Memory (MB)",
+        description="How much video memory the textures of a single collection may occupy before it is flagged. 0 to disable",
+        default=64,
+        min=0
+    )
+    stats_budget_collision_shapes: IntProperty(
+        name="Collision Shapes",
+        description="How many shapes a single collision collection may contain before it is flagged. 0 to disable",
+        default=10,
+        min=0
+    )
+    stats_budget_lod_ratio: FloatProperty(
+        name="LOD Ratio",
+        description="Share of the triangles of its reference a LOD may keep before it is flagged. 0 to disable",
+        default=0.75,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR'
+    )
+
     # These are pre 0.9.95 legacy, not directly used anymore --> moved to being saved onto collections
     export_lod1Distance: IntProperty(
         name="LOD1:",
@@ -721,3 +794,8 @@ class SEUT_Scene(PropertyGroup):
         max=10,
         update=update_renderDistance
     )
+    render_hash: StringProperty(
+        name="Icon Hash",
+        description="Hash of the model and render options the last batch rendered icon of this scene was created from",
+        default=""
+    )
@@ -0,0 +1,385 @@
+import bpy
+import os
+import json
+import time
+import numpy as np
+
+from bpy.types          import Operator
+from bpy.props          import StringProperty, BoolProperty
+from bpy.app.handlers   import persistent
+from bpy_extras.io_utils import ExportHelper
+
+from .export.seut_export_mwm        import texture_types
+from .utils.seut_dds                import get_dds_file_memory
+from .utils.seut_texture_budget     import analyze_mod
+from .utils.seut_asset_audit        import audit_mod, deduplicate
+from .seut_collections              import get_collections
+from .seut_errors                   import seut_report, get_abs_path
+from .seut_utils                    import get_preferences, create_relative_path
+
+
+statistics_types = ['main', 'bs', 'lod', 'hkt']
+
+# Statistics per collection name. Entries are dropped by the depsgraph handler when the geometry they are based on changes.
+statistics_cache = {}
+
+
+class SEUT_OT_ExportStatistics(Operator, ExportHelper):
+    """Exports the statistics of all SEUT scenes in this file to a JSON file. Blocks already in the file are updated, so it can collect the statistics of a whole mod"""
+    bl_idname = "scene.export_statistics"
+    bl_label = "Export Statistics"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(
+        default="*.json",
+        options={'HIDDEN'}
+    )
+
+
+    def invoke(self, context, event):
+        scene = context.scene
+        if scene.seut.mod_path != "":
+            self.filepath = os.path.join(get_abs_path(scene.seut.mod_path), "SEUT_Statistics.json")
+
+        return ExportHelper.invoke(self, context, event)
+
+
+    def execute(self, context):
+
+        data = {}
+        if os.path.isfile(self.filepath):
+            try:
+                with open(self.filepath, 'r') as file:
+                    data = json.load(file)
+            except (EnvironmentError, ValueError):
+                data = {}
+
+        count = 0
+        for scn in bpy.data.scenes:
+            if scn.seut.sceneType not in ['mainScene', 'subpart', 'character'] or scn.seut.subtypeId == "":
+                continue
+
+            depsgraph = scn.view_layers['SEUT'].depsgraph if 'SEUT' in scn.view_layers else None
+            data[scn.seut.subtypeId] = {
+                'scene': scn.name,
+                'file': bpy.data.filepath,
+                'collections': get_scene_statistics(scn, depsgraph)
+            }
+            count += 1
+
+        try:
+            with open(self.filepath, 'w') as file:
+                json.dump(data, file, indent=4, sort_keys=True)
+        except EnvironmentError as error:
+            seut_report(self, context, 'ERROR', True, 'E054', self.filepath, error)
+            return {'CANCELLED'}
+
+        seut_report(self, context, 'INFO', True, 'I036', count, self.filepath)
+
+        return {'FINISHED'}
+
+
+class SEUT_OT_AnalyzeTextureBudget(Operator):
+    """Lists the video memory and disk space the textures of the mod use, per block, per material and per texture, in a JSON file in the mod folder"""
+    bl_idname = "scene.analyze_texture_budget"
+    bl_label = "Analyze Texture Budget"
+    bl_options = {'REGISTER'}
+
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.seut.mod_path != ""
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        mod_path = get_abs_path(scene.seut.mod_path)
+
+        if not os.path.isdir(mod_path):
+            seut_report(self, context, 'ERROR', True, 'E003', "Mod", mod_path)
+            return {'CANCELLED'}
+
+        start = time.time()
+        results = analyze_mod(mod_path)
+        path = os.path.join(mod_path, "SEUT_TextureBudget.json")
+
+        try:
+            with open(path, 'w') as file:
+                json.dump(results, file, indent=4, sort_keys=True)
+        except EnvironmentError as error:
+            seut_report(self, context, 'ERROR', True, 'E054', path, error)
+            return {'CANCELLED'}
+
+        print(f"SEUT: Texture budget analyzed in {round(time.time() - start, 3)}s.")
+        for category in ['blocks', 'materials', 'textures']:
+            entries = sorted(results[category].items(), key=lambda entry: entry[1]['memory'], reverse=True)
+            for name, entry in entries[:5]:
+                print(f"SEUT: {category.capitalize()[:-1]} '{name}' uses {round(entry['memory'] / 1024 ** 2, 1)} MB video memory.")
+
+        total = results['total']
+        seut_report(self, context, 'INFO', True, 'I041', total['textures'], f"{round(total['memory'] / 1024 ** 2, 1)} MB", f"{round(total['disk'] / 1024 ** 2, 1)} MB")
+
+        return {'FINISHED'}
+
+
+class SEUT_OT_AuditModAssets(Operator):
+    """Lists the textures and models of the mod no definition references and the groups of byte-identical ones, in a JSON file in the mod folder"""
+    bl_idname = "scene.audit_mod_assets"
+    bl_label = "Audit Mod Assets"
+    bl_options = {'REGISTER'}
+
+
+    deduplicate: BoolProperty(
+        name="Deduplicate",
+        description="Rewrites all references to duplicate files in definitions, XMLs and MWMs to point at one file of each group. The duplicates are not deleted",
+        default=False
+    )
+
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.seut.mod_path != ""
+
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+
+    def execute(self, context):
+
+        scene = context.scene
+        mod_path = get_abs_path(scene.seut.mod_path)
+
+        if not os.path.isdir(mod_path):
+            seut_report(self, context, 'ERROR', True, 'E003', "Mod", mod_path)
+            return {'CANCELLED'}
+
+        results = audit_mod(mod_path)
+        path = os.path.join(mod_path, "SEUT_AssetAudit.json")
+
+        try:
+            with open(path, 'w') as file:
+                json.dump(results, file, indent=4, sort_keys=True)
+        except EnvironmentError as error:
+            seut_report(self, context, 'ERROR', True, 'E054', path, error)
+            return {'CANCELLED'}
+
+        seut_report(self, context, 'INFO', True, 'I042', len(results['unreferenced']), len(results['duplicates']), f"{round((results['unreferenced_size'] + results['duplicate_size']) / 1024 ** 2, 1)} MB")
+
+        if self.deduplicate:
+            count, files, failed = deduplicate(mod_path, results['duplicates'], results['unreferenced'])
+            for file_path, error in failed:
+                seut_report(self, context, 'WARNING', False, 'W023', file_path, error)
+            seut_report(self, context, 'INFO', True, 'I043', count, files)
+
+        return {'FINISHED'}
+
+
+@persistent
+def statistics_handler(scene, depsgraph):
+    """Drops the cached statistics of collections whose geometry, contents or materials changed"""
+
+    if statistics_cache == {}:
+        return
+
+    for update in depsgraph.updates:
+        if isinstance(update.id, (bpy.types.Material, bpy.types.Image)):
+            statistics_cache.clear()
+            return
+
+        elif isinstance(update.id, bpy.types.Collection):
+            statistics_cache.pop(update.id.original.name, None)
+
+        # Moving an object does not change what it costs, so only changes to its geometry count.
+        elif isinstance(update.id, bpy.types.Object) and update.is_updated_geometry:
+            for col in update.id.original.users_collection:
+                statistics_cache.pop(col.name, None)
+
+
+def count_components(count: int, a: np.ndarray, b: np.ndarray) -> int:
+    """Returns the number of connected components of a graph with the given number of nodes and edges from a to b"""
+
+    labels = np.arange(count)
+
+    while True:
+        la, lb = labels[a], labels[b]
+        low, high = np.minimum(la, lb), np.maximum(la, lb)
+        changed = low != high
+        if not np.any(changed):
+            break
+
+        # Hooks the roots onto each other, then flattens the trees so every node points to its root directly.
+        np.minimum.at(labels, high[changed], low[changed])
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    return len(np.unique(labels))
+
+
+def count_uv_islands(mesh) -> int:
+    """Returns the number of UV islands of a mesh. Loops are connected if they share a face, or a vertex and its UV coordinates"""
+
+    if mesh.uv_layers.active is None or len(mesh.loops) == 0:
+        return 0
+
+    loop_count = len(mesh.loops)
+    uvs = np.empty(loop_count * 2, dtype=np.float32)
+    mesh.uv_layers.active.data.foreach_get('uv', uvs)
+    vertex_indices = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', vertex_indices)
+    starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', starts)
+    totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', totals)
+
+    uvs = np.round(uvs.reshape(-1, 2) * 1e5).astype(np.int64)
+    keys = np.column_stack((vertex_indices, uvs))
+    nodes = np.unique(keys, axis=0, return_inverse=True)[1].ravel()
+
+    # Consecutive loops of a face are connected.
+    offsets = np.repeat(starts - np.cumsum(totals) + totals, totals)
+    face_loops = offsets + np.arange(totals.sum())
+    face_ids = np.repeat(np.arange(len(totals)), totals)
+    same_face = face_ids[:-1] == face_ids[1:]
+
+    return count_components(nodes.max() + 1, nodes[face_loops[:-1][same_face]], nodes[face_loops[1:][same_face]])
+
+
+def get_texture_dds_path(scene, image):
+    """Returns the path to the DDS file an image is exported as, None if it can't be found"""
+
+    preferences = get_preferences()
+    path = get_abs_path(image.filepath)
+    candidates = []
+
+    if path.lower().endswith('.dds'):
+        candidates.append(path)
+
+    rel_path = create_relative_path(path, "Textures")
+    if rel_path:
+        rel_path = os.path.splitext(rel_path)[0] + '.dds'
+        candidates.append(os.path.join(get_abs_path(scene.seut.mod_path), rel_path))
+        if preferences.game_path != "":
+            candidates.append(os.path.join(get_abs_path(preferences.game_path), 'Content', rel_path))
+
+    candidates.append(os.path.splitext(path)[0] + '.dds')
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+
+    return None
+
+
+def get_material_textures(scene, material) -> dict:
+    """Returns the DDS files of the textures of a material, with their video memory"""
+
+    textures = {}
+    if material is None or material.node_tree is None:
+        return textures
+
+    for node in material.node_tree.nodes:
+        if node.type == 'TEX_IMAGE' and node.name in texture_types and node.image is not None:
+            path = get_texture_dds_path(scene, node.image)
+            if path is not None:
+                textures[path] = get_dds_file_memory(path)
+
+    return textures
+
+
+def get_collection_statistics(scene, collection, depsgraph) -> dict:
+    """Counts what the geometry of a collection costs ingame"""
+
+    stats = {
+        'type': collection.seut.col_type,
+        'objects': 0,
+        'triangles': 0,
+        'vertices': 0,
+        'uv_islands': 0,
+        'materials': [],
+        'textures': {}
+    }
+
+    materials = set()
+    for obj in collection.objects:
+        if obj.type != 'MESH':
+            continue
+
+        stats['objects'] += 1
+        obj_eval = obj.evaluated_get(depsgraph) if depsgraph is not None else obj
+        mesh = obj_eval.to_mesh()
+        mesh.calc_loop_triangles()
+
+        stats['triangles'] += len(mesh.loop_triangles)
+        stats['vertices'] += len(mesh.vertices)
+        stats['uv_islands'] += count_uv_islands(mesh)
+
+        # Only materials actually assigned to faces cause a draw call.
+        material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('material_index', material_indices)
+        for idx in np.unique(material_indices):
+            if idx < len(obj.material_slots) and obj.material_slots[idx].material is not None:
+                materials.add(obj.material_slots[idx].material)
+
+        obj_eval.to_mesh_clear()
+
+    stats['materials'] = sorted(mat.name for mat in materials)
+    for mat in materials:
+        stats['textures'].update(get_material_textures(scene, mat))
+
+    return stats
+
+
+def get_scene_statistics(scene, depsgraph) -> dict:
+    """Returns the statistics of all Main, BS, LOD and collision collections of a scene, using the cache where possible"""
+
+    collections = get_collections(scene)
+    statistics = {}
+
+    for col_type in statistics_types:
+        if col_type not in collections or collections[col_type] is None:
+            continue
+
+        for col in collections[col_type]:
+            if col.name not in statistics_cache:
+                statistics_cache[col.name] = get_collection_statistics(scene, col, depsgraph)
+            statistics[col.name] = dict(statistics_cache[col.name])
+
+    # LODs are compared against the collection they reference.
+    if collections.get('lod') is not None:
+        for col in collections['lod']:
+            ref_col = col.seut.ref_col
+            if ref_col is not None and ref_col.name in statistics and statistics[ref_col.name]['triangles'] > 0:
+                statistics[col.name]['lod_ratio'] = statistics[col.name]['triangles'] / statistics[ref_col.name]['triangles']
+
+    for stats in statistics.values():
+        stats['texture_memory'] = sum(stats['textures'].values())
+
+    return statistics
+
+
+def get_budget_issues(scene, stats: dict) -> list:
+    """Returns which budgets of the scene the statistics of a collection exceed"""
+
+    issues = []
+
+    if stats['type'] == 'hkt':
+        if scene.seut.stats_budget_collision_shapes > 0 and stats['objects'] > scene.seut.stats_budget_collision_shapes:
+            issues.append('objects')
+        return issues
+
+    if scene.seut.stats_budget_triangles > 0 and stats['triangles'] > scene.seut.stats_budget_triangles:
+        issues.append('triangles')
+    if scene.seut.stats_budget_materials > 0 and len(stats['materials']) > scene.seut.stats_budget_materials:
+        issues.append('materials')
+    if scene.seut.stats_budget_texture_memory > 0 and stats['texture_memory'] > scene.seut.stats_budget_texture_memory * 1024 ** 2:
+        issues.append('texture_memory')
+    if scene.seut.stats_budget_lod_ratio > 0 and stats.get('lod_ratio', 0.0) > scene.seut.stats_budget_lod_ratio:
+        issues.append('lod_ratio')
+
+    return issues
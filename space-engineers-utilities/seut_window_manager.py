@@ -15,10 +15,11 @@ from bpy.props  import (EnumProperty,
 
 from .seut_errors   import seut_report, get_abs_path
 from .seut_utils    import get_preferences
+from .seut_overlays import tag_redraw
 
 
 def update_BBox(self, context):
-    bpy.ops.object.bbox('INVOKE_DEFAULT')
+    tag_redraw(context)
 
 
 def update_simpleNavigationToggle(self, context):
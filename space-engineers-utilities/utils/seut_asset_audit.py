@@ -0,0 +1,281 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import xml.etree.ElementTree as ET
+
+from concurrent.futures import ThreadPoolExecutor
+
+# The audit can also be run as a standalone script over a mod folder, outside of Blender.
+try:
+    from .seut_mwm_format       import replace_mwm_paths
+    from .seut_mwm_inspector    import normalize_model_path
+    from .seut_texture_budget   import find_files, get_relative_key, normalize_texture_path, read_model
+except ImportError:
+    from seut_mwm_format        import replace_mwm_paths
+    from seut_mwm_inspector     import normalize_model_path
+    from seut_texture_budget    import find_files, get_relative_key, normalize_texture_path, read_model
+
+
+# Matches the text content and attribute values of XML and SBC files.
+xml_value = re.compile(r'(?<=[>"\'])([^<>"\']+)(?=[<"\'])')
+
+
+def get_reference_key(value: str):
+    """Returns the key of the texture or model a path in a definition refers to, None if it refers to neither"""
+
+    value = value.strip()
+    extension = os.path.splitext(value)[1].lower()
+
+    if extension == '.dds':
+        return normalize_texture_path(value)
+    elif extension == '.mwm':
+        return normalize_model_path(value)
+
+    return None
+
+
+def get_material_textures(material) -> set:
+    return set(normalize_texture_path(param.text) for param in material.iter('Parameter') if param.get('Name', "").endswith('Texture') and param.text)
+
+
+def build_reference_graph(root: str) -> tuple:
+    """Returns the references between the files of a mod as dict of sets, and the files the definitions reference directly.
+    Models are keyed by their path relative to the mod without extension, textures by their path, materials of MaterialsLibs by name"""
+
+    graph = {}
+    roots = set()
+
+    for path in find_files(os.path.join(root, 'Data'), '.sbc'):
+        try:
+            tree = ET.parse(path)
+        except (EnvironmentError, ET.ParseError):
+            continue
+
+        # Model, Icon, BuildProgressModels and TransparentMaterials entries, plus any other definition that points at a model or texture.
+        for element in tree.iter():
+            for value in [element.text or ""] + list(element.attrib.values()):
+                key = get_reference_key(value)
+                if key is not None:
+                    roots.add(key)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        paths = find_files(os.path.join(root, 'Models'), '.mwm')
+        for path, model in zip(paths, executor.map(read_model, paths, chunksize=16)):
+            references = graph.setdefault(normalize_model_path(get_relative_key(root, path)), set())
+            references.update(model['lods'])
+            for textures in model['materials'].values():
+                references.update(textures)
+
+    for path in find_files(root, '.xml'):
+        try:
+            tree = ET.parse(path)
+        except (EnvironmentError, ET.ParseError):
+            continue
+
+        if tree.getroot().tag == 'MaterialsLib':
+            for material in tree.iter('Material'):
+                graph.setdefault(f"material:{material.get('Name')}", set()).update(get_material_textures(material))
+
+        # Model XMLs are the input of the MWM of the same name and pull in the files it was built from.
+        elif tree.getroot().tag == 'Model':
+            references = graph.setdefault(normalize_model_path(get_relative_key(root, path)), set())
+            for material in tree.iter('Material'):
+                references.update(get_material_textures(material))
+            for material_ref in tree.iter('MaterialRef'):
+                references.add(f"material:{material_ref.get('Name')}")
+            for lod in tree.iter('LOD'):
+                if lod.findtext('Model'):
+                    references.add(normalize_model_path(lod.findtext('Model')))
+
+    return graph, roots
+
+
+def get_referenced(graph: dict, roots: set) -> set:
+    """Returns everything reachable from the roots of the reference graph"""
+
+    referenced = set()
+    stack = list(roots)
+    while stack:
+        key = stack.pop()
+        if key in referenced:
+            continue
+        referenced.add(key)
+        stack.extend(graph.get(key, []))
+
+    return referenced
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 ** 2), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def find_duplicates(paths: list, workers: int = 16) -> list:
+    """Returns groups of byte-identical files. Only files sharing their size with another one are hashed"""
+
+    sizes = {}
+    for path in paths:
+        sizes.setdefault(os.path.getsize(path), []).append(path)
+
+    candidates = [path for group in sizes.values() if len(group) > 1 for path in group]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        hashes = executor.map(hash_file, candidates)
+
+    groups = {}
+    for path, digest in zip(candidates, hashes):
+        groups.setdefault(digest, []).append(path)
+
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+def audit_mod(root: str) -> dict:
+    """Returns the textures and models of a mod no definition references and the groups of byte-identical ones among them"""
+
+    graph, roots = build_reference_graph(root)
+    referenced = get_referenced(graph, roots)
+
+    textures = find_files(os.path.join(root, 'Textures'), '.dds')
+    models = find_files(os.path.join(root, 'Models'), '.mwm')
+
+    unreferenced = [path for path in textures if normalize_texture_path(get_relative_key(root, path)) not in referenced]
+    unreferenced += [path for path in models if normalize_model_path(get_relative_key(root, path)) not in referenced]
+
+    # Textures and models are compared separately, as a reference can't be switched from one to the other.
+    duplicates = find_duplicates(textures) + find_duplicates(models)
+
+    return {
+        'unreferenced': sorted(get_relative_key(root, path) for path in unreferenced),
+        'duplicates': [[get_relative_key(root, path) for path in group] for group in duplicates],
+        'unreferenced_size': sum(os.path.getsize(path) for path in unreferenced),
+        'duplicate_size': sum(os.path.getsize(group[0]) * (len(group) - 1) for group in duplicates)
+    }
+
+
+def get_replacements(duplicates: list, unreferenced: list) -> dict:
+    """Returns the key of every duplicate and the path it is replaced with. Each group keeps a referenced file, if it has one"""
+
+    unreferenced = set(unreferenced)
+    replacements = {}
+
+    for group in duplicates:
+        kept = sorted(group, key=lambda path: (path in unreferenced, len(path), path))[0]
+        for path in group:
+            if path != kept:
+                replacements[get_reference_key(path)] = kept
+
+    return replacements
+
+
+def get_replacement(value: str, replacements: dict):
+    """Returns the path a reference is rewritten to, None if it stays. References to models keep whether they include the extension"""
+
+    stripped = value.strip()
+    extension = os.path.splitext(stripped)[1]
+
+    if extension.lower() == '.dds':
+        replacement = replacements.get(normalize_texture_path(stripped))
+    else:
+        replacement = replacements.get(normalize_model_path(stripped))
+        if replacement is not None and extension.lower() != '.mwm':
+            replacement = os.path.splitext(replacement)[0]
+
+    if replacement is None:
+        return None
+
+    return value.replace(stripped, replacement)
+
+
+def deduplicate(root: str, duplicates: list, unreferenced: list) -> tuple:
+    """Rewrites all references of definitions, XMLs and MWMs to duplicate files so they point at the one file kept of each group.
+    The duplicates themselves are left in place and show up as unreferenced afterwards. Returns the number of rewritten references and files, and the files that failed"""
+
+    replacements = get_replacements(duplicates, unreferenced)
+    if not replacements:
+        return 0, 0, []
+
+    count = files = 0
+    failed = []
+
+    for path in find_files(os.path.join(root, 'Data'), '.sbc') + find_files(root, '.xml'):
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as file:
+                content = file.read()
+
+            replaced = []
+            def replace(match):
+                replacement = get_replacement(match.group(1), replacements)
+                if replacement is None:
+                    return match.group(1)
+                replaced.append(replacement)
+                return replacement
+
+            content = xml_value.sub(replace, content)
+            if replaced:
+                with open(path, 'w', encoding='utf-8', newline='') as file:
+                    file.write(content)
+                count += len(replaced)
+                files += 1
+
+        except (EnvironmentError, UnicodeDecodeError) as error:
+            failed.append((path, str(error)))
+
+    for path in find_files(os.path.join(root, 'Models'), '.mwm'):
+        try:
+            replaced = replace_mwm_paths(path, lambda value: get_replacement(value, replacements))
+        except (EnvironmentError, ValueError) as error:
+            failed.append((path, str(error)))
+            continue
+
+        if replaced > 0:
+            count += replaced
+            files += 1
+
+    return count, files, failed
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024 ** 2:.1f} MB"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Lists the unreferenced and duplicate textures and models of a Space Engineers mod.")
+    parser.add_argument('path', help="Mod folder to audit")
+    parser.add_argument('-d', '--deduplicate', action='store_true', help="Rewrites references to duplicate files so they point at one file of each group")
+    parser.add_argument('-o', '--output', help="Writes the full results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = audit_mod(args.path)
+
+    print("Unreferenced files:")
+    for path in results['unreferenced']:
+        print(f"    {path}")
+
+    print("Duplicate files:")
+    for group in results['duplicates']:
+        print(f"    {', '.join(group)}")
+
+    print(f"{len(results['unreferenced'])} unreferenced files use {format_size(results['unreferenced_size'])}, {len(results['duplicates'])} groups of duplicates use {format_size(results['duplicate_size'])}.")
+
+    if args.deduplicate:
+        count, files, failed = deduplicate(args.path, results['duplicates'], results['unreferenced'])
+        for path, error in failed:
+            print(f"References in '{path}' could not be rewritten: {error}")
+        print(f"{count} references to duplicates rewritten in {files} files.")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4, sort_keys=True)
+
+    return 1 if args.deduplicate and failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import os
+import struct
+
+
+DDS_MAGIC = b'DDS '
+DDS_HEADER_SIZE = 128
+DDS_DX10_HEADER_SIZE = 20
+DDSCAPS2_CUBEMAP = 0x200
+DDPF_FOURCC = 0x4
+
+# Bytes per 4x4 block of block-compressed formats.
+fourcc_block_sizes = {
+    b'DXT1': 8,
+    b'ATI1': 8,
+    b'BC4U': 8,
+    b'BC4S': 8,
+    b'DXT2': 16,
+    b'DXT3': 16,
+    b'DXT4': 16,
+    b'DXT5': 16,
+    b'ATI2': 16,
+    b'BC5U': 16,
+    b'BC5S': 16
+}
+
+# DXGI formats of the DX10 header extension: bytes per 4x4 block for block-compressed formats, bits per pixel for the rest.
+dxgi_block_sizes = {70: 8, 71: 8, 72: 8, 79: 8, 80: 8, 81: 8}
+dxgi_block_sizes.update({f: 16 for f in list(range(73, 79)) + list(range(82, 85)) + list(range(94, 100))})
+dxgi_bits_per_pixel = {2: 128, 10: 64, 11: 64, 24: 32, 28: 32, 29: 32, 41: 32, 49: 16, 56: 16, 61: 8, 65: 8, 87: 32, 88: 32, 91: 32, 93: 32}
+
+
+def read_dds_header(path: str):
+    """Returns the dimensions and format of a DDS file as dict, None if it is not one. Only the headers are read"""
+
+    try:
+        with open(path, 'rb') as file:
+            data = file.read(len(DDS_MAGIC) + DDS_HEADER_SIZE + DDS_DX10_HEADER_SIZE)
+    except EnvironmentError:
+        return None
+
+    if len(data) < len(DDS_MAGIC) + DDS_HEADER_SIZE or data[:4] != DDS_MAGIC:
+        return None
+
+    height, width, pitch, depth, mips = struct.unpack_from('<5I', data, 12)
+    pf_flags, fourcc, bit_count = struct.unpack_from('<I4sI', data, 80)
+    caps2 = struct.unpack_from('<I', data, 112)[0]
+
+    header = {
+        'width': width,
+        'height': height,
+        'mips': max(1, mips),
+        'faces': 6 if caps2 & DDSCAPS2_CUBEMAP else 1,
+        'format': fourcc.decode('ascii', 'replace') if pf_flags & DDPF_FOURCC else f"RGB{bit_count}",
+        'block_size': None,
+        'bits_per_pixel': bit_count if not pf_flags & DDPF_FOURCC else None
+    }
+
+    if pf_flags & DDPF_FOURCC and fourcc == b'DX10':
+        if len(data) < len(DDS_MAGIC) + DDS_HEADER_SIZE + DDS_DX10_HEADER_SIZE:
+            return None
+        dxgi_format, dimension, misc_flag, array_size = struct.unpack_from('<4I', data, 128)
+        header['format'] = f"DXGI{dxgi_format}"
+        header['block_size'] = dxgi_block_sizes.get(dxgi_format)
+        header['bits_per_pixel'] = dxgi_bits_per_pixel.get(dxgi_format)
+        header['faces'] = max(1, array_size) * (6 if misc_flag & 0x4 else 1)
+
+    elif pf_flags & DDPF_FOURCC:
+        header['block_size'] = fourcc_block_sizes.get(fourcc)
+
+    return header
+
+
+def get_dds_memory(header: dict) -> int:
+    """Returns the number of bytes a DDS texture occupies in video memory, including all of its mipmaps"""
+
+    total = 0
+    width, height = header['width'], header['height']
+
+    for mip in range(header['mips']):
+        if header['block_size'] is not None:
+            total += max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * header['block_size']
+        elif header['bits_per_pixel'] is not None:
+            total += width * height * header['bits_per_pixel'] // 8
+
+        width = max(1, width // 2)
+        height = max(1, height // 2)
+
+    return total * header['faces']
+
+
+def get_dds_file_memory(path: str) -> int:
+    """Returns the video memory of a DDS file, 0 if it can't be read"""
+
+    header = read_dds_header(path)
+
+    return get_dds_memory(header) if header is not None else 0
@@ -0,0 +1,46 @@
+# Decimates meshes in a separate Blender instance, so LOD generation does not block the UI.
+# Started by seut_lods.py as: blender --background --factory-startup --python seut_lod_worker.py -- <job.json>
+# SEUT is not loaded here, so this may only depend on bpy and the standard library.
+
+import bpy
+import sys
+import json
+
+
+def main():
+    with open(sys.argv[sys.argv.index('--') + 1], 'r') as file:
+        job = json.load(file)
+
+    names = [name for name, ratio in job['meshes']]
+    with bpy.data.libraries.load(job['source'], link=False) as (data_from, data_to):
+        data_to.meshes = names
+
+    objects = []
+    for mesh, (name, ratio) in zip(data_to.meshes, job['meshes']):
+        obj = bpy.data.objects.new(name, mesh)
+        bpy.context.scene.collection.objects.link(obj)
+
+        if ratio < 1.0:
+            modifier = obj.modifiers.new("Decimate", 'DECIMATE')
+            modifier.decimate_type = 'COLLAPSE'
+            modifier.ratio = ratio
+            modifier.use_collapse_triangulate = True
+
+        objects.append((name, obj))
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    results = set()
+    for idx, (name, obj) in enumerate(objects):
+        result = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+
+        # Materials are reassigned by slot in the main instance, so they don't need to be written.
+        for slot_idx in range(len(result.materials)):
+            result.materials[slot_idx] = None
+
+        result.name = f"SEUT_RESULT_{idx}"
+        results.add(result)
+
+    bpy.data.libraries.write(job['target'], results, fake_user=True)
+
+
+main()
@@ -0,0 +1,116 @@
+import bpy
+import numpy as np
+
+
+def get_mesh_objects(collection) -> list:
+    """Returns all mesh objects within a collection and its children."""
+
+    if collection is None:
+        return []
+
+    return [obj for obj in collection.all_objects if obj.type == 'MESH']
+
+
+def get_matrix_array(matrix) -> np.ndarray:
+    """Returns a 4x4 mathutils matrix as NumPy array."""
+
+    return np.array(matrix, dtype=np.float64).reshape(4, 4)
+
+
+def transform_points(points: np.ndarray, matrix) -> np.ndarray:
+    """Applies a 4x4 matrix to an array of points of shape (n, 3)."""
+
+    m = get_matrix_array(matrix)
+    return points @ m[:3, :3].T + m[:3, 3]
+
+
+def get_evaluated_vertices(obj, depsgraph, world_space=True) -> np.ndarray:
+    """Returns the vertex coordinates of the evaluated mesh of an object as array of shape (n, 3)."""
+
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    obj_eval.to_mesh_clear()
+
+    co = co.reshape(-1, 3).astype(np.float64)
+    if world_space:
+        co = transform_points(co, obj.matrix_world)
+
+    return co
+
+
+def get_evaluated_triangles(obj, depsgraph, world_space=True):
+    """Returns the vertex coordinates and the triangles (vertex indices) of the evaluated mesh of an object."""
+
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    mesh.calc_loop_triangles()
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', tris)
+    obj_eval.to_mesh_clear()
+
+    co = co.reshape(-1, 3).astype(np.float64)
+    if world_space:
+        co = transform_points(co, obj.matrix_world)
+
+    return co, tris.reshape(-1, 3)
+
+
+def get_collection_vertices(collection, depsgraph) -> np.ndarray:
+    """Returns the world space vertex coordinates of all evaluated meshes within a collection."""
+
+    arrays = [get_evaluated_vertices(obj, depsgraph) for obj in get_mesh_objects(collection)]
+
+    if len(arrays) < 1:
+        return np.empty((0, 3), dtype=np.float64)
+
+    return np.concatenate(arrays)
+
+
+def get_collection_triangles(collection, depsgraph):
+    """Returns the world space vertex coordinates and triangles of all evaluated meshes within a collection, merged into one set."""
+
+    all_co = []
+    all_tris = []
+    offset = 0
+
+    for obj in get_mesh_objects(collection):
+        co, tris = get_evaluated_triangles(obj, depsgraph)
+        all_co.append(co)
+        all_tris.append(tris + offset)
+        offset += len(co)
+
+    if len(all_co) < 1:
+        return np.empty((0, 3), dtype=np.float64), np.empty((0, 3), dtype=np.int32)
+
+    return np.concatenate(all_co), np.concatenate(all_tris)
+
+
+def get_surface_samples(co: np.ndarray, tris: np.ndarray, count: int = 2000, include_vertices: bool = True) -> np.ndarray:
+    """Returns points spread evenly across the surface of a mesh, so large faces are weighted by their area, by default preceded by its vertices."""
+
+    corners = co[tris]
+    edges_1 = corners[:, 1] - corners[:, 0]
+    edges_2 = corners[:, 2] - corners[:, 0]
+    areas = np.linalg.norm(np.cross(edges_1, edges_2), axis=1)
+    if len(tris) < 1 or areas.sum() <= 0:
+        return co
+
+    rng = np.random.default_rng(0)
+    idx = rng.choice(len(tris), size=count, p=areas / areas.sum())
+    u, v = rng.random((2, count))
+    outside = u + v > 1
+    u[outside] = 1 - u[outside]
+    v[outside] = 1 - v[outside]
+
+    samples = corners[idx, 0] + u[:, None] * edges_1[idx] + v[:, None] * edges_2[idx]
+
+    if not include_vertices:
+        return samples
+
+    return np.concatenate((co, samples))
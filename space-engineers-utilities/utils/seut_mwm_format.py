@@ -0,0 +1,591 @@
+import io
+import os
+import mmap
+import struct
+import numpy as np
+
+
+# Version written into the header of MWMs created by SEUT. This is the last version before per-material user data was introduced.
+MWM_VERSION = 1066002
+
+# First version with a tag index in the header. Older files can only be read sequentially and are not supported.
+MWM_VERSION_INDEX = 1066002
+MWM_VERSION_USERDATA = 1068001
+
+# Order in which MwmBuilder writes the tags of a model.
+mwm_tags = [
+    'Dummies',
+    'Vertices',
+    'Normals',
+    'TexCoords0',
+    'Binormals',
+    'Tangents',
+    'TexCoords1',
+    'RescaleFactor',
+    'UseChannelTextures',
+    'BoundingBox',
+    'BoundingSphere',
+    'SwapWindingOrder',
+    'MeshParts',
+    'Sections',
+    'ModelInfo',
+    'BlendIndices',
+    'BlendWeights',
+    'Animations',
+    'Bones',
+    'BoneMapping',
+    'HavokCollisionGeometry',
+    'PatternScale',
+    'LODs'
+]
+
+
+def write_7bit_int(stream, value: int):
+    """Writes an integer in the 7-bit encoded format used by .NET's BinaryWriter"""
+
+    while value >= 0x80:
+        stream.write(bytes(((value & 0x7F) | 0x80,)))
+        value >>= 7
+    stream.write(bytes((value,)))
+
+
+def write_string(stream, value: str):
+    """Writes a length-prefixed UTF-8 string the way .NET's BinaryWriter.Write(string) does"""
+
+    data = value.encode('utf-8')
+    write_7bit_int(stream, len(data))
+    stream.write(data)
+
+
+def write_int(stream, value: int):
+    stream.write(struct.pack('<i', value))
+
+
+def write_float(stream, value: float):
+    stream.write(struct.pack('<f', value))
+
+
+def write_bool(stream, value: bool):
+    stream.write(struct.pack('<?', value))
+
+
+def write_string_dict(stream, values: dict):
+    write_int(stream, len(values))
+    for key, value in values.items():
+        write_string(stream, str(key))
+        write_string(stream, str(value))
+
+
+def write_array(stream, array: np.ndarray):
+    """Writes a count-prefixed array of packed values"""
+
+    write_int(stream, len(array))
+    stream.write(np.ascontiguousarray(array).tobytes())
+
+
+def get_dotnet_hash(value: str) -> int:
+    """Returns the hash .NET Framework's String.GetHashCode() produces on 64-bit systems, which MwmBuilder uses for material names"""
+
+    hash1 = 5381
+    hash2 = hash1
+
+    chars = value.encode('utf-16-le')
+    chars = [int.from_bytes(chars[i:i + 2], 'little') for i in range(0, len(chars), 2)]
+
+    for idx in range(0, len(chars), 2):
+        hash1 = (((hash1 << 5) + hash1) ^ chars[idx]) & 0xFFFFFFFF
+        if idx + 1 >= len(chars):
+            break
+        hash2 = (((hash2 << 5) + hash2) ^ chars[idx + 1]) & 0xFFFFFFFF
+
+    result = (hash1 + hash2 * 1566083941) & 0xFFFFFFFF
+    if result >= 0x80000000:
+        result -= 0x100000000
+
+    return result
+
+
+def pack_positions(positions: np.ndarray) -> np.ndarray:
+    """Packs positions into HalfVector4s, with the W component storing the factor XYZ need to be multiplied with"""
+
+    scale = np.minimum(np.floor(np.abs(positions).max(axis=1)), 2048.0)
+    scale[scale < 1.0] = 1.0
+
+    packed = np.empty((len(positions), 4), dtype=np.float16)
+    packed[:, :3] = positions / scale[:, None]
+    packed[:, 3] = scale
+
+    return packed.view(np.uint16)
+
+
+def pack_normals(normals: np.ndarray) -> np.ndarray:
+    """Packs unit vectors into Byte4s"""
+
+    values = np.clip(np.rint((normals * 0.5 + 0.5) * 255.0), 0, 255).astype(np.uint32)
+
+    return values[:, 0] | (values[:, 1] << 8) | (values[:, 2] << 16)
+
+
+def pack_uvs(uvs: np.ndarray) -> np.ndarray:
+    """Packs UV coordinates into HalfVector2s. V is flipped to match DirectX conventions"""
+
+    packed = np.empty((len(uvs), 2), dtype=np.float16)
+    packed[:, 0] = uvs[:, 0]
+    packed[:, 1] = 1.0 - uvs[:, 1]
+
+    return packed.view(np.uint16)
+
+
+def write_material_desc(stream, part: dict):
+    write_bool(stream, True)
+    write_string(stream, part['material'])
+    write_string_dict(stream, part.get('textures', {}))
+
+    technique = part.get('technique', 'MESH')
+    write_string(stream, technique)
+
+    if technique == 'GLASS':
+        write_string(stream, part.get('glass_cw', part['material']))
+        write_string(stream, part.get('glass_ccw', part['material']))
+        write_bool(stream, part.get('glass_smooth', False))
+
+
+def get_tag_data(model: dict) -> dict:
+    """Serializes the content of every tag of a model into a dictionary of bytes"""
+
+    positions = np.asarray(model['positions'], dtype=np.float32).reshape(-1, 3)
+    empty = np.empty(0, dtype=np.uint32)
+    data = {}
+
+    stream = io.BytesIO()
+    write_int(stream, len(model.get('dummies', [])))
+    for dummy in model.get('dummies', []):
+        write_string(stream, dummy['name'])
+        stream.write(struct.pack('<16f', *dummy['matrix']))
+        write_string_dict(stream, dummy.get('data', {}))
+    data['Dummies'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_array(stream, pack_positions(positions).reshape(-1, 4))
+    data['Vertices'] = stream.getvalue()
+
+    for tag, key in (('Normals', 'normals'), ('Binormals', 'binormals'), ('Tangents', 'tangents')):
+        stream = io.BytesIO()
+        write_array(stream, pack_normals(np.asarray(model[key], dtype=np.float32).reshape(-1, 3)))
+        data[tag] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_array(stream, pack_uvs(np.asarray(model['uvs'], dtype=np.float32).reshape(-1, 2)).reshape(-1, 2))
+    data['TexCoords0'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_array(stream, empty)
+    data['TexCoords1'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_float(stream, model.get('rescale_factor', 1.0))
+    data['RescaleFactor'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_bool(stream, False)
+    data['UseChannelTextures'] = stream.getvalue()
+
+    if len(positions) > 0:
+        bbox_min = positions.min(axis=0)
+        bbox_max = positions.max(axis=0)
+    else:
+        bbox_min = bbox_max = np.zeros(3, dtype=np.float32)
+    center = (bbox_min + bbox_max) / 2
+    radius = float(np.sqrt(((positions - center) ** 2).sum(axis=1)).max()) if len(positions) > 0 else 0.0
+
+    stream = io.BytesIO()
+    stream.write(struct.pack('<6f', *bbox_min, *bbox_max))
+    data['BoundingBox'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    stream.write(struct.pack('<4f', *center, radius))
+    data['BoundingSphere'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_bool(stream, False)
+    data['SwapWindingOrder'] = stream.getvalue()
+
+    triangles = 0
+    stream = io.BytesIO()
+    write_int(stream, len(model['parts']))
+    for part in model['parts']:
+        indices = np.asarray(part['indices'], dtype=np.int32)
+        triangles += len(indices) // 3
+        write_int(stream, get_dotnet_hash(part['material']))
+        write_array(stream, indices)
+        write_material_desc(stream, part)
+    data['MeshParts'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_int(stream, 0)
+    data['Sections'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_int(stream, triangles)
+    write_int(stream, len(positions))
+    stream.write(struct.pack('<3f', *(bbox_max - bbox_min)))
+    data['ModelInfo'] = stream.getvalue()
+
+    for tag in ('BlendIndices', 'BlendWeights', 'Bones', 'BoneMapping'):
+        stream = io.BytesIO()
+        write_int(stream, 0)
+        data[tag] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_int(stream, 0)
+    write_int(stream, 0)
+    data['Animations'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    havok = model.get('havok', b'')
+    write_int(stream, len(havok))
+    stream.write(havok)
+    data['HavokCollisionGeometry'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_float(stream, model.get('pattern_scale', 1.0))
+    data['PatternScale'] = stream.getvalue()
+
+    stream = io.BytesIO()
+    write_int(stream, len(model.get('lods', [])))
+    for lod in model.get('lods', []):
+        write_float(stream, lod['distance'])
+        write_string(stream, lod['model'])
+        write_string(stream, lod.get('quality', ""))
+    data['LODs'] = stream.getvalue()
+
+    return data
+
+
+def get_header(index: dict) -> bytes:
+    stream = io.BytesIO()
+    write_string(stream, 'Debug')
+    write_int(stream, 1)
+    write_string(stream, f"Version:{MWM_VERSION:08d}")
+
+    write_int(stream, len(index))
+    for tag, offset in index.items():
+        write_string(stream, tag)
+        write_int(stream, offset)
+
+    return stream.getvalue()
+
+
+def write_mwm(path: str, model: dict):
+    """Writes a model to an MWM file. Offsets in the tag index are absolute and point at the name preceding each tag's data"""
+
+    data = get_tag_data(model)
+
+    blobs = {}
+    for tag in mwm_tags:
+        stream = io.BytesIO()
+        write_string(stream, tag)
+        stream.write(data[tag])
+        blobs[tag] = stream.getvalue()
+
+    # Offsets are written as fixed-size int32s, so the size of the header does not depend on their values.
+    header_size = len(get_header({tag: 0 for tag in mwm_tags}))
+
+    index = {}
+    offset = header_size
+    for tag in mwm_tags:
+        index[tag] = offset
+        offset += len(blobs[tag])
+
+    with open(path, 'wb') as f:
+        f.write(get_header(index))
+        for tag in mwm_tags:
+            f.write(blobs[tag])
+
+
+class MWMReader:
+    """Reads the primitives of an MWM file from a buffer, mirroring .NET's BinaryReader"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.offset = 0
+
+    def read_7bit_int(self) -> int:
+        value = 0
+        shift = 0
+        while True:
+            byte = self.buffer[self.offset]
+            self.offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def read_string(self) -> str:
+        length = self.read_7bit_int()
+        value = bytes(self.buffer[self.offset:self.offset + length]).decode('utf-8')
+        self.offset += length
+        return value
+
+    def unpack(self, fmt: str):
+        values = struct.unpack_from(fmt, self.buffer, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def read_int(self) -> int:
+        return self.unpack('<i')[0]
+
+    def read_float(self) -> float:
+        return self.unpack('<f')[0]
+
+    def read_bool(self) -> bool:
+        return self.unpack('<?')[0]
+
+    def read_string_dict(self) -> dict:
+        return {self.read_string(): self.read_string() for idx in range(self.read_int())}
+
+    def read_array(self, dtype, width: int = 1) -> np.ndarray:
+        """Reads a count-prefixed array. The data is copied so it outlives the underlying buffer"""
+
+        count = self.read_int()
+        array = np.frombuffer(self.buffer, dtype=dtype, count=count * width, offset=self.offset).copy()
+        self.offset += array.nbytes
+        return array.reshape(count, width) if width > 1 else array
+
+
+def unpack_positions(packed: np.ndarray) -> np.ndarray:
+    values = packed.view(np.float16).astype(np.float32).reshape(-1, 4)
+    return values[:, :3] * values[:, 3:4]
+
+
+def unpack_normals(packed: np.ndarray) -> np.ndarray:
+    values = np.stack((packed & 0xFF, (packed >> 8) & 0xFF, (packed >> 16) & 0xFF), axis=1).astype(np.float32)
+    return values / 255.0 * 2.0 - 1.0
+
+
+def unpack_uvs(packed: np.ndarray) -> np.ndarray:
+    values = packed.view(np.float16).astype(np.float32).reshape(-1, 2)
+    values[:, 1] = 1.0 - values[:, 1]
+    return values
+
+
+def read_material_desc(reader: MWMReader, version: int) -> dict:
+    part = {
+        'material': reader.read_string(),
+        'textures': reader.read_string_dict()
+    }
+
+    if version >= MWM_VERSION_USERDATA:
+        part['user_data'] = reader.read_string_dict()
+
+    part['technique'] = reader.read_string()
+
+    if part['technique'] == 'GLASS':
+        part['glass_cw'] = reader.read_string()
+        part['glass_ccw'] = reader.read_string()
+        part['glass_smooth'] = reader.read_bool()
+
+    return part
+
+
+def read_tag(reader: MWMReader, tag: str, version: int):
+    """Reads the content of a single tag. Returns None for tags SEUT does not use"""
+
+    if tag == 'Dummies':
+        dummies = []
+        for idx in range(reader.read_int()):
+            dummies.append({
+                'name': reader.read_string(),
+                'matrix': list(reader.unpack('<16f')),
+                'data': reader.read_string_dict()
+            })
+        return dummies
+
+    elif tag == 'Vertices':
+        return unpack_positions(reader.read_array(np.uint16, 4))
+
+    elif tag in ['Normals', 'Binormals', 'Tangents']:
+        return unpack_normals(reader.read_array(np.uint32))
+
+    elif tag == 'TexCoords0':
+        return unpack_uvs(reader.read_array(np.uint16, 2))
+
+    elif tag in ['RescaleFactor', 'PatternScale']:
+        return reader.read_float()
+
+    elif tag == 'BoundingBox':
+        values = reader.unpack('<6f')
+        return (values[:3], values[3:])
+
+    elif tag == 'BoundingSphere':
+        values = reader.unpack('<4f')
+        return (values[:3], values[3])
+
+    elif tag == 'ModelInfo':
+        triangles, vertices = reader.unpack('<2i')
+        return {'triangles': triangles, 'vertices': vertices, 'size': reader.unpack('<3f')}
+
+    elif tag == 'MeshParts':
+        parts = []
+        for idx in range(reader.read_int()):
+            material_hash = reader.read_int()
+            indices = reader.read_array(np.int32)
+            part = {'material': "", 'technique': 'MESH', 'textures': {}}
+            if reader.read_bool():
+                part = read_material_desc(reader, version)
+            part['hash'] = material_hash
+            part['indices'] = indices
+            parts.append(part)
+        return parts
+
+    elif tag == 'HavokCollisionGeometry':
+        count = reader.read_int()
+        return bytes(reader.buffer[reader.offset:reader.offset + count])
+
+    elif tag == 'LODs':
+        lods = []
+        for idx in range(reader.read_int()):
+            lods.append({
+                'distance': reader.read_float(),
+                'model': reader.read_string(),
+                'quality': reader.read_string()
+            })
+        return lods
+
+    return None
+
+
+def get_mwm_version(header: list) -> int:
+    for entry in header:
+        if entry.startswith("Version:"):
+            return int(entry[len("Version:"):])
+    return 0
+
+
+def read_mwm(path: str, tags: list = None) -> dict:
+    """Reads an MWM file through a memory map. Only the tags listed in tags are decoded, all of them if None.
+    Raises ValueError if the file is not a supported MWM"""
+
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            reader = MWMReader(buffer)
+
+            try:
+                if reader.read_string() != 'Debug':
+                    raise ValueError(f"'{path}' is not an MWM file.")
+
+                header = [reader.read_string() for idx in range(reader.read_int())]
+                version = get_mwm_version(header)
+                if version < MWM_VERSION_INDEX:
+                    raise ValueError(f"MWM version {version} of '{path}' is not supported.")
+
+                index = {}
+                for idx in range(reader.read_int()):
+                    key = reader.read_string()
+                    index[key] = reader.read_int()
+
+                model = {'version': version, 'tags': list(index.keys())}
+                for tag, offset in index.items():
+                    if tags is not None and tag not in tags:
+                        continue
+
+                    reader.offset = offset
+                    if reader.read_string() != tag:
+                        raise ValueError(f"Tag index of '{path}' is corrupted at '{tag}'.")
+
+                    value = read_tag(reader, tag, version)
+                    if value is not None:
+                        model[tag] = value
+
+            except (IndexError, struct.error) as error:
+                raise ValueError(f"'{path}' is truncated or corrupted: {error}")
+
+    return model
+
+
+def replace_mwm_paths(path: str, replace) -> int:
+    """Rewrites the texture paths of the mesh parts and the LOD model paths of an MWM file in place. Every path is passed to replace, which returns its replacement or None.
+    All other data is copied byte for byte, only the offsets of the tags that moved are updated. Returns the number of replaced paths"""
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    reader = MWMReader(data)
+    spans = []
+
+    def check_path():
+        start = reader.offset
+        value = reader.read_string()
+        replacement = replace(value)
+        if replacement is not None and replacement != value:
+            stream = io.BytesIO()
+            write_string(stream, replacement)
+            spans.append((start, reader.offset, stream.getvalue()))
+
+    try:
+        if reader.read_string() != 'Debug':
+            raise ValueError(f"'{path}' is not an MWM file.")
+
+        version = get_mwm_version([reader.read_string() for idx in range(reader.read_int())])
+        if version < MWM_VERSION_INDEX:
+            raise ValueError(f"MWM version {version} of '{path}' is not supported.")
+
+        # Position of every tag's offset field in the header, which is not affected by replacements.
+        index = {}
+        for idx in range(reader.read_int()):
+            key = reader.read_string()
+            index[key] = (reader.offset, reader.read_int())
+
+        if 'MeshParts' in index:
+            reader.offset = index['MeshParts'][1]
+            reader.read_string()
+            for idx in range(reader.read_int()):
+                reader.read_int()
+                index_count = reader.read_int()
+                reader.offset += index_count * 4
+                if not reader.read_bool():
+                    continue
+                reader.read_string()
+                for texture in range(reader.read_int()):
+                    reader.read_string()
+                    check_path()
+                if version >= MWM_VERSION_USERDATA:
+                    reader.read_string_dict()
+                if reader.read_string() == 'GLASS':
+                    reader.read_string()
+                    reader.read_string()
+                    reader.read_bool()
+
+        if 'LODs' in index:
+            reader.offset = index['LODs'][1]
+            reader.read_string()
+            for idx in range(reader.read_int()):
+                reader.read_float()
+                check_path()
+                reader.read_string()
+
+    except (IndexError, struct.error) as error:
+        raise ValueError(f"'{path}' is truncated or corrupted: {error}")
+
+    if not spans:
+        return 0
+
+    spans.sort()
+    output = bytearray()
+    position = 0
+    for start, end, replacement in spans:
+        output += data[position:start]
+        output += replacement
+        position = end
+    output += data[position:]
+
+    for field, offset in index.values():
+        shift = sum(len(replacement) - (end - start) for start, end, replacement in spans if end <= offset)
+        struct.pack_into('<i', output, field, offset + shift)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(output)
+    os.replace(temp_path, path)
+
+    return len(spans)
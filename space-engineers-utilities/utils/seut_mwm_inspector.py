@@ -0,0 +1,193 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# The inspector can also be run as a standalone script over a mod folder, outside of Blender.
+try:
+    from .seut_mwm_format   import read_mwm
+except ImportError:
+    from seut_mwm_format    import read_mwm
+
+
+# HavokCollisionGeometry is skipped, as it can be large and is not inspected.
+inspected_tags = ['Dummies', 'Vertices', 'BoundingBox', 'ModelInfo', 'MeshParts', 'LODs']
+
+
+def normalize_model_path(path: str) -> str:
+    return os.path.splitext(path.replace("/", "\\"))[0].lower()
+
+
+def check_structure(model: dict) -> list:
+    """Checks the internal consistency of a parsed MWM"""
+
+    issues = []
+
+    vertices = model.get('Vertices', np.empty((0, 3), dtype=np.float32))
+    parts = model.get('MeshParts', [])
+    triangles = 0
+
+    for part in parts:
+        indices = part['indices']
+        triangles += len(indices) // 3
+
+        if len(indices) % 3 != 0:
+            issues.append(f"Index buffer of material '{part['material']}' is not made up of triangles.")
+        if len(indices) > 0 and (indices.min() < 0 or indices.max() >= len(vertices)):
+            issues.append(f"Index buffer of material '{part['material']}' references vertices that do not exist.")
+        if part['material'] == "":
+            issues.append("Mesh part without material descriptor.")
+
+    if 'ModelInfo' in model:
+        info = model['ModelInfo']
+        if info['vertices'] != len(vertices):
+            issues.append(f"Model info states {info['vertices']} vertices, but {len(vertices)} are stored.")
+        if info['triangles'] != triangles:
+            issues.append(f"Model info states {info['triangles']} triangles, but {triangles} are stored.")
+
+    if 'BoundingBox' in model and len(vertices) > 0:
+        bbox_min, bbox_max = (np.array(v) for v in model['BoundingBox'])
+        tolerance = 0.01 * max(1.0, float(np.abs(vertices).max()))
+        if np.any(vertices.min(axis=0) < bbox_min - tolerance) or np.any(vertices.max(axis=0) > bbox_max + tolerance):
+            issues.append("Vertices lie outside of the stored bounding box.")
+
+    if len(vertices) > 0 and triangles == 0:
+        issues.append("Model has vertices but no triangles.")
+
+    return issues
+
+
+def check_manifest(model: dict, manifest: dict) -> list:
+    """Checks a parsed MWM against the manifest of what was exported into it"""
+
+    issues = []
+
+    lods = model.get('LODs', [])
+    expected_lods = manifest.get('lods', [])
+    if len(lods) != len(expected_lods):
+        issues.append(f"Contains {len(lods)} LODs, expected {len(expected_lods)}.")
+    else:
+        for idx, (lod, expected) in enumerate(zip(lods, expected_lods)):
+            if abs(lod['distance'] - expected['distance']) > 0.001:
+                issues.append(f"LOD{idx + 1} distance is {lod['distance']}, expected {expected['distance']}.")
+            if normalize_model_path(lod['model']) != normalize_model_path(expected['model']):
+                issues.append(f"LOD{idx + 1} references '{lod['model']}', expected '{expected['model']}'.")
+
+    materials = set(part['material'] for part in model.get('MeshParts', []))
+    if 'materials' in manifest:
+        for name in sorted(set(manifest['materials']) - materials):
+            issues.append(f"Material '{name}' is missing.")
+        for name in sorted(materials - set(manifest['materials'])):
+            issues.append(f"Contains unexpected material '{name}'.")
+
+    if 'triangles' in manifest:
+        triangles = sum(len(part['indices']) // 3 for part in model.get('MeshParts', []))
+        if triangles != manifest['triangles']:
+            issues.append(f"Contains {triangles} triangles, expected {manifest['triangles']}.")
+
+    if 'dummies' in manifest:
+        dummies = set(dummy['name'] for dummy in model.get('Dummies', []))
+        for name in sorted(set(manifest['dummies']) - dummies):
+            issues.append(f"Empty '{name}' is missing.")
+        for name in sorted(dummies - set(manifest['dummies'])):
+            issues.append(f"Contains unexpected empty '{name}'.")
+
+    if manifest.get('half_extents') is not None and 'BoundingBox' in model:
+        bbox_min, bbox_max = (np.array(v) for v in model['BoundingBox'])
+        half_extents = np.array(manifest['half_extents'])
+        tolerance = 0.01 * half_extents.max()
+        if np.any(-bbox_min > half_extents + tolerance) or np.any(bbox_max > half_extents + tolerance):
+            size = np.round(bbox_max - bbox_min, 3)
+            issues.append(f"Geometry ({size[0]} x {size[1]} x {size[2]}) exceeds the bounding box ({' x '.join(str(round(v * 2, 3)) for v in half_extents)}).")
+
+    return issues
+
+
+def get_mod_root(path: str):
+    """Returns the folder model references are relative to, i.e. the one containing the Models-folder"""
+
+    parts = os.path.normpath(os.path.abspath(path)).split(os.sep)
+    for idx in range(len(parts) - 1, -1, -1):
+        if parts[idx].lower() == 'models':
+            return os.sep.join(parts[:idx])
+
+    return None
+
+
+def check_references(model: dict, path: str) -> list:
+    """Checks whether the LOD models referenced by an MWM exist"""
+
+    issues = []
+    root = get_mod_root(path)
+    if root is None:
+        return issues
+
+    for idx, lod in enumerate(model.get('LODs', [])):
+        lod_path = os.path.join(root, *lod['model'].replace("/", "\\").split("\\"))
+        if not lod_path.lower().endswith(".mwm"):
+            lod_path += ".mwm"
+        if not os.path.isfile(lod_path):
+            issues.append(f"LOD{idx + 1} model '{lod['model']}' does not exist.")
+
+    return issues
+
+
+def inspect_mwm(path: str, manifest: dict = None) -> list:
+    """Returns a list of all issues found in an MWM file, optionally compared against the manifest of its export"""
+
+    try:
+        model = read_mwm(path, inspected_tags)
+    except (EnvironmentError, ValueError) as error:
+        return [str(error)]
+
+    issues = check_structure(model) + check_references(model, path)
+
+    if manifest is not None:
+        issues += check_manifest(model, manifest)
+
+    return issues
+
+
+def inspect_folder(path: str) -> dict:
+    """Inspects all MWM files within a folder and its subfolders. Returns the issues found, per file"""
+
+    results = {}
+    for root, dirs, files in os.walk(path):
+        for f in files:
+            if os.path.splitext(f)[1].lower() == '.mwm':
+                mwm_path = os.path.join(root, f)
+                results[mwm_path] = inspect_mwm(mwm_path)
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Checks the MWM files of a Space Engineers mod for structural issues and missing LOD models.")
+    parser.add_argument('path', help="Mod folder or single MWM file to inspect")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Only list files with issues")
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    if os.path.isfile(args.path):
+        results = {args.path: inspect_mwm(args.path)}
+    else:
+        results = inspect_folder(args.path)
+
+    issue_count = 0
+    for path, issues in sorted(results.items()):
+        issue_count += len(issues)
+        if len(issues) > 0:
+            print(f"{path}:")
+            for issue in issues:
+                print(f"    {issue}")
+        elif not args.quiet:
+            print(f"{path}: OK")
+
+    print(f"Inspected {len(results)} MWM files in {round(time.time() - start, 3)}s, {issue_count} issues found.")
+
+    return 1 if issue_count > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+import os
+import sys
+import json
+import time
+import argparse
+import xml.etree.ElementTree as ET
+
+from concurrent.futures import ThreadPoolExecutor
+
+# The analyzer can also be run as a standalone script over a mod folder, outside of Blender.
+try:
+    from .seut_dds              import read_dds_header, get_dds_memory
+    from .seut_mwm_format       import read_mwm
+    from .seut_mwm_inspector    import normalize_model_path
+except ImportError:
+    from seut_dds               import read_dds_header, get_dds_memory
+    from seut_mwm_format        import read_mwm
+    from seut_mwm_inspector     import normalize_model_path
+
+
+def normalize_texture_path(path: str) -> str:
+    return os.path.splitext(path.replace("/", "\\"))[0].lower() + ".dds"
+
+
+def get_relative_key(root: str, path: str) -> str:
+    return os.path.relpath(path, root).replace(os.sep, "\\")
+
+
+def find_files(folder: str, extension: str) -> list:
+    """Returns all files with an extension within a folder and its subfolders"""
+
+    found = []
+    if not os.path.isdir(folder):
+        return found
+
+    stack = [folder]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(extension):
+                    found.append(entry.path)
+
+    return found
+
+
+def read_texture(path: str) -> dict:
+    header = read_dds_header(path)
+
+    texture = {
+        'disk': os.path.getsize(path),
+        'memory': 0,
+        'format': None,
+        'size': None
+    }
+    if header is not None:
+        texture['memory'] = get_dds_memory(header)
+        texture['format'] = header['format']
+        texture['size'] = f"{header['width']}x{header['height']}"
+
+    return texture
+
+
+def scan_textures(root: str, workers: int = 16) -> dict:
+    """Reads the headers of all DDS files of a mod in parallel. Returns their memory and disk footprint, keyed by their path relative to the mod"""
+
+    paths = find_files(os.path.join(root, 'Textures'), '.dds')
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        textures = executor.map(read_texture, paths, chunksize=64)
+
+    return {normalize_texture_path(get_relative_key(root, path)): texture for path, texture in zip(paths, textures)}
+
+
+def read_model(path: str) -> dict:
+    try:
+        model = read_mwm(path, ['MeshParts', 'LODs'])
+    except (EnvironmentError, ValueError):
+        return {'materials': {}, 'lods': []}
+
+    materials = {}
+    for part in model.get('MeshParts', []):
+        textures = materials.setdefault(part['material'], set())
+        textures.update(normalize_texture_path(texture) for texture in part['textures'].values() if texture != "")
+
+    return {
+        'materials': materials,
+        'lods': [normalize_model_path(lod['model']) for lod in model.get('LODs', [])]
+    }
+
+
+def scan_models(root: str, workers: int = 16) -> dict:
+    """Reads the materials and LODs of all MWM files of a mod in parallel, keyed by their path relative to the mod"""
+
+    paths = find_files(os.path.join(root, 'Models'), '.mwm')
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        models = executor.map(read_model, paths, chunksize=16)
+
+    return {normalize_model_path(get_relative_key(root, path)): model for path, model in zip(paths, models)}
+
+
+def get_subtype_id(definition) -> str:
+    id_element = definition.find('Id')
+    if id_element is None:
+        return None
+    if id_element.get('Subtype') is not None:
+        return id_element.get('Subtype')
+
+    return id_element.findtext('SubtypeId')
+
+
+def scan_definitions(root: str) -> tuple:
+    """Returns the models and icons every block definition uses and the textures of all transparent materials, from the SBC files of a mod"""
+
+    blocks = {}
+    transparent_materials = {}
+
+    for path in find_files(os.path.join(root, 'Data'), '.sbc'):
+        try:
+            tree = ET.parse(path)
+        except (EnvironmentError, ET.ParseError):
+            continue
+
+        for definition in tree.iter('Definition'):
+            subtype_id = get_subtype_id(definition)
+            model = definition.findtext('Model')
+            if subtype_id is None or model is None:
+                continue
+
+            models = [normalize_model_path(model)]
+            for stage in definition.iter('Model'):
+                if stage.get('File') is not None:
+                    models.append(normalize_model_path(stage.get('File')))
+
+            blocks[subtype_id] = {
+                'models': models,
+                'icons': [normalize_texture_path(icon.text) for icon in definition.iter('Icon') if icon.text]
+            }
+
+        for material in tree.iter('TransparentMaterial'):
+            subtype_id = get_subtype_id(material)
+            textures = [element.text for element in material.iter() if element.tag.endswith('Texture') and element.text]
+            if subtype_id is not None:
+                transparent_materials[subtype_id] = set(normalize_texture_path(texture) for texture in textures)
+
+    return blocks, transparent_materials
+
+
+def scan_material_xmls(root: str) -> dict:
+    """Returns the textures of all materials defined in the MaterialsLib and model XML files of a mod"""
+
+    materials = {}
+    for path in find_files(root, '.xml'):
+        try:
+            tree = ET.parse(path)
+        except (EnvironmentError, ET.ParseError):
+            continue
+        if tree.getroot().tag not in ['MaterialsLib', 'Model']:
+            continue
+
+        for material in tree.iter('Material'):
+            textures = [param.text for param in material.iter('Parameter') if param.get('Name', "").endswith('Texture') and param.text]
+            if material.get('Name') is not None:
+                materials.setdefault(material.get('Name'), set()).update(normalize_texture_path(texture) for texture in textures)
+
+    return materials
+
+
+def get_model_textures(models: dict, key: str, visited: set) -> dict:
+    """Returns the textures of a model and its LODs, per material"""
+
+    if key in visited or key not in models:
+        return {}
+    visited.add(key)
+
+    materials = {}
+    for material, textures in models[key]['materials'].items():
+        materials.setdefault(material, set()).update(textures)
+
+    for lod in models[key]['lods']:
+        for material, textures in get_model_textures(models, lod, visited).items():
+            materials.setdefault(material, set()).update(textures)
+
+    return materials
+
+
+def get_totals(textures: dict, keys: set) -> dict:
+    """Returns the memory and disk footprint of a set of the mod's textures. Textures not part of the mod are vanilla and free"""
+
+    found = [textures[key] for key in keys if key in textures]
+
+    return {
+        'textures': len(found),
+        'memory': sum(texture['memory'] for texture in found),
+        'disk': sum(texture['disk'] for texture in found)
+    }
+
+
+def analyze_mod(root: str) -> dict:
+    """Returns the video memory and disk footprint of a mod's textures, in total, per texture, per material and per block"""
+
+    textures = scan_textures(root)
+    models = scan_models(root)
+    blocks, transparent_materials = scan_definitions(root)
+
+    material_textures = {}
+    for key in models:
+        for material, keys in models[key]['materials'].items():
+            material_textures.setdefault(material, set()).update(keys)
+    for material, keys in scan_material_xmls(root).items():
+        material_textures.setdefault(material, set()).update(keys)
+    for material, keys in transparent_materials.items():
+        material_textures.setdefault(material, set()).update(keys)
+
+    texture_users = {key: {'materials': set(), 'blocks': set()} for key in textures}
+    for material, keys in material_textures.items():
+        for key in keys:
+            if key in texture_users:
+                texture_users[key]['materials'].add(material)
+
+    block_results = {}
+    for subtype_id, block in blocks.items():
+        visited = set()
+        keys = set(block['icons'])
+        materials = set()
+        for model in block['models']:
+            for material, material_keys in get_model_textures(models, model, visited).items():
+                keys.update(material_keys)
+                materials.add(material)
+
+        for key in keys:
+            if key in texture_users:
+                texture_users[key]['blocks'].add(subtype_id)
+
+        block_results[subtype_id] = get_totals(textures, keys)
+        block_results[subtype_id]['materials'] = sorted(materials)
+
+    texture_results = {}
+    for key, texture in textures.items():
+        texture_results[key] = dict(texture)
+        texture_results[key]['materials'] = sorted(texture_users[key]['materials'])
+        texture_results[key]['blocks'] = sorted(texture_users[key]['blocks'])
+
+    return {
+        'total': get_totals(textures, set(textures.keys())),
+        'textures': texture_results,
+        'materials': {material: get_totals(textures, keys) for material, keys in material_textures.items()},
+        'blocks': block_results
+    }
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024 ** 2:.1f} MB"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Lists the video memory and disk footprint of the textures of a Space Engineers mod.")
+    parser.add_argument('path', help="Mod folder to analyze")
+    parser.add_argument('-n', '--count', type=int, default=10, help="Number of entries listed per category")
+    parser.add_argument('-o', '--output', help="Writes the full results to this JSON file")
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    results = analyze_mod(args.path)
+
+    for category in ['blocks', 'materials', 'textures']:
+        print(f"{category.capitalize()} by video memory:")
+        entries = sorted(results[category].items(), key=lambda entry: entry[1]['memory'], reverse=True)
+        for name, entry in entries[:args.count]:
+            print(f"    {format_size(entry['memory']):>10} VRAM {format_size(entry['disk']):>10} disk    {name}")
+
+    total = results['total']
+    print(f"{total['textures']} textures use {format_size(total['memory'])} video memory and {format_size(total['disk'])} disk space, analyzed in {round(time.time() - start, 3)}s.")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4, sort_keys=True)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
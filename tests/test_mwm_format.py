@@ -0,0 +1,190 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# The MWM format module does not depend on Blender, so it is imported standalone, the way the mod analysis scripts use it.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'space-engineers-utilities', 'utils'))
+
+from seut_mwm_format import (MWM_VERSION, MWMReader, mwm_tags, write_mwm, read_mwm, replace_mwm_paths, get_dotnet_hash,
+                             pack_positions, unpack_positions, pack_normals, unpack_normals, pack_uvs, unpack_uvs)
+
+
+def get_model() -> dict:
+    """Returns a model of 24 random vertices and two mesh parts, one of them glass, with a dummy and a LOD"""
+
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(-2.5, 2.5, (24, 3))
+    positions[0] = (3000.0, -1.0, 0.5)
+    normals = rng.normal(size=(24, 3))
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    tangents = np.cross(normals, (0.0, 0.0, 1.0))
+    tangents /= np.linalg.norm(tangents, axis=1)[:, None]
+
+    return {
+        'positions': positions,
+        'normals': normals,
+        'tangents': tangents,
+        'binormals': np.cross(normals, tangents),
+        'uvs': rng.uniform(0.0, 1.0, (24, 2)),
+        'parts': [
+            {
+                'material': 'Example_Material',
+                'technique': 'MESH',
+                'textures': {
+                    'ColorMetalTexture': "Textures\\Models\\Cubes\\Example_cm.dds",
+                    'NormalGlossTexture': "Textures\\Models\\Cubes\\Example_ng.dds"
+                },
+                'indices': np.arange(30)
+            },
+            {
+                'material': 'Example_Glass',
+                'technique': 'GLASS',
+                'textures': {},
+                'glass_cw': 'GlassCW',
+                'glass_ccw': 'GlassCCW',
+                'glass_smooth': True,
+                'indices': np.arange(30, 36) % 24
+            }
+        ],
+        'dummies': [
+            {
+                'name': 'detector_terminal_1',
+                'matrix': [float(value) for value in range(16)],
+                'data': {'file': 'detector_terminal_1'}
+            }
+        ],
+        'rescale_factor': 1.0,
+        'lods': [{'distance': 25.0, 'model': "Models\\Cubes\\Example_LOD1"}]
+    }
+
+
+class TestPacking(unittest.TestCase):
+
+    def test_positions(self):
+        positions = np.array([[0.25, -0.5, 0.75], [1000.0, -20.0, 3.0], [4096.0, 1.0, 0.0]], dtype=np.float32)
+        unpacked = unpack_positions(pack_positions(positions))
+
+        # HalfVector4 has 11 bits of mantissa, the W component keeps XYZ within [-1, 1] where possible.
+        np.testing.assert_allclose(unpacked, positions, rtol=2 ** -10, atol=1e-4)
+
+    def test_normals(self):
+        normals = np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.6, 0.0, -0.8]], dtype=np.float32)
+        packed = pack_normals(normals)
+
+        self.assertEqual(packed.dtype, np.uint32)
+        self.assertEqual(int(packed[0]) >> 24, 0)
+        # Byte4 stores 256 steps across [-1, 1], so values are off by up to half a step.
+        np.testing.assert_allclose(unpack_normals(packed), normals, atol=1 / 255 + 1e-6)
+
+    def test_uvs(self):
+        uvs = np.array([[0.0, 0.0], [0.5, 0.25], [1.0, 1.0]], dtype=np.float32)
+        packed = pack_uvs(uvs)
+
+        # V is flipped on disk.
+        self.assertEqual(float(packed.view(np.float16)[0, 1]), 1.0)
+        np.testing.assert_allclose(unpack_uvs(packed), uvs, atol=1e-3)
+
+
+class TestRoundTrip(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'Example.mwm')
+        self.model = get_model()
+        write_mwm(self.path, self.model)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_header(self):
+        result = read_mwm(self.path)
+
+        self.assertEqual(result['version'], MWM_VERSION)
+        self.assertEqual(result['tags'], mwm_tags)
+
+    def test_index_offsets(self):
+        with open(self.path, 'rb') as file:
+            data = file.read()
+
+        reader = MWMReader(data)
+        self.assertEqual(reader.read_string(), 'Debug')
+        header = [reader.read_string() for idx in range(reader.read_int())]
+        self.assertEqual(header, [f"Version:{MWM_VERSION:08d}"])
+
+        index = {}
+        for idx in range(reader.read_int()):
+            key = reader.read_string()
+            index[key] = reader.read_int()
+
+        # The first tag directly follows the header, the others are written in order and each offset points at the tag's name.
+        offsets = [index[tag] for tag in mwm_tags]
+        self.assertEqual(list(index.keys()), mwm_tags)
+        self.assertEqual(offsets[0], reader.offset)
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertLess(offsets[-1], len(data))
+
+        for tag, offset in index.items():
+            reader.offset = offset
+            self.assertEqual(reader.read_string(), tag)
+
+    def test_geometry(self):
+        result = read_mwm(self.path)
+
+        np.testing.assert_allclose(result['Vertices'], self.model['positions'], rtol=2 ** -10, atol=2e-3)
+        for tag, key in (('Normals', 'normals'), ('Tangents', 'tangents'), ('Binormals', 'binormals')):
+            np.testing.assert_allclose(result[tag], self.model[key], atol=1 / 255 + 1e-6)
+        np.testing.assert_allclose(result['TexCoords0'], self.model['uvs'], atol=1e-3)
+
+        bbox_min, bbox_max = result['BoundingBox']
+        np.testing.assert_allclose(bbox_min, self.model['positions'].min(axis=0), rtol=1e-6)
+        np.testing.assert_allclose(bbox_max, self.model['positions'].max(axis=0), rtol=1e-6)
+
+        self.assertEqual(result['ModelInfo']['triangles'], 12)
+        self.assertEqual(result['ModelInfo']['vertices'], 24)
+        self.assertEqual(result['RescaleFactor'], 1.0)
+
+    def test_mesh_parts(self):
+        parts = read_mwm(self.path, ['MeshParts'])['MeshParts']
+
+        self.assertEqual(len(parts), len(self.model['parts']))
+        for part, expected in zip(parts, self.model['parts']):
+            self.assertEqual(part['material'], expected['material'])
+            self.assertEqual(part['technique'], expected['technique'])
+            self.assertEqual(part['textures'], expected['textures'])
+            np.testing.assert_array_equal(part['indices'], expected['indices'])
+            self.assertEqual(part['hash'], get_dotnet_hash(expected['material']))
+
+        self.assertEqual(parts[1]['glass_cw'], 'GlassCW')
+        self.assertEqual(parts[1]['glass_ccw'], 'GlassCCW')
+        self.assertTrue(parts[1]['glass_smooth'])
+
+    def test_dummies_and_lods(self):
+        result = read_mwm(self.path, ['Dummies', 'LODs'])
+
+        self.assertNotIn('MeshParts', result)
+        self.assertEqual(result['Dummies'], self.model['dummies'])
+        self.assertEqual(result['LODs'], [{'distance': 25.0, 'model': "Models\\Cubes\\Example_LOD1", 'quality': ""}])
+
+    def test_replace_paths(self):
+        replacements = {"Textures\\Models\\Cubes\\Example_cm.dds": "Textures\\Models\\Cubes\\Shared\\Example_Longer_Name_cm.dds"}
+        count = replace_mwm_paths(self.path, lambda value: replacements.get(value))
+        result = read_mwm(self.path)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(result['MeshParts'][0]['textures']['ColorMetalTexture'], replacements["Textures\\Models\\Cubes\\Example_cm.dds"])
+        self.assertEqual(result['LODs'][0]['model'], "Models\\Cubes\\Example_LOD1")
+        self.assertEqual(len(result['Vertices']), 24)
+
+    def test_corrupted(self):
+        with open(self.path, 'r+b') as file:
+            file.truncate(200)
+
+        with self.assertRaises(ValueError):
+            read_mwm(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()